@@ -0,0 +1,358 @@
+#!/usr/bin/env python3
+"""
+Модуль для однократного запуска замеров и построения отчетов по ним.
+
+Замеры выполняются один раз и сохраняются в JSON-файл с сырыми
+выборками. Графики, markdown- и HTML-сводки строятся только по
+сохраненным данным, поэтому медленная наивная рекурсия повторно
+не запускается.
+"""
+
+import json
+import math
+import os
+import platform
+import statistics
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+
+from recursion import fibonacci
+from memoization import fibonacci_memoized
+
+RESULTS_FILE = 'fibonacci_results.json'
+
+# Описание измеряемых функций: ключ -> (подпись, функция, подготовка)
+BENCHMARKS = {
+    'naive': ('Наивная рекурсия', fibonacci, None),
+    'memoized': ('С мемоизацией', fibonacci_memoized,
+                 fibonacci_memoized.cache_clear),
+}
+
+
+def measure_samples(func: Callable[[int], int], n: int, repeats: int,
+                    setup: Optional[Callable[[], None]] = None
+                    ) -> List[float]:
+    """
+    Многократное измерение времени вызова func(n).
+
+    Args:
+        func (Callable): Измеряемая функция
+        n (int): Аргумент функции
+        repeats (int): Количество повторов
+        setup (Callable): Подготовка перед каждым повтором (например,
+            сброс кеша мемоизации), не входит в замер
+
+    Returns:
+        List[float]: Сырые выборки времени в секундах
+    """
+    samples = []
+    for _ in range(repeats):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        func(n)
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def run_benchmarks(max_n: int = 30, repeats: int = 3,
+                   filename: str = RESULTS_FILE) -> Dict:
+    """
+    Однократный запуск всех замеров и сохранение сырых выборок.
+
+    Args:
+        max_n (int): Максимальное значение n
+        repeats (int): Количество повторов для каждого n
+        filename (str): Файл для сохранения результатов
+
+    Returns:
+        Dict: Структура с метаданными и выборками
+    """
+    n_values = list(range(1, max_n + 1))
+    results = {
+        'meta': {
+            'created': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'machine': platform.machine(),
+            'repeats': repeats,
+            'timer': 'time.perf_counter',
+        },
+        'benchmarks': {},
+    }
+
+    print("Измерение времени выполнения...")
+    for key, (label, func, setup) in BENCHMARKS.items():
+        samples = []
+        for n in n_values:
+            samples.append(measure_samples(func, n, repeats, setup))
+            if n % 5 == 0:
+                median = statistics.median(samples[-1])
+                print(f"  {label}: n={n}, медиана={median:.6f}s")
+        results['benchmarks'][key] = {
+            'label': label,
+            'n': n_values,
+            'samples': samples,
+        }
+
+    save_results(results, filename)
+    return results
+
+
+def save_results(results: Dict, filename: str = RESULTS_FILE) -> None:
+    """Сохранение результатов замеров в JSON-файл."""
+    with open(filename, 'w', encoding='utf-8') as f:
+        json.dump(results, f, ensure_ascii=False, indent=2)
+    print(f"Результаты сохранены в файл: {filename}")
+
+
+def load_results(filename: str = RESULTS_FILE) -> Dict:
+    """Загрузка ранее сохраненных результатов замеров."""
+    with open(filename, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def load_or_run(max_n: int = 30, repeats: int = 3,
+                filename: str = RESULTS_FILE) -> Dict:
+    """
+    Загрузка результатов из файла; замеры запускаются только если
+    файла нет или в нем меньше значений n, чем требуется.
+    """
+    if os.path.exists(filename):
+        results = load_results(filename)
+        stored_max = min(max(bench['n'])
+                         for bench in results['benchmarks'].values())
+        if stored_max >= max_n:
+            return results
+    return run_benchmarks(max_n, repeats, filename)
+
+
+def median_times(bench: Dict, max_n: Optional[int] = None
+                 ) -> Tuple[List[int], List[float]]:
+    """
+    Медианы выборок для каждого n.
+
+    Args:
+        bench (Dict): Результаты одной функции из файла
+        max_n (int): Ограничение сверху на n (None - без ограничения)
+
+    Returns:
+        Tuple[List[int], List[float]]: Значения n и медианное время
+    """
+    n_values = []
+    times = []
+    for n, samples in zip(bench['n'], bench['samples']):
+        if max_n is not None and n > max_n:
+            break
+        n_values.append(n)
+        times.append(statistics.median(samples))
+    return n_values, times
+
+
+def _linear_regression(xs: List[float], ys: List[float]
+                       ) -> Tuple[float, float, float]:
+    """
+    Метод наименьших квадратов для y = a + b * x.
+
+    Returns:
+        Tuple[float, float, float]: Свободный член, наклон и R²
+    """
+    count = len(xs)
+    mean_x = sum(xs) / count
+    mean_y = sum(ys) / count
+    sxx = sum((x - mean_x) ** 2 for x in xs)
+    sxy = sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys))
+    syy = sum((y - mean_y) ** 2 for y in ys)
+    slope = sxy / sxx if sxx > 0 else 0.0
+    intercept = mean_y - slope * mean_x
+    r_squared = (sxy * sxy) / (sxx * syy) if sxx > 0 and syy > 0 else 0.0
+    return intercept, slope, r_squared
+
+
+def fit_complexity(n_values: List[int], times: List[float],
+                   min_n: int = 5) -> Dict[str, float]:
+    """
+    Подбор эмпирической сложности по измеренным данным.
+
+    Рассматриваются две модели:
+        - степенная t = c * n^k (наклон в координатах log t, log n);
+        - экспоненциальная t = c * b^n (наклон в координатах log t, n).
+
+    Временная сложность: O(m), где m - количество точек
+
+    Args:
+        n_values (List[int]): Значения n
+        times (List[float]): Время для каждого n
+        min_n (int): Минимальное n, используемое в подгонке (малые n
+            искажаются накладными расходами вызова)
+
+    Returns:
+        Dict[str, float]: Показатель k, основание b, R² обеих моделей
+        и название лучшей модели
+    """
+    points = [(n, t) for n, t in zip(n_values, times) if n >= min_n and t > 0]
+    if len(points) < 2:
+        return {'power_exponent': float('nan'), 'power_r2': 0.0,
+                'exp_base': float('nan'), 'exp_r2': 0.0, 'best': 'none'}
+
+    log_t = [math.log(t) for _, t in points]
+    _, power_slope, power_r2 = _linear_regression(
+        [math.log(n) for n, _ in points], log_t)
+    _, exp_slope, exp_r2 = _linear_regression(
+        [float(n) for n, _ in points], log_t)
+
+    return {
+        'power_exponent': power_slope,
+        'power_r2': power_r2,
+        'exp_base': math.exp(exp_slope),
+        'exp_r2': exp_r2,
+        'best': 'exponential' if exp_r2 > power_r2 else 'power',
+    }
+
+
+def describe_fit(fit: Dict[str, float]) -> str:
+    """Текстовое описание лучшей модели сложности."""
+    if fit['best'] == 'exponential':
+        return f"O({fit['exp_base']:.3f}^n), R²={fit['exp_r2']:.3f}"
+    if fit['best'] == 'power':
+        return f"O(n^{fit['power_exponent']:.3f}), R²={fit['power_r2']:.3f}"
+    return "недостаточно данных"
+
+
+def render_plots(results: Dict,
+                 filename: str = 'fibonacci_dashboard.png') -> None:
+    """
+    Построение графиков сравнения по сохраненным данным.
+
+    Args:
+        results (Dict): Загруженные результаты замеров
+        filename (str): Имя PNG-файла
+    """
+    import matplotlib.pyplot as plt
+
+    styles = ['r-', 'b-', 'g-', 'm-']
+    fig, (ax_lin, ax_log) = plt.subplots(1, 2, figsize=(12, 6))
+    for style, bench in zip(styles, results['benchmarks'].values()):
+        n_values, times = median_times(bench)
+        ax_lin.plot(n_values, times, style, label=bench['label'],
+                    linewidth=2)
+        ax_log.semilogy(n_values, times, style, label=bench['label'],
+                        linewidth=2)
+
+    ax_lin.set_xlabel('n')
+    ax_lin.set_ylabel('Время (секунды)')
+    ax_lin.set_title('Время вычисления n-го числа Фибоначчи')
+    ax_log.set_xlabel('n')
+    ax_log.set_ylabel('Время (логарифмическая шкала)')
+    ax_log.set_title('Логарифмическая шкала времени выполнения')
+    for ax in (ax_lin, ax_log):
+        ax.legend()
+        ax.grid(True, alpha=0.3)
+
+    fig.tight_layout()
+    fig.savefig(filename, dpi=150, bbox_inches='tight')
+    plt.close(fig)
+    print(f"График сохранен в файл: {filename}")
+
+
+def _summary_rows(results: Dict) -> List[Tuple[str, str, str, str]]:
+    """Строки сводной таблицы: подпись, медиана при max n, k, модель."""
+    rows = []
+    for bench in results['benchmarks'].values():
+        n_values, times = median_times(bench)
+        fit = fit_complexity(n_values, times)
+        rows.append((
+            bench['label'],
+            f"{times[-1]:.6f}",
+            f"{fit['power_exponent']:.3f}",
+            describe_fit(fit),
+        ))
+    return rows
+
+
+def render_markdown(results: Dict,
+                    filename: str = 'fibonacci_summary.md') -> str:
+    """
+    Формирование markdown-сводки по сохраненным данным.
+
+    Returns:
+        str: Текст сводки
+    """
+    meta = results['meta']
+    max_n = max(max(b['n']) for b in results['benchmarks'].values())
+    lines = [
+        "# Производительность рекурсивных алгоритмов",
+        "",
+        f"Замеры: {meta['created']}, Python {meta['python']}, "
+        f"повторов: {meta['repeats']}",
+        "",
+        f"| Алгоритм | Медиана при n={max_n} (с) | Показатель k "
+        "| Эмпирическая сложность |",
+        "|---|---|---|---|",
+    ]
+    for row in _summary_rows(results):
+        lines.append("| " + " | ".join(row) + " |")
+    text = "\n".join(lines) + "\n"
+
+    with open(filename, 'w', encoding='utf-8') as f:
+        f.write(text)
+    print(f"Сводка сохранена в файл: {filename}")
+    return text
+
+
+def render_html(results: Dict, filename: str = 'fibonacci_summary.html',
+                image: str = 'fibonacci_dashboard.png') -> str:
+    """
+    Формирование HTML-сводки по сохраненным данным.
+
+    Returns:
+        str: HTML-документ
+    """
+    meta = results['meta']
+    body_rows = "\n".join(
+        "<tr>" + "".join(f"<td>{cell}</td>" for cell in row) + "</tr>"
+        for row in _summary_rows(results)
+    )
+    html = (
+        "<!DOCTYPE html>\n"
+        "<html lang=\"ru\">\n<head>\n<meta charset=\"utf-8\">\n"
+        "<title>Производительность рекурсивных алгоритмов</title>\n"
+        "</head>\n<body>\n"
+        "<h1>Производительность рекурсивных алгоритмов</h1>\n"
+        f"<p>Замеры: {meta['created']}, Python {meta['python']}, "
+        f"повторов: {meta['repeats']}</p>\n"
+        "<table border=\"1\">\n"
+        "<tr><th>Алгоритм</th><th>Медиана при max n (с)</th>"
+        "<th>Показатель k</th><th>Эмпирическая сложность</th></tr>\n"
+        f"{body_rows}\n"
+        "</table>\n"
+        f"<img src=\"{image}\" alt=\"Графики производительности\">\n"
+        "</body>\n</html>\n"
+    )
+
+    with open(filename, 'w', encoding='utf-8') as f:
+        f.write(html)
+    print(f"Сводка сохранена в файл: {filename}")
+    return html
+
+
+def build_dashboard(results_file: str = RESULTS_FILE) -> None:
+    """Построение всех отчетов по сохраненному файлу результатов."""
+    results = load_results(results_file)
+    render_plots(results)
+    render_markdown(results)
+    render_html(results)
+
+    print("\nЭмпирическая сложность:")
+    for bench in results['benchmarks'].values():
+        n_values, times = median_times(bench)
+        fit = fit_complexity(n_values, times)
+        print(f"  {bench['label']}: {describe_fit(fit)}")
+
+
+if __name__ == "__main__":
+    print("Панель производительности рекурсивных алгоритмов")
+    print("=" * 60)
+
+    load_or_run(max_n=30, repeats=3)
+    build_dashboard()
@@ -41,6 +41,7 @@ def memoize(func: Callable) -> Callable:
             cache[args] = func(*args)
         return cache[args]
 
+    wrapper.cache_clear = cache.clear
     return wrapper
 
 
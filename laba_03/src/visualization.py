@@ -3,39 +3,25 @@
 Модуль для визуализации результатов.
 """
 
-import time
 import matplotlib.pyplot as plt
-from recursion import fibonacci
-from memoization import fibonacci_memoized
+from benchmark_dashboard import RESULTS_FILE, load_or_run, median_times
 
 
-def plot_fibonacci_performance(max_n: int = 30):
+def plot_fibonacci_performance(max_n: int = 30,
+                               results_file: str = RESULTS_FILE):
     """
     Построение графика времени выполнения для Фибоначчи.
 
+    Данные берутся из файла результатов; замеры запускаются только
+    если файла нет или в нем недостаточно значений n.
+
     Args:
         max_n (int): Максимальное значение n
+        results_file (str): Файл с сохраненными замерами
     """
-    naive_times = []
-    memoized_times = []
-    n_values = list(range(1, max_n + 1))
-
-    print("Измерение времени выполнения...")
-    for n in n_values:
-        # Наивная рекурсия
-        start = time.time()
-        fibonacci(n)
-        naive_times.append(time.time() - start)
-
-        # Мемоизация
-        start = time.time()
-        fibonacci_memoized(n)
-        memoized_times.append(time.time() - start)
-
-        if n % 5 == 0:
-            naive_str = f"{naive_times[-1]:.6f}s"
-            memo_str = f"{memoized_times[-1]:.6f}s"
-            print(f"n={n}: наивное={naive_str}, мемоизация={memo_str}")
+    benchmarks = load_or_run(max_n, filename=results_file)['benchmarks']
+    n_values, naive_times = median_times(benchmarks['naive'], max_n)
+    _, memoized_times = median_times(benchmarks['memoized'], max_n)
 
     # Построение графиков
     plt.figure(figsize=(12, 6))
@@ -78,9 +64,12 @@ def plot_fibonacci_performance(max_n: int = 30):
                   f"Мемоизация рост={growth_memo:6.2f}x")
 
 
-def plot_complexity_comparison():
+def plot_complexity_comparison(results_file: str = RESULTS_FILE):
     """
     Построение графика сравнения сложностей.
+
+    Args:
+        results_file (str): Файл с сохраненными замерами
     """
     n_values = list(range(1, 21))
 
@@ -104,17 +93,11 @@ def plot_complexity_comparison():
     plt.plot(n_values, normalized_memo, 'b--', label='O(n) - теоретическая',
              linewidth=2)
 
-    # Добавляем реальные данные
-    naive_times = []
-    memoized_times = []
-    for n in n_values:
-        start = time.time()
-        fibonacci(n)
-        naive_times.append(time.time() - start)
-
-        start = time.time()
-        fibonacci_memoized(n)
-        memoized_times.append(time.time() - start)
+    # Добавляем реальные данные из сохраненных замеров
+    benchmarks = load_or_run(len(n_values),
+                             filename=results_file)['benchmarks']
+    _, naive_times = median_times(benchmarks['naive'], len(n_values))
+    _, memoized_times = median_times(benchmarks['memoized'], len(n_values))
 
     # Нормализуем реальные данные
     max_naive_real = max(naive_times) if max(naive_times) > 0 else 1
@@ -0,0 +1,305 @@
+"""
+Параллельный запуск матрицы замеров с возобновлением.
+
+Каждая ячейка матрицы (алгоритм, тип данных, размер) выполняется в
+отдельном процессе, одновременно работают не более workers процессов.
+Ячейка, не уложившаяся в timeout, прерывается, а более крупные размеры
+того же алгоритма на тех же данных пропускаются: квадратичные алгоритмы
+не тратят бюджет на заведомо долгие замеры.
+
+После каждой завершенной ячейки results.csv перезаписывается целиком
+(через временный файл, атомарно). Повторный запуск читает его и
+выполняет только недостающие ячейки. Незавершенная ячейка записывается
+пустой строкой, прерванная или упавшая - значением nan. Сырые выборки
+ячеек хранятся рядом, в файле <results>.samples.json.
+
+Когда вся матрица выполнена, выборки добавляются запуском в хранилище
+результатов (results_store), откуда их читает regression_check;
+прерванные и пропущенные ячейки сохраняются значением NaN.
+"""
+
+import csv
+import json
+import math
+import multiprocessing
+import os
+import queue
+import time
+from datetime import datetime
+
+from performance_test import (
+    ALGORITHMS,
+    COMPARISON_REPEATS,
+    measure_sorting_samples,
+    runs_for_size
+)
+from generate_data import generate_numpy_data_sets
+from results_store import ResultsStore
+
+# Бюджет времени на одну ячейку по умолчанию, секунды
+DEFAULT_TIMEOUT = 60.0
+# Период опроса очереди результатов, секунды
+_POLL_INTERVAL = 0.05
+
+
+def _run_cell(cell, sort_func, arr, runs, cpu, results_queue):
+    """Замер одной ячейки в дочернем процессе."""
+    if cpu is not None:
+        os.sched_setaffinity(0, {cpu})
+    try:
+        samples, copy_time = measure_sorting_samples(sort_func, arr, runs)
+        results_queue.put((cell, samples, copy_time, None))
+    except RecursionError:
+        results_queue.put((cell, [math.nan], math.nan,
+                           "превышена глубина рекурсии"))
+
+
+def _samples_path(filename):
+    return filename + '.samples.json'
+
+
+def load_samples(filename='results.csv'):
+    """
+    Загрузка сырых выборок выполненных ячеек.
+
+    Returns:
+        Словарь: алгоритм -> тип_данных -> размер -> (выборки, время
+        копии), как для ResultsStore.append_run
+    """
+    path = _samples_path(filename)
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'r', encoding='utf-8') as f:
+        stored = json.load(f)
+    return {algo_name: {data_type: {int(size): (run_samples, copy_time)
+                                    for size, (run_samples, copy_time)
+                                    in by_size.items()}
+                        for data_type, by_size in by_type.items()}
+            for algo_name, by_type in stored.items()}
+
+
+def load_checkpoint(filename='results.csv'):
+    """
+    Загрузка уже выполненных ячеек из results.csv.
+
+    Returns:
+        Словарь: алгоритм -> тип_данных -> размер -> время (nan для
+        прерванных ячеек); пустые ячейки пропускаются
+    """
+    results = {}
+    if not os.path.exists(filename):
+        return results
+
+    with open(filename, 'r', newline='', encoding='utf-8') as csvfile:
+        rows = list(csv.reader(csvfile))
+    if not rows:
+        return results
+
+    sizes = [int(col[2:]) for col in rows[0][2:]]
+    for row in rows[1:]:
+        algo_name, data_type = row[0], row[1]
+        cells = results.setdefault(algo_name, {}).setdefault(data_type, {})
+        for size, value in zip(sizes, row[2:]):
+            if value:
+                cells[size] = float(value)
+    return results
+
+
+def save_checkpoint(results, algorithms, data_types, sizes,
+                    filename='results.csv', samples=None):
+    """
+    Атомарная запись матрицы в формате results.csv: сначала во
+    временный файл, затем замена исходного. Если переданы samples,
+    так же записываются сырые выборки.
+    """
+    if samples is not None:
+        tmp_name = _samples_path(filename) + '.tmp'
+        with open(tmp_name, 'w', encoding='utf-8') as f:
+            json.dump(samples, f, ensure_ascii=False)
+        os.replace(tmp_name, _samples_path(filename))
+
+    tmp_name = filename + '.tmp'
+    with open(tmp_name, 'w', newline='', encoding='utf-8') as csvfile:
+        writer = csv.writer(csvfile)
+        writer.writerow(['Алгоритм', 'Тип данных'] +
+                        [f'n={size}' for size in sizes])
+        for algo_name in algorithms:
+            for data_type in data_types:
+                cells = results.get(algo_name, {}).get(data_type, {})
+                row = [algo_name, data_type]
+                for size in sizes:
+                    if size not in cells:
+                        row.append('')
+                    elif math.isnan(cells[size]):
+                        row.append('nan')
+                    else:
+                        row.append(f"{cells[size]:.6f}")
+                writer.writerow(row)
+    os.replace(tmp_name, filename)
+
+
+def _available_cpus():
+    """Список ядер, доступных процессу."""
+    if hasattr(os, 'sched_getaffinity'):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+def run_matrix(data_sets, sizes, algorithms, filename='results.csv',
+               workers=None, timeout=DEFAULT_TIMEOUT, pin_cpus=None,
+               resume=True, store=None, repeats=None):
+    """
+    Параллельный замер матрицы алгоритм x тип данных x размер.
+
+    Args:
+        data_sets: тип_данных -> размер -> массив
+        sizes: размеры массивов
+        algorithms: подпись -> функция сортировки (функции уровня
+            модуля, чтобы их можно было передать в процесс)
+        filename: файл результатов и контрольных точек
+        workers: число одновременных процессов (по умолчанию - число
+            доступных ядер или ядер для закрепления)
+        timeout: бюджет времени на ячейку в секундах (None - без
+            ограничения)
+        pin_cpus: None - без закрепления; True - все доступные ядра;
+            список номеров ядер - закрепление процессов по кругу.
+            Закрепление по одному процессу на ядро уменьшает взаимное
+            влияние одновременных замеров (только Linux)
+        resume: продолжить с сохраненных в filename ячеек
+        store: хранилище результатов, в которое добавляется запуск
+            после выполнения всей матрицы (None - не сохранять)
+        repeats: минимальное число запусков на ячейку (см.
+            runs_for_size); для сохраняемых запусков -
+            COMPARISON_REPEATS
+
+    Returns:
+        Словарь результатов: алгоритм -> тип_данных -> размер -> время
+    """
+    if pin_cpus is True:
+        pin_cpus = _available_cpus()
+    if pin_cpus and not hasattr(os, 'sched_setaffinity'):
+        raise ValueError("Закрепление за ядрами не поддерживается в этой ОС")
+    if workers is None:
+        workers = len(pin_cpus) if pin_cpus else len(_available_cpus())
+
+    sizes = sorted(sizes)
+    data_types = list(data_sets)
+    results = load_checkpoint(filename) if resume else {}
+    samples = load_samples(filename) if resume else {}
+    for algo_name in algorithms:
+        for data_type in data_types:
+            results.setdefault(algo_name, {}).setdefault(data_type, {})
+            samples.setdefault(algo_name, {}).setdefault(data_type, {})
+    run_started = datetime.now()
+
+    # Меньшие размеры первыми: после прерывания ячейки более крупные
+    # размеры той же пары (алгоритм, тип данных) пропускаются
+    pending = [(algo_name, data_type, size)
+               for size in sizes
+               for algo_name in algorithms
+               for data_type in data_types
+               if size not in results[algo_name][data_type]]
+    failed = {(algo_name, data_type): size
+              for algo_name in algorithms
+              for data_type in data_types
+              for size, value in results[algo_name][data_type].items()
+              if math.isnan(value)}
+
+    total = len(pending)
+    done = 0
+    print(f"Ячеек к выполнению: {total} (процессов: {workers})")
+
+    def record(cell, run_samples, copy_time, note=None):
+        nonlocal done
+        algo_name, data_type, size = cell
+        value = sum(run_samples) / len(run_samples)
+        results[algo_name][data_type][size] = value
+        samples[algo_name][data_type][size] = (run_samples, copy_time)
+        if math.isnan(value):
+            key = (algo_name, data_type)
+            failed[key] = min(size, failed.get(key, size))
+        save_checkpoint(results, algorithms, data_types, sizes, filename,
+                        samples)
+        done += 1
+        status = note if note else f"{value:.6f} секунд"
+        print(f"  [{done}/{total}] {algo_name}, {data_type}, "
+              f"n={size}: {status}")
+
+    results_queue = multiprocessing.Queue()
+    running = {}  # слот -> (процесс, ячейка, время запуска)
+    try:
+        while pending or running:
+            for slot in range(workers):
+                if slot in running or not pending:
+                    continue
+                while pending:
+                    cell = pending.pop(0)
+                    algo_name, data_type, size = cell
+                    if failed.get((algo_name, data_type), size + 1) < size:
+                        record(cell, [math.nan], math.nan,
+                               "пропущено (бюджет)")
+                        continue
+                    cpu = pin_cpus[slot % len(pin_cpus)] if pin_cpus \
+                        else None
+                    process = multiprocessing.Process(
+                        target=_run_cell,
+                        args=(cell, algorithms[algo_name],
+                              data_sets[data_type][size],
+                              runs_for_size(size, repeats), cpu,
+                              results_queue))
+                    process.start()
+                    running[slot] = (process, cell, time.perf_counter())
+                    break
+
+            finished = {}
+            try:
+                cell, *outcome = results_queue.get(timeout=_POLL_INTERVAL)
+                finished[cell] = outcome
+                while True:
+                    cell, *outcome = results_queue.get_nowait()
+                    finished[cell] = outcome
+            except queue.Empty:
+                pass
+
+            now = time.perf_counter()
+            for slot, (process, cell, started) in list(running.items()):
+                if cell in finished:
+                    process.join()
+                    record(cell, *finished[cell])
+                elif timeout is not None and now - started > timeout:
+                    process.terminate()
+                    process.join()
+                    record(cell, [math.nan], math.nan,
+                           f"прервано по таймауту ({timeout:g} с)")
+                elif not process.is_alive() and process.exitcode != 0:
+                    record(cell, [math.nan], math.nan,
+                           f"процесс завершился с кодом {process.exitcode}")
+                else:
+                    continue
+                del running[slot]
+    finally:
+        for process, _, _ in running.values():
+            process.terminate()
+            process.join()
+
+    if store is not None:
+        store.append_run(
+            {algo_name: {data_type: {size: samples[algo_name][data_type][size]
+                                     for size in sizes
+                                     if size in samples[algo_name][data_type]}
+                         for data_type in data_types}
+             for algo_name in algorithms},
+            run_started, {'runner': 'benchmark_runner', 'workers': workers,
+                      'timeout': timeout})
+    return results
+
+
+if __name__ == "__main__":
+    sizes = [100, 500, 1000, 5000, 10000]
+
+    print("Генерация тестовых данных...")
+    data_sets = generate_numpy_data_sets(sizes, as_list=True)
+
+    run_matrix(data_sets, sizes, ALGORITHMS, 'results.csv',
+               timeout=DEFAULT_TIMEOUT, store=ResultsStore(),
+               repeats=COMPARISON_REPEATS)
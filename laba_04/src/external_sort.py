@@ -0,0 +1,253 @@
+"""
+Внешняя сортировка слиянием для файлов, не помещающихся в память.
+
+Файл читается частями в массивы NumPy int64, размер частей
+определяется бюджетом памяти; каждая часть сортируется на месте
+(ndarray.sort) и сбрасывается во временный файл (серию). Затем серии
+сливаются k-путевым слиянием через кучу с буферизованным чтением и
+записью. Если серий больше fan_in, слияние
+выполняется в несколько проходов.
+
+Форматы файлов:
+    - 'binary': подряд идущие int64 (little-endian);
+    - 'text': одно целое число в строке.
+Промежуточные серии всегда хранятся в двоичном формате.
+"""
+
+import heapq
+import os
+import random
+import tempfile
+import time
+from array import array
+from itertools import islice
+
+import numpy as np
+
+ITEM_SIZE = 8
+# Пик памяти фазы формирования серий на один элемент части: следующая
+# часть (int64) читается, пока предыдущая еще не освобождена
+CHUNK_ITEM_MEMORY = 2 * ITEM_SIZE
+# Число строк текстового файла, разбираемых за один вызов np.fromiter
+TEXT_BLOCK_ITEMS = 2 ** 12
+
+
+def _read_chunks(path, file_format, chunk_items):
+    """Чтение файла частями по chunk_items чисел (массивы NumPy int64)."""
+    if file_format == 'binary':
+        with open(path, 'rb') as f:
+            while True:
+                chunk = np.fromfile(f, dtype='<i8', count=chunk_items)
+                if not len(chunk):
+                    break
+                yield chunk
+    elif file_format == 'text':
+        with open(path, 'r', encoding='utf-8') as f:
+            while True:
+                # Заполнение заранее выделенного массива блоками, чтобы
+                # не держать в памяти список объектов int всей части
+                chunk = np.empty(chunk_items, dtype=np.int64)
+                filled = 0
+                while filled < chunk_items:
+                    count = min(TEXT_BLOCK_ITEMS, chunk_items - filled)
+                    block = np.fromiter(map(int, islice(f, count)),
+                                        dtype=np.int64)
+                    chunk[filled:filled + len(block)] = block
+                    filled += len(block)
+                    if len(block) < count:
+                        break
+                if not filled:
+                    break
+                yield chunk[:filled]
+    else:
+        raise ValueError(f"Неизвестный формат файла: {file_format}")
+
+
+def _iter_run(path, buffer_items):
+    """Буферизованное чтение двоичной серии."""
+    with open(path, 'rb') as f:
+        while True:
+            data = f.read(buffer_items * ITEM_SIZE)
+            if not data:
+                break
+            block = array('q')
+            block.frombytes(data)
+            yield from block
+
+
+class _BufferedWriter:
+    """Запись чисел в файл блоками по buffer_items элементов."""
+
+    def __init__(self, path, file_format, buffer_items):
+        self.file_format = file_format
+        self.buffer_items = buffer_items
+        self.buffer = []
+        if file_format == 'binary':
+            self.file = open(path, 'wb')
+        elif file_format == 'text':
+            self.file = open(path, 'w', encoding='utf-8')
+        else:
+            raise ValueError(f"Неизвестный формат файла: {file_format}")
+
+    def write_all(self, values):
+        self.flush()
+        values = iter(values)
+        while True:
+            self.buffer = list(islice(values, self.buffer_items))
+            if not self.buffer:
+                break
+            self.flush()
+
+    def flush(self):
+        if not self.buffer:
+            return
+        if self.file_format == 'binary':
+            self.file.write(array('q', self.buffer).tobytes())
+        else:
+            self.file.write('\n'.join(map(str, self.buffer)) + '\n')
+        self.buffer = []
+
+    def close(self):
+        self.flush()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _merge_runs(run_paths, output_path, file_format, buffer_items):
+    """k-путевое слияние серий через кучу (heapq.merge)."""
+    readers = [_iter_run(path, buffer_items) for path in run_paths]
+    with _BufferedWriter(output_path, file_format, buffer_items) as writer:
+        writer.write_all(heapq.merge(*readers))
+
+
+def external_sort(input_path, output_path, file_format='binary',
+                  memory_budget=64 * 2 ** 20, fan_in=16, tmp_dir=None):
+    """
+    Внешняя сортировка файла целых чисел.
+
+    Args:
+        input_path: входной файл
+        output_path: выходной файл (в том же формате)
+        file_format: 'binary' (int64) или 'text' (число в строке)
+        memory_budget: бюджет памяти в байтах; определяет длину серий и
+            размер буферов при слиянии
+        fan_in: максимальное число серий, сливаемых за один проход
+        tmp_dir: каталог для временных файлов (по умолчанию системный)
+
+    Returns:
+        Словарь статистики: items, runs, merge_passes, seconds
+
+    Временная сложность: O(n log n) сравнений и
+    O(n · (1 + log_fan_in(runs))) операций ввода-вывода
+    """
+    if fan_in < 2:
+        raise ValueError("fan_in должен быть не меньше 2")
+
+    start = time.perf_counter()
+    chunk_items = max(1, memory_budget // CHUNK_ITEM_MEMORY)
+
+    with tempfile.TemporaryDirectory(dir=tmp_dir) as work_dir:
+        # Фаза 1: формирование отсортированных серий
+        runs = []
+        items = 0
+        for chunk in _read_chunks(input_path, file_format, chunk_items):
+            chunk.sort()
+            run_path = os.path.join(work_dir, f'run_{len(runs)}.bin')
+            with open(run_path, 'wb') as f:
+                chunk.astype('<i8', copy=False).tofile(f)
+            runs.append(run_path)
+            items += len(chunk)
+        run_count = len(runs)
+
+        # Фаза 2: многопроходное слияние по fan_in серий
+        buffer_items = max(1, memory_budget // (ITEM_SIZE * (fan_in + 1)))
+        merge_passes = 0
+        while len(runs) > fan_in:
+            merged = []
+            for i in range(0, len(runs), fan_in):
+                group = runs[i:i + fan_in]
+                run_path = os.path.join(
+                    work_dir, f'pass{merge_passes}_{len(merged)}.bin')
+                _merge_runs(group, run_path, 'binary', buffer_items)
+                for path in group:
+                    os.remove(path)
+                merged.append(run_path)
+            runs = merged
+            merge_passes += 1
+
+        _merge_runs(runs, output_path, file_format, buffer_items)
+        merge_passes += 1
+
+    return {
+        'items': items,
+        'runs': run_count,
+        'merge_passes': merge_passes,
+        'seconds': time.perf_counter() - start
+    }
+
+
+def generate_random_file(path, count, file_format='binary',
+                         min_val=0, max_val=10 ** 9, block_items=2 ** 16):
+    """Запись count случайных целых чисел в файл блоками."""
+    with _BufferedWriter(path, file_format, block_items) as writer:
+        remaining = count
+        while remaining > 0:
+            size = min(block_items, remaining)
+            writer.write_all(random.randint(min_val, max_val)
+                             for _ in range(size))
+            remaining -= size
+
+
+def is_sorted_file(path, file_format='binary'):
+    """Проверка упорядоченности файла за один проход."""
+    previous = None
+    for chunk in _read_chunks(path, file_format, 2 ** 16):
+        if np.any(chunk[1:] < chunk[:-1]):
+            return False
+        if previous is not None and chunk[0] < previous:
+            return False
+        previous = chunk[-1]
+    return True
+
+
+def benchmark_external_sort(size_mb=64, file_format='binary',
+                            memory_budget=16 * 2 ** 20, fan_in=16):
+    """
+    Замер скорости внешней сортировки в МБ/с.
+
+    Returns:
+        Словарь статистики external_sort с добавленными size_mb и mb_per_s
+    """
+    count = size_mb * 2 ** 20 // ITEM_SIZE
+    with tempfile.TemporaryDirectory() as work_dir:
+        input_path = os.path.join(work_dir, 'input')
+        output_path = os.path.join(work_dir, 'output')
+        generate_random_file(input_path, count, file_format)
+        file_mb = os.path.getsize(input_path) / 2 ** 20
+
+        stats = external_sort(input_path, output_path, file_format,
+                              memory_budget, fan_in)
+        if not is_sorted_file(output_path, file_format):
+            raise RuntimeError("Выходной файл не отсортирован")
+
+    stats['size_mb'] = file_mb
+    stats['mb_per_s'] = file_mb / stats['seconds']
+    print(f"{file_format:>7} {file_mb:>9.1f} МБ  "
+          f"бюджет {memory_budget / 2 ** 20:>6.1f} МБ  "
+          f"серий {stats['runs']:>4}  проходов {stats['merge_passes']}  "
+          f"{stats['seconds']:>8.2f} с  {stats['mb_per_s']:>7.2f} МБ/с")
+    return stats
+
+
+if __name__ == "__main__":
+    print("Внешняя сортировка слиянием")
+    print("")
+    for fmt in ['binary', 'text']:
+        for budget_mb in [4, 16]:
+            benchmark_external_sort(size_mb=32, file_format=fmt,
+                                    memory_budget=budget_mb * 2 ** 20)
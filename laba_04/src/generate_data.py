@@ -1,8 +1,21 @@
 """
 Генерация тестовых данных для анализа алгоритмов сортировки.
+
+Функции generate_*_array создают списки через модуль random.
+Генераторы из NUMPY_GENERATORS векторизованы, воспроизводимы по
+явному seed и вместе с generate_cached_array кешируют массивы на диске
+в формате .npy, чтобы повторные запуски не генерировали их заново.
 """
 
+import os
 import random
+import string
+import zlib
+
+import numpy as np
+
+# Каталог кеша сгенерированных массивов
+CACHE_DIR = 'data_cache'
 
 
 def generate_random_array(size, min_val=0, max_val=10000):
@@ -42,24 +55,282 @@ def generate_almost_sorted_array(size, swap_percentage=0.05,
     return arr
 
 
-def generate_data_sets(sizes):
+def generate_few_unique_array(size, unique_count=10,
+                              min_val=0, max_val=10000):
+    """
+    Генерация массива с небольшим числом различных значений
+    (много повторов).
+    """
+    values = random.sample(range(min_val, max_val + 1),
+                           min(unique_count, max_val - min_val + 1))
+    return [random.choice(values) for _ in range(size)]
+
+
+def generate_random_strings(size, length=8, as_bytes=False):
+    """
+    Генерация случайных строк из букв и цифр (как ключи в laba_05).
+    as_bytes: вернуть байтовые строки вместо str
+    """
+    chars = string.ascii_letters + string.digits
+    strings = [''.join(random.choices(chars, k=length)) for _ in range(size)]
+    if as_bytes:
+        return [s.encode('ascii') for s in strings]
+    return strings
+
+
+def generate_shared_prefix_strings(size, prefix_count=10, prefix_length=24,
+                                   suffix_length=8, as_bytes=False):
+    """
+    Генерация строк с длинными общими префиксами (пути, URL, ключи с
+    пространством имен): каждая строка - один из prefix_count
+    префиксов и случайный суффикс.
+    """
+    prefixes = generate_random_strings(prefix_count, prefix_length)
+    suffixes = generate_random_strings(size, suffix_length)
+    strings = [random.choice(prefixes) + '/' + suffix for suffix in suffixes]
+    if as_bytes:
+        return [s.encode('ascii') for s in strings]
+    return strings
+
+
+class _QuicksortAdversary:
+    """
+    Противник Макилроя («A Killer Adversary for Quicksort», 1999).
+
+    Значения элементов назначаются лениво во время сортировки: пока
+    элемент не сравнивался, он считается «газом» (больше любого
+    назначенного значения). Когда сравниваются два газовых элемента,
+    один из них замораживается наименьшим свободным значением, причем
+    предпочтение отдается кандидату в опорные элементы. В итоге опорные
+    элементы оказываются почти минимальными, и быстрая сортировка
+    выполняет квадратичное число сравнений.
+    """
+
+    def __init__(self, size):
+        self.gas = size
+        self.values = [size] * size
+        self.solid = 0
+        self.candidate = 0
+
+    def _freeze(self, index):
+        self.values[index] = self.solid
+        self.solid += 1
+
+    def compare(self, x, y):
+        values = self.values
+        if values[x] == self.gas and values[y] == self.gas:
+            if x == self.candidate:
+                self._freeze(x)
+            else:
+                self._freeze(y)
+        if values[x] == self.gas:
+            self.candidate = x
+        elif values[y] == self.gas:
+            self.candidate = y
+        return values[x] - values[y]
+
+
+class _AdversaryItem:
+    """Элемент, сравнение которого делегируется противнику."""
+
+    __slots__ = ('index', 'adversary')
+
+    def __init__(self, index, adversary):
+        self.index = index
+        self.adversary = adversary
+
+    def __lt__(self, other):
+        return self.adversary.compare(self.index, other.index) < 0
+
+
+def generate_median_of_three_killer(size, sort_func=None):
+    """
+    Генерация входа, на котором быстрая сортировка деградирует до O(n²).
+
+    Противник Макилроя прогоняется против sort_func (по умолчанию
+    quick_sort_optimized с медианой трех), и полученная перестановка
+    возвращается как обычный массив чисел. Построение само занимает
+    квадратичное время, поэтому подходит для размеров до ~10^4.
+    """
+    if sort_func is None:
+        from sorts import quick_sort_optimized
+        sort_func = quick_sort_optimized
+
+    adversary = _QuicksortAdversary(size)
+    sort_func([_AdversaryItem(i, adversary) for i in range(size)])
+
+    # Элементы, которые ни разу не сравнивались, замораживаются в конце
+    for i in range(size):
+        if adversary.values[i] == adversary.gas:
+            adversary._freeze(i)
+    return adversary.values
+
+
+# Генераторы данных: тип_данных -> функция(size)
+DATA_GENERATORS = {
+    'random': generate_random_array,
+    'sorted': generate_sorted_array,
+    'reversed': generate_reversed_array,
+    'almost_sorted': generate_almost_sorted_array,
+    'few_unique': generate_few_unique_array,
+    'adversarial': generate_median_of_three_killer
+}
+
+DEFAULT_DATA_TYPES = ['random', 'sorted', 'reversed', 'almost_sorted']
+
+
+def generate_data_sets(sizes, data_types=None):
     """
     Генерация всех типов данных для заданных размеров.
 
+    data_types: список типов из DATA_GENERATORS (по умолчанию четыре
+    основных: random, sorted, reversed, almost_sorted)
+
+    Возвращает словарь: тип_данных -> размер -> массив
+    """
+    if data_types is None:
+        data_types = DEFAULT_DATA_TYPES
+
+    data_sets = {data_type: {} for data_type in data_types}
+
+    for size in sizes:
+        for data_type in data_types:
+            data_sets[data_type][size] = DATA_GENERATORS[data_type](size)
+
+    return data_sets
+
+
+def _numpy_random(size, rng, max_val=10000):
+    return rng.integers(0, max_val, size=size, endpoint=True, dtype=np.int64)
+
+
+def _numpy_sorted(size, rng, max_val=10000):
+    arr = _numpy_random(size, rng, max_val)
+    arr.sort()
+    return arr
+
+
+def _numpy_reversed(size, rng, max_val=10000):
+    return _numpy_sorted(size, rng, max_val)[::-1].copy()
+
+
+def _numpy_almost_sorted(size, rng, swap_percentage=0.05, max_val=10000):
+    """Отсортированный массив с непересекающимися случайными обменами."""
+    arr = _numpy_sorted(size, rng, max_val)
+    num_swaps = min(int(size * swap_percentage), size // 2)
+    if num_swaps:
+        pairs = rng.choice(size, 2 * num_swaps, replace=False)
+        i, j = pairs[:num_swaps], pairs[num_swaps:]
+        arr[i], arr[j] = arr[j], arr[i].copy()
+    return arr
+
+
+def _numpy_few_unique(size, rng, unique_count=10, max_val=10000):
+    values = rng.choice(max_val + 1, min(unique_count, max_val + 1),
+                        replace=False)
+    return values[rng.integers(0, len(values), size=size)].astype(np.int64)
+
+
+def _numpy_zipf(size, rng, exponent=1.2, unique_count=1000, max_val=10000):
+    """
+    Распределение Ципфа на unique_count значениях: k-е по частоте
+    значение встречается с вероятностью, пропорциональной 1 / k^exponent.
+    """
+    weights = 1.0 / np.arange(1, unique_count + 1) ** exponent
+    ranks = rng.choice(unique_count, size=size, p=weights / weights.sum())
+    values = rng.choice(max_val + 1, unique_count, replace=False)
+    return values[ranks].astype(np.int64)
+
+
+def _numpy_organ_pipe(size, rng, max_val=10000):
+    """Возрастающая, затем убывающая последовательность («органные трубы»)."""
+    half = (size + 1) // 2
+    pipe = np.concatenate([np.arange(half, dtype=np.int64),
+                           np.arange(size - half, dtype=np.int64)[::-1]])
+    return pipe * max_val // max(half, 1)
+
+
+def _numpy_sawtooth(size, rng, teeth=10, max_val=10000):
+    """teeth возрастающих серий одинаковой длины («пила»)."""
+    period = max(1, size // teeth)
+    return np.arange(size, dtype=np.int64) % period * max_val // period
+
+
+def _numpy_median_of_three_killer(size, rng):
+    """
+    Вход-антагонист для медианы трех (противник Макилроя). Построение
+    квадратично, поэтому его стоит выполнять через кеш.
+    """
+    return np.array(generate_median_of_three_killer(size), dtype=np.int64)
+
+
+# Векторизованные генераторы: тип_данных -> функция(size, rng)
+NUMPY_GENERATORS = {
+    'random': _numpy_random,
+    'sorted': _numpy_sorted,
+    'reversed': _numpy_reversed,
+    'almost_sorted': _numpy_almost_sorted,
+    'few_unique': _numpy_few_unique,
+    'zipf': _numpy_zipf,
+    'organ_pipe': _numpy_organ_pipe,
+    'sawtooth': _numpy_sawtooth,
+    'adversarial': _numpy_median_of_three_killer
+}
+
+
+def generate_numpy_array(data_type, size, seed=0):
+    """
+    Генерация массива NumPy int64 заданного типа.
+
+    Генератор случайных чисел инициализируется по (seed, size, тип),
+    поэтому каждая ячейка воспроизводима независимо от остальных.
+    """
+    rng = np.random.default_rng([seed, size, zlib.crc32(data_type.encode())])
+    return NUMPY_GENERATORS[data_type](size, rng)
+
+
+def generate_cached_array(data_type, size, seed=0, cache_dir=CACHE_DIR):
+    """
+    Массив из кеша .npy или новый с сохранением в кеш.
+
+    Массив из кеша отображается в память только для чтения: страницы
+    читаются с диска по мере обращения. Для сортировки на месте нужна
+    копия (например, arr.copy() или arr.tolist()).
+    """
+    path = os.path.join(cache_dir, f'{data_type}_{size}_{seed}.npy')
+    if not os.path.exists(path):
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp_path = path + '.tmp.npy'
+        np.save(tmp_path, generate_numpy_array(data_type, size, seed))
+        os.replace(tmp_path, path)
+    return np.load(path, mmap_mode='r')
+
+
+def generate_numpy_data_sets(sizes, data_types=None, seed=0,
+                             cache_dir=CACHE_DIR, as_list=False):
+    """
+    Генерация наборов данных векторизованными генераторами с кешем.
+
+    Args:
+        sizes: размеры массивов
+        data_types: типы из NUMPY_GENERATORS (по умолчанию все)
+        seed: начальное значение генератора
+        cache_dir: каталог кеша (None - без кеша)
+        as_list: вернуть списки Python вместо массивов NumPy
+
     Возвращает словарь: тип_данных -> размер -> массив
     """
-    data_sets = {
-        'random': {},
-        'sorted': {},
-        'reversed': {},
-        'almost_sorted': {}
-    }
+    if data_types is None:
+        data_types = list(NUMPY_GENERATORS)
 
+    data_sets = {data_type: {} for data_type in data_types}
     for size in sizes:
-        data_sets['random'][size] = generate_random_array(size)
-        data_sets['sorted'][size] = generate_sorted_array(size)
-        data_sets['reversed'][size] = generate_reversed_array(size)
-        data_sets['almost_sorted'][size] = generate_almost_sorted_array(size)
+        for data_type in data_types:
+            if cache_dir is None:
+                arr = generate_numpy_array(data_type, size, seed)
+            else:
+                arr = generate_cached_array(data_type, size, seed, cache_dir)
+            data_sets[data_type][size] = arr.tolist() if as_list else arr
 
     return data_sets
 
@@ -0,0 +1,159 @@
+"""
+Подсчет операций сортировки: сравнений, чтений, записей и выделений.
+
+Подсчет выполняется снаружи алгоритмов: массив заменяется списком-
+прокси CountingList, а элементы - обертками CountedItem, которые
+увеличивают счетчики при обращениях. Код сортировок не меняется:
+вспомогательные списки они создают через sorts._aux_list, который
+без списка-прокси возвращает список как есть, поэтому при обычных
+замерах накладных расходов нет.
+
+Считаются:
+    - comparisons - сравнения элементов (<, <=, >, >=, ==);
+    - reads, writes - чтения и записи элементов массива, включая
+      срезы и итерацию (обмен двух элементов - две записи);
+    - allocated - элементы вспомогательных списков: срезы исходного
+      массива и его копий, а также буферы, счетчики и копии ключей,
+      которые сортировки создают через sorts._aux_list (метод
+      aux_list списка-прокси);
+    - peak_bytes - пик дополнительной памяти в отдельном запуске без
+      подсчета (performance_test.measure_peak_memory).
+
+Целочисленные сортировки выполняют над элементами арифметику, поэтому
+для них элементы не оборачиваются, и сравнения не считаются.
+"""
+
+
+class OperationCounter:
+    """Счетчики операций одного запуска."""
+
+    __slots__ = ('comparisons', 'reads', 'writes', 'allocated')
+
+    def __init__(self):
+        self.comparisons = 0
+        self.reads = 0
+        self.writes = 0
+        self.allocated = 0
+
+    def as_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class CountedItem:
+    """Элемент, подсчитывающий сравнения с другими элементами."""
+
+    __slots__ = ('value', 'counter')
+
+    def __init__(self, value, counter):
+        self.value = value
+        self.counter = counter
+
+    def __lt__(self, other):
+        self.counter.comparisons += 1
+        return self.value < other.value
+
+    def __le__(self, other):
+        self.counter.comparisons += 1
+        return self.value <= other.value
+
+    def __gt__(self, other):
+        self.counter.comparisons += 1
+        return self.value > other.value
+
+    def __ge__(self, other):
+        self.counter.comparisons += 1
+        return self.value >= other.value
+
+    def __eq__(self, other):
+        self.counter.comparisons += 1
+        return self.value == other.value
+
+    __hash__ = None
+
+
+class CountingList(list):
+    """
+    Список, подсчитывающий чтения и записи элементов. Срез возвращает
+    новый CountingList с тем же счетчиком, поэтому подсчитываются и
+    операции над вспомогательными копиями (например, в merge_sort).
+    """
+
+    def __init__(self, values, counter):
+        super().__init__(values)
+        self.counter = counter
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            part = CountingList(super().__getitem__(index), self.counter)
+            self.counter.reads += len(part)
+            self.counter.allocated += len(part)
+            return part
+        self.counter.reads += 1
+        return super().__getitem__(index)
+
+    def __setitem__(self, index, value):
+        if isinstance(index, slice):
+            # Копирование источника-прокси не считается его чтением: оно
+            # уже учтено при получении среза
+            if isinstance(value, CountingList):
+                value = list(list.__iter__(value))
+            else:
+                value = list(value)
+            self.counter.writes += len(value)
+        else:
+            self.counter.writes += 1
+        super().__setitem__(index, value)
+
+    def __iter__(self):
+        for item in super().__iter__():
+            self.counter.reads += 1
+            yield item
+
+    def copy(self):
+        self.counter.reads += len(self)
+        self.counter.allocated += len(self)
+        return CountingList(super().__iter__(), self.counter)
+
+    def aux_list(self, values):
+        """
+        Вспомогательный список сортировки (буфер слияния, массив
+        счетчиков): его элементы учитываются в allocated, а обращения
+        к нему - в reads и writes.
+        """
+        part = CountingList(values, self.counter)
+        self.counter.allocated += len(part)
+        return part
+
+
+def count_operations(sort_func, arr, memory=True):
+    """
+    Подсчет операций одной сортировки копии arr.
+
+    Args:
+        sort_func: функция сортировки
+        arr: исходный массив (не изменяется)
+        memory: измерять ли пик памяти отдельным запуском
+
+    Returns:
+        Словарь: comparisons, reads, writes, allocated, peak_bytes
+    """
+    counter = OperationCounter()
+    integer = getattr(sort_func, 'is_integer', False)
+    items = list(arr) if integer else [CountedItem(x, counter) for x in arr]
+    work = CountingList(items, counter)
+
+    result = sort_func(work)
+    values = list(list.__iter__(result))
+    if not integer:
+        values = [item.value for item in values]
+    if values != sorted(arr):
+        raise AssertionError(
+            f"{sort_func.__name__} вернула неотсортированный массив")
+
+    counts = counter.as_dict()
+    counts['peak_bytes'] = None
+    if memory:
+        # performance_test сам импортирует этот модуль
+        from performance_test import measure_peak_memory
+        counts['peak_bytes'] = measure_peak_memory(sort_func, arr)
+    return counts
@@ -0,0 +1,190 @@
+"""
+Параллельная сортировка слиянием на пуле процессов.
+
+Данные один раз копируются в разделяемую память
+(multiprocessing.shared_memory) как массив int64, поэтому процессам
+передаются только имя блока памяти и границы, а не сам список.
+
+Схема (Parallel Sorting by Regular Sampling):
+    1. массив делится на p частей, каждая сортируется своим процессом;
+    2. из отсортированных частей берутся равномерные выборки, по ним
+       выбираются p - 1 разделителей;
+    3. каждый процесс сливает из всех частей элементы своего диапазона
+       значений [s_(j-1), s_j) сразу в итоговую позицию выходного массива.
+"""
+
+import os
+import time
+import multiprocessing
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from sorts import supports_key, write_back
+
+# Ниже этого размера накладные расходы на процессы превышают выигрыш
+PARALLEL_THRESHOLD = 100_000
+
+
+def _attach(name, n):
+    """Подключение к блоку разделяемой памяти как к массиву int64."""
+    shm = shared_memory.SharedMemory(name=name)
+    return shm, np.ndarray((n,), dtype=np.int64, buffer=shm.buf)
+
+
+def _sort_chunk(task):
+    """Сортировка части [lo, hi) разделяемого массива (в процессе пула)."""
+    name, n, lo, hi = task
+    shm, data = _attach(name, n)
+    try:
+        data[lo:hi].sort(kind='stable')
+    finally:
+        del data
+        shm.close()
+
+
+def _merge_partition(task):
+    """
+    Слияние отрезков отсортированных частей, попавших в один диапазон
+    значений, в выходной массив начиная с позиции out_lo.
+
+    Отрезки копируются подряд и сливаются устойчивой сортировкой NumPy
+    (Timsort), которая находит уже упорядоченные серии и только сливает
+    их: O(m log k) для m элементов из k частей.
+    """
+    src_name, dst_name, n, ranges, out_lo = task
+    src_shm, src = _attach(src_name, n)
+    dst_shm, dst = _attach(dst_name, n)
+    try:
+        pos = out_lo
+        for lo, hi in ranges:
+            dst[pos:pos + hi - lo] = src[lo:hi]
+            pos += hi - lo
+        dst[out_lo:pos].sort(kind='stable')
+    finally:
+        del src, dst
+        src_shm.close()
+        dst_shm.close()
+
+
+def _choose_splitters(data, bounds, parts):
+    """Выбор parts - 1 разделителей по равномерным выборкам из частей."""
+    samples = np.concatenate([
+        data[lo:hi][np.linspace(0, hi - lo - 1, parts, dtype=np.int64)]
+        for lo, hi in bounds if hi > lo
+    ])
+    samples.sort()
+    step = len(samples) / parts
+    return [samples[int(step * j)] for j in range(1, parts)]
+
+
+def _merge_tasks(data, bounds, splitters, src_name, dst_name, n):
+    """
+    Формирование заданий слияния: для каждого диапазона значений -
+    отрезки всех частей и позиция в выходном массиве.
+    """
+    cuts = []
+    for lo, hi in bounds:
+        positions = np.searchsorted(data[lo:hi], splitters, side='left')
+        cuts.append([lo] + [lo + int(p) for p in positions] + [hi])
+
+    tasks = []
+    out_lo = 0
+    for j in range(len(splitters) + 1):
+        ranges = [(chunk_cuts[j], chunk_cuts[j + 1]) for chunk_cuts in cuts
+                  if chunk_cuts[j + 1] > chunk_cuts[j]]
+        tasks.append((src_name, dst_name, n, ranges, out_lo))
+        out_lo += sum(hi - lo for lo, hi in ranges)
+    return tasks
+
+
+@supports_key(stable=True, integer=True)
+def parallel_sort(arr, workers=None, threshold=PARALLEL_THRESHOLD):
+    """
+    Параллельная сортировка целых чисел (int64) слиянием
+
+    Args:
+        arr: список, array.array или массив NumPy целых чисел;
+            сортируется на месте
+        workers: количество процессов (по умолчанию - число ядер)
+        threshold: размер, ниже которого сортировка выполняется в
+            текущем процессе без пула
+
+    Временная сложность: O((n / p) log n) при p процессах
+    Пространственная сложность: O(n) (два блока разделяемой памяти)
+    """
+    n = len(arr)
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    if n < threshold or workers < 2 or n < workers:
+        values = np.array(arr, dtype=np.int64)
+        values.sort(kind='stable')
+        write_back(arr, values)
+        return arr
+
+    src_shm = shared_memory.SharedMemory(create=True, size=n * 8)
+    dst_shm = shared_memory.SharedMemory(create=True, size=n * 8)
+    try:
+        src = np.ndarray((n,), dtype=np.int64, buffer=src_shm.buf)
+        dst = np.ndarray((n,), dtype=np.int64, buffer=dst_shm.buf)
+        src[:] = arr
+
+        bounds = [(n * i // workers, n * (i + 1) // workers)
+                  for i in range(workers)]
+        with multiprocessing.Pool(workers) as pool:
+            pool.map(_sort_chunk,
+                     [(src_shm.name, n, lo, hi) for lo, hi in bounds])
+            splitters = _choose_splitters(src, bounds, workers)
+            pool.map(_merge_partition,
+                     _merge_tasks(src, bounds, splitters,
+                                  src_shm.name, dst_shm.name, n))
+
+        write_back(arr, dst)
+        del src, dst
+    finally:
+        for shm in (src_shm, dst_shm):
+            shm.close()
+            shm.unlink()
+    return arr
+
+
+def benchmark_scaling(sizes=(10 ** 6, 10 ** 7, 10 ** 8), max_workers=None,
+                      seed=42):
+    """
+    Измерение масштабируемости: время сортировки при 1..max_workers
+    процессах для каждого размера.
+
+    Массив размера 10^8 занимает 800 МБ, а сортировка требует еще два
+    блока разделяемой памяти того же размера.
+
+    Returns:
+        Словарь: размер -> количество процессов -> время
+    """
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    rng = np.random.default_rng(seed)
+    results = {}
+
+    print(f"{'Размер':>12} {'Процессы':>9} {'Время (с)':>12} "
+          f"{'Ускорение':>10}")
+    for size in sizes:
+        data = rng.integers(0, 10000, size=size, dtype=np.int64)
+        results[size] = {}
+        for workers in range(1, max_workers + 1):
+            work = data.copy()
+            start = time.perf_counter()
+            parallel_sort(work, workers=workers, threshold=0)
+            elapsed = time.perf_counter() - start
+            results[size][workers] = elapsed
+
+            speedup = results[size][1] / elapsed
+            print(f"{size:>12} {workers:>9} {elapsed:>12.4f} "
+                  f"{speedup:>9.2f}x")
+        del data
+    return results
+
+
+if __name__ == "__main__":
+    print(f"Доступно ядер: {os.cpu_count()}")
+    benchmark_scaling()
@@ -5,15 +5,116 @@
 import timeit
 import copy
 import csv
+import gc
+import random
+import tracemalloc
+from array import array
+from datetime import datetime
+
+import numpy as np
+
 from sorts import (
     bubble_sort,
     selection_sort,
     insertion_sort,
     merge_sort,
+    merge_sort_bottom_up,
     quick_sort,
-    quick_sort_optimized
+    quick_sort_optimized,
+    intro_sort,
+    pdq_sort,
+    pdq_sort_branchless,
+    tim_sort,
+    counting_sort,
+    radix_sort_lsd,
+    radix_sort_msd,
+    integer_sort,
+    nth_element,
+    partial_sort,
+    top_k
+)
+from vectorized_sorts import (
+    bitonic_sort_numpy,
+    odd_even_merge_sort_numpy,
+    counting_sort_numpy,
+    radix_sort_numpy
 )
-from generate_data import generate_data_sets
+from generate_data import (
+    generate_data_sets,
+    generate_numpy_data_sets,
+    generate_random_strings,
+    generate_shared_prefix_strings
+)
+from string_sorts import msd_string_sort, multikey_quicksort
+from instrumentation import count_operations
+from results_store import ResultsStore
+
+# Алгоритмы основной матрицы замеров: подпись -> функция
+ALGORITHMS = {
+    'Bubble Sort': bubble_sort,
+    'Selection Sort': selection_sort,
+    'Insertion Sort': insertion_sort,
+    'Merge Sort': merge_sort,
+    'Merge Sort (восходящий)': merge_sort_bottom_up,
+    'Quick Sort': quick_sort,
+    'Quick Sort (оптимизированный)': quick_sort_optimized,
+    'Intro Sort': intro_sort,
+    'Pdq Sort': pdq_sort,
+    'Pdq Sort (блочный)': pdq_sort_branchless,
+    'Tim Sort': tim_sort,
+    'Counting Sort': counting_sort,
+    'Radix Sort (LSD)': radix_sort_lsd,
+    'Radix Sort (MSD)': radix_sort_msd,
+    'Integer Sort (авто)': integer_sort
+}
+
+# Число запусков на ячейку для сохраняемых замеров: при 5 и 5 выборках
+# наименьшее p-значение U-критерия равно 2/252 < 0.05, а при 3 и 3 -
+# 0.1, и regression_check не может обнаружить регрессию
+COMPARISON_REPEATS = 5
+
+# Типы входных контейнеров: подпись -> преобразование из списка
+INPUT_TYPES = {
+    'list': list,
+    'array.array': lambda data: array('q', data),
+    'numpy': lambda data: np.array(data, dtype=np.int64),
+}
+
+
+def measure_sorting_samples(sort_func, arr, number_of_runs=1):
+    """
+    Замер времени каждого запуска сортировки.
+
+    Копии входного массива создаются заранее, вне замеряемого участка,
+    поэтому в замер попадает только сама сортировка. Копия поверхностная:
+    сортировки переставляют элементы, но не изменяют их. Сборщик мусора
+    на время замеров отключается, как в timeit.
+
+    Args:
+        sort_func: функция сортировки
+        arr: массив для сортировки (список, array.array или массив NumPy)
+        number_of_runs: количество запусков
+
+    Returns:
+        (samples, copy_time): время каждого запуска и время создания
+        одной копии массива в секундах
+    """
+    start = timeit.default_timer()
+    copies = [copy.copy(arr) for _ in range(number_of_runs)]
+    copy_time = (timeit.default_timer() - start) / number_of_runs
+
+    samples = []
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for work in copies:
+            start = timeit.default_timer()
+            sort_func(work)
+            samples.append(timeit.default_timer() - start)
+    finally:
+        if gc_enabled:
+            gc.enable()
+    return samples, copy_time
 
 
 def measure_sorting_time(sort_func, arr, number_of_runs=1):
@@ -28,21 +129,173 @@ def measure_sorting_time(sort_func, arr, number_of_runs=1):
     Returns:
         Время выполнения в секундах
     """
-    test_arr = copy.deepcopy(arr)
-    timer = timeit.Timer(lambda: sort_func(copy.deepcopy(test_arr)))
-    time_taken = timer.timeit(number=number_of_runs) / number_of_runs
-    return time_taken
+    samples, _ = measure_sorting_samples(sort_func, arr, number_of_runs)
+    return sum(samples) / len(samples)
+
+
+def measure_peak_memory(sort_func, arr):
+    """
+    Измерение пиковой дополнительной памяти сортировки через tracemalloc.
+
+    Копия входного массива создается до начала трассировки, поэтому
+    учитываются только выделения внутри самой сортировки.
+
+    Returns:
+        Пиковый объем выделенной памяти в байтах
+    """
+    test_arr = list(arr)
+    tracemalloc.start()
+    try:
+        sort_func(test_arr)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+def compare_merge_sort_memory(data_sets, sizes):
+    """
+    Сравнение пикового потребления памяти вариантов сортировки слиянием
+    на случайных данных.
+
+    Returns:
+        Словарь: вариант -> размер -> пик памяти в байтах
+    """
+    variants = {
+        'Merge Sort': merge_sort,
+        'Merge Sort (восходящий)': merge_sort_bottom_up,
+        'Merge Sort (4-путевой)': lambda arr: merge_sort_bottom_up(arr, 4)
+    }
+    results = {name: {} for name in variants}
+
+    print("\nПиковая память сортировок слиянием (КБ):")
+    print(f"{'Вариант':<25}", end="")
+    for size in sizes:
+        print(f"{size:>10}", end="")
+    print()
+
+    for name, sort_func in variants.items():
+        print(f"{name:<25}", end="")
+        for size in sizes:
+            peak = measure_peak_memory(sort_func, data_sets['random'][size])
+            results[name][size] = peak
+            print(f"{peak / 1024:>10.1f}", end="")
+        print()
+
+    return results
+
+
+def compare_operation_counts(data_sets, sizes, algorithms,
+                             data_type='random'):
+    """
+    Подсчет сравнений, записей и выделений памяти каждым алгоритмом
+    (instrumentation.count_operations) - объяснение разницы во времени.
+
+    Returns:
+        Словарь: алгоритм -> размер -> словарь счетчиков
+    """
+    results = {algo_name: {} for algo_name in algorithms}
+
+    print(f"\nПодсчет операций (тип данных: {data_type}):")
+    print(f"{'Алгоритм':<30} {'n':>6} {'Сравнения':>11} {'Чтения':>11} "
+          f"{'Записи':>11} {'Выделено':>10} {'Пик (КБ)':>10}")
+
+    for algo_name, algo_func in algorithms.items():
+        for size in sizes:
+            counts = count_operations(algo_func, data_sets[data_type][size])
+            results[algo_name][size] = counts
+            print(f"{algo_name:<30} {size:>6} {counts['comparisons']:>11} "
+                  f"{counts['reads']:>11} {counts['writes']:>11} "
+                  f"{counts['allocated']:>10} "
+                  f"{counts['peak_bytes'] / 1024:>10.1f}")
+
+    return results
+
+
+def compare_string_sorts(sizes):
+    """
+    Сравнение строковых сортировок с сортировками сравнением на
+    случайных 8-символьных строках, строках с общими префиксами и
+    байтовых строках.
+
+    Returns:
+        Словарь: набор данных -> алгоритм -> размер -> время
+    """
+    algorithms = {
+        'Multikey Quicksort': multikey_quicksort,
+        'MSD String Sort': msd_string_sort,
+        'Quick Sort (оптимизированный)': quick_sort_optimized,
+        'sorted()': sorted
+    }
+    generators = {
+        'random': generate_random_strings,
+        'shared_prefix': generate_shared_prefix_strings,
+        'shared_prefix_bytes': lambda size: generate_shared_prefix_strings(
+            size, as_bytes=True)
+    }
+    results = {name: {algo_name: {} for algo_name in algorithms}
+               for name in generators}
+
+    print("\nСортировка строк:")
+    print(f"{'Данные':<22} {'n':>7}" + "".join(
+        f"{algo_name:>31}" for algo_name in algorithms))
+
+    for name, generator in generators.items():
+        for size in sizes:
+            data = generator(size)
+            line = f"{name:<22} {size:>7}"
+            for algo_name, algo_func in algorithms.items():
+                samples, _ = measure_sorting_samples(algo_func, data,
+                                                     runs_for_size(size))
+                elapsed = min(samples)
+                results[name][algo_name][size] = elapsed
+                line += f"{elapsed:>31.6f}"
+            print(line)
+
+    return results
+
 
+def runs_for_size(size, repeats=None):
+    """
+    Количество запусков для усреднения в зависимости от размера.
 
-def test_all_algorithms(data_sets, sizes, algorithms):
+    Args:
+        repeats: минимальное число запусков (COMPARISON_REPEATS для
+            запусков, которые будут сравниваться regression_check)
+    """
+    if size <= 1000:
+        runs = 5
+    elif size <= 5000:
+        runs = 3
+    else:
+        runs = 1
+    return max(runs, repeats or 1)
+
+
+def test_all_algorithms(data_sets, sizes, algorithms, samples=None,
+                        repeats=None):
     """
     Тестирование всех алгоритмов на всех типах данных и размерах.
 
+    Если алгоритм превышает допустимую глубину рекурсии (например,
+    quick_sort на массиве из повторов), вместо времени записывается NaN.
+    Если копирование входного массива дороже самой сортировки, замер
+    помечается: накладные расходы подготовки сопоставимы с измеряемым
+    временем.
+
+    Args:
+        samples: словарь, в который записываются сырые замеры:
+            алгоритм -> тип_данных -> размер -> (выборки, время копии)
+        repeats: минимальное число запусков на ячейку (см. runs_for_size)
+
     Returns:
         Словарь результатов: алгоритм -> тип_данных -> размер -> время
     """
     results = {algo_name: {data_type: {} for data_type in data_sets}
                for algo_name in algorithms.keys()}
+    if samples is not None:
+        for algo_name in algorithms:
+            samples[algo_name] = {data_type: {} for data_type in data_sets}
 
     for algo_name, algo_func in algorithms.items():
         print(f"\nТестирование {algo_name}...")
@@ -53,17 +306,190 @@ def test_all_algorithms(data_sets, sizes, algorithms):
             for size in sizes:
                 arr = data_sets[data_type][size]
 
-                if size <= 1000:
-                    runs = 5
-                elif size <= 5000:
-                    runs = 3
-                else:
-                    runs = 1
-
-                time_taken = measure_sorting_time(algo_func, arr, runs)
+                try:
+                    run_samples, copy_time = measure_sorting_samples(
+                        algo_func, arr, runs_for_size(size, repeats))
+                except RecursionError:
+                    results[algo_name][data_type][size] = float('nan')
+                    # NaN отличает упавшую ячейку от незамеренной
+                    if samples is not None:
+                        samples[algo_name][data_type][size] = (
+                            [float('nan')], float('nan'))
+                    print(f"    Размер {size}: превышена глубина рекурсии")
+                    continue
+                time_taken = sum(run_samples) / len(run_samples)
                 results[algo_name][data_type][size] = time_taken
+                if samples is not None:
+                    samples[algo_name][data_type][size] = (run_samples,
+                                                           copy_time)
+
+                flag = ""
+                if copy_time > min(run_samples):
+                    flag = f"  (!) копирование дороже: {copy_time:.6f} с"
+                print(f"    Размер {size}: {time_taken:.6f} секунд{flag}")
+
+    return results
+
+
+def compare_worst_case(sizes):
+    """
+    Сравнение быстрой сортировки и Introsort на неблагоприятных данных:
+    «убийце» медианы трех и массиве с малым числом различных значений.
+
+    Returns:
+        Словарь: алгоритм -> тип_данных -> размер -> время
+    """
+    data_sets = generate_data_sets(sizes, ['adversarial', 'few_unique'])
+    algorithms = {
+        'Quick Sort (оптимизированный)': quick_sort_optimized,
+        'Intro Sort': intro_sort,
+        'Pdq Sort': pdq_sort
+    }
+
+    print("\nНеблагоприятные данные (секунды):")
+    results = test_all_algorithms(data_sets, sizes, algorithms)
+    return results
+
+
+class KeyOnCompare:
+    """
+    Обертка записи, вычисляющая ключ при каждом сравнении - модель
+    сортировки без кеширования ключей.
+    """
+
+    __slots__ = ('record', 'key')
+
+    def __init__(self, record, key):
+        self.record = record
+        self.key = key
+
+    def __lt__(self, other):
+        return self.key(self.record) < other.key(other.record)
+
+    def __le__(self, other):
+        return self.key(self.record) <= other.key(other.record)
+
+    def __gt__(self, other):
+        return self.key(self.record) > other.key(other.record)
+
+
+def compare_key_caching(sizes, algorithms):
+    """
+    Сортировка записей по ключу с кешированием ключей (key=) и без него
+    (ключ вычисляется при каждом сравнении).
+
+    Returns:
+        Словарь: алгоритм -> размер -> (время с кешем, время без кеша,
+        вызовы key с кешем, вызовы key без кеша)
+    """
+    key_calls = [0]
+
+    def score(record):
+        key_calls[0] += 1
+        return record['score']
+
+    results = {algo_name: {} for algo_name in algorithms}
+
+    print("\nСортировка записей по ключу:")
+    print(f"{'Алгоритм':<30} {'n':>6} {'С кешем (с)':>12} "
+          f"{'Без кеша (с)':>13} {'Вызовы key':>11} {'Без кеша':>10}")
+
+    for size in sizes:
+        records = [{'id': i, 'score': random.randint(0, 10000)}
+                   for i in range(size)]
+
+        for algo_name, algo_func in algorithms.items():
+            key_calls[0] = 0
+            start = timeit.default_timer()
+            algo_func(list(records), key=score)
+            cached_time = timeit.default_timer() - start
+            cached_calls = key_calls[0]
+
+            key_calls[0] = 0
+            start = timeit.default_timer()
+            algo_func([KeyOnCompare(record, score) for record in records])
+            uncached_time = timeit.default_timer() - start
+            uncached_calls = key_calls[0]
+
+            results[algo_name][size] = (cached_time, uncached_time,
+                                        cached_calls, uncached_calls)
+            print(f"{algo_name:<30} {size:>6} {cached_time:>12.6f} "
+                  f"{uncached_time:>13.6f} {cached_calls:>11} "
+                  f"{uncached_calls:>10}")
 
-                print(f"    Размер {size}: {time_taken:.6f} секунд")
+    return results
+
+
+def compare_input_types(sizes, algorithms, input_types=None):
+    """
+    Сравнение времени сортировки одних и тех же данных в разных
+    контейнерах: список, array.array('q') и массив NumPy int64.
+
+    Returns:
+        Словарь: алгоритм -> тип контейнера -> размер -> время
+    """
+    if input_types is None:
+        input_types = INPUT_TYPES
+
+    results = {algo_name: {type_name: {} for type_name in input_types}
+               for algo_name in algorithms}
+
+    print("\nСравнение типов входных массивов (случайные данные):")
+    print(f"{'Алгоритм':<30} {'n':>6}" + "".join(
+        f"{type_name:>14}" for type_name in input_types))
+
+    for size in sizes:
+        data = [random.randint(0, 10000) for _ in range(size)]
+        for algo_name, algo_func in algorithms.items():
+            line = f"{algo_name:<30} {size:>6}"
+            for type_name, make in input_types.items():
+                arr = make(data)
+                start = timeit.default_timer()
+                algo_func(arr)
+                elapsed = timeit.default_timer() - start
+                results[algo_name][type_name][size] = elapsed
+                line += f"{elapsed:>14.6f}"
+            print(line)
+
+    return results
+
+
+def compare_selection(sizes, k_values):
+    """
+    Сравнение выбора k наименьших элементов: полная сортировка и срез
+    против nth_element, partial_sort и top_k (куча по потоку).
+
+    Returns:
+        Словарь: (размер, k) -> метод -> время
+    """
+    methods = {
+        'intro_sort + срез': lambda arr, k: intro_sort(arr)[:k],
+        'sorted + срез': lambda arr, k: sorted(arr)[:k],
+        'nth_element': lambda arr, k: nth_element(arr, k - 1)[:k],
+        'partial_sort': lambda arr, k: partial_sort(arr, k)[:k],
+        'top_k': lambda arr, k: top_k(iter(arr), k),
+    }
+    results = {}
+
+    print("\nВыбор k наименьших элементов:")
+    print(f"{'n':>8} {'k':>6}" + "".join(
+        f"{name:>20}" for name in methods))
+
+    for size in sizes:
+        data = [random.randint(0, 10 ** 6) for _ in range(size)]
+        for k in k_values:
+            if k > size:
+                continue
+            results[size, k] = {}
+            line = f"{size:>8} {k:>6}"
+            for name, method in methods.items():
+                arr = list(data)
+                start = timeit.default_timer()
+                method(arr, k)
+                elapsed = timeit.default_timer() - start
+                results[size, k][name] = elapsed
+                line += f"{elapsed:>20.6f}"
+            print(line)
 
     return results
 
@@ -72,8 +498,8 @@ def save_results_to_csv(results, filename='results.csv'):
     """
     Сохранение результатов в CSV файл.
     """
-    data_types = ['random', 'sorted', 'reversed', 'almost_sorted']
-    sizes = sorted(list(next(iter(results.values()))['random'].keys()))
+    data_types = list(next(iter(results.values())).keys())
+    sizes = sorted(list(next(iter(results.values()))[data_types[0]].keys()))
     algorithms = list(results.keys())
 
     with open(filename, 'w', newline='', encoding='utf-8') as csvfile:
@@ -85,8 +511,9 @@ def save_results_to_csv(results, filename='results.csv'):
             for data_type in data_types:
                 row = [algo_name, data_type]
                 for size in sizes:
-                    time_val = results[algo_name][data_type].get(size, 0)
-                    row.append(f"{time_val:.6f}")
+                    # Пустая ячейка - не замерено, nan - замер не удался
+                    time_val = results[algo_name][data_type].get(size)
+                    row.append('' if time_val is None else f"{time_val:.6f}")
                 writer.writerow(row)
 
     print(f"\nРезультаты сохранены в файл: {filename}")
@@ -110,7 +537,7 @@ def verify_sorting_correctness(algorithms):
     for algo_name, algo_func in algorithms.items():
         print(f"\n{algo_name}:")
         for i, (input_arr, expected) in enumerate(test_cases):
-            arr_copy = copy.deepcopy(input_arr)
+            arr_copy = copy.copy(input_arr)
             result = algo_func(arr_copy)
 
             if result == expected:
@@ -129,19 +556,12 @@ def verify_sorting_correctness(algorithms):
 
 
 if __name__ == "__main__":
-    algorithms = {
-        'Bubble Sort': bubble_sort,
-        'Selection Sort': selection_sort,
-        'Insertion Sort': insertion_sort,
-        'Merge Sort': merge_sort,
-        'Quick Sort': quick_sort,
-        'Quick Sort (оптимизированный)': quick_sort_optimized
-    }
+    algorithms = ALGORITHMS
 
     sizes = [100, 500, 1000, 5000, 10000]
 
     print("Генерация тестовых данных...")
-    data_sets = generate_data_sets(sizes)
+    data_sets = generate_numpy_data_sets(sizes, as_list=True)
 
     verify_sorting_correctness(algorithms)
 
@@ -149,9 +569,44 @@ if __name__ == "__main__":
     print("Начало тестирования производительности")
     print("")
 
-    results = test_all_algorithms(data_sets, sizes, algorithms)
+    samples = {}
+    started = datetime.now()
+    results = test_all_algorithms(data_sets, sizes, algorithms, samples,
+                                  repeats=COMPARISON_REPEATS)
 
     save_results_to_csv(results, 'results.csv')
+    store = ResultsStore()
+    store.append_run(samples, started)
+    store.export_csv('samples.csv')
+
+    compare_merge_sort_memory(data_sets, sizes)
+
+    compare_operation_counts(data_sets, [100, 1000], algorithms)
+
+    compare_worst_case([100, 500, 1000, 5000])
+
+    compare_key_caching([1000, 10000], {
+        'Merge Sort': merge_sort,
+        'Quick Sort (оптимизированный)': quick_sort_optimized,
+        'Pdq Sort': pdq_sort,
+        'Tim Sort': tim_sort
+    })
+
+    compare_selection([10000, 100000], [10, 100, 1000])
+
+    compare_string_sorts([1000, 10000, 100000])
+
+    compare_input_types([1000, 10000], {
+        'Merge Sort': merge_sort,
+        'Pdq Sort': pdq_sort,
+        'Tim Sort': tim_sort,
+        'Radix Sort (LSD)': radix_sort_lsd,
+        'Integer Sort (авто)': integer_sort,
+        'Bitonic Sort (NumPy)': bitonic_sort_numpy,
+        'Odd-Even Merge Sort (NumPy)': odd_even_merge_sort_numpy,
+        'Counting Sort (NumPy)': counting_sort_numpy,
+        'Radix Sort (NumPy)': radix_sort_numpy
+    })
 
     print("\n")
     print("Сводная таблица (случайные данные):")
@@ -5,14 +5,21 @@
 import matplotlib.pyplot as plt
 import numpy as np
 import csv
-from performance_test import test_all_algorithms, generate_data_sets
-from sorts import (
-    bubble_sort,
-    selection_sort,
-    insertion_sort,
-    merge_sort,
-    quick_sort_optimized
+from datetime import datetime
+
+from performance_test import (
+    ALGORITHMS,
+    COMPARISON_REPEATS,
+    compare_operation_counts,
+    generate_data_sets,
+    test_all_algorithms
 )
+from results_store import ResultsStore
+
+
+def _algorithm_colors(count):
+    """Различимые цвета для count алгоритмов: палитра tab20 по индексу."""
+    return [plt.cm.tab20(i % 20) for i in range(count)]
 
 
 def plot_time_vs_size(results, data_type='random'):
@@ -23,10 +30,13 @@ def plot_time_vs_size(results, data_type='random'):
 
     algorithms = list(results.keys())
     sizes = sorted(list(next(iter(results.values()))[data_type].keys()))
+    colors = _algorithm_colors(len(algorithms))
 
-    for algo_name in algorithms:
-        times = [results[algo_name][data_type][size] for size in sizes]
-        plt.plot(sizes, times, marker='o', label=algo_name, linewidth=2)
+    for i, algo_name in enumerate(algorithms):
+        times = [results[algo_name][data_type].get(size, float('nan'))
+                 for size in sizes]
+        plt.plot(sizes, times, marker='o', label=algo_name, linewidth=2,
+                 color=colors[i])
 
     plt.xlabel('Размер массива (n)', fontsize=12)
     plt.ylabel('Время выполнения (секунды)', fontsize=12)
@@ -53,18 +63,18 @@ def plot_time_vs_datatype(results, size=5000):
     data_types = ['random', 'sorted', 'reversed', 'almost_sorted']
 
     x = np.arange(len(data_types))
-    width = 0.15
+    # Группа столбцов одного типа данных занимает 0.8 деления оси
+    width = 0.8 / len(algorithms)
 
     fig, ax = plt.subplots(figsize=(12, 8))
 
-    colors = ['#1f77b4', '#ff7f0e', '#2ca02c', '#d62728',
-              '#9467bd', '#8c564b']
+    colors = _algorithm_colors(len(algorithms))
     for i, algo_name in enumerate(algorithms):
         times = [results[algo_name][data_type].get(size, 0)
                  for data_type in data_types]
         pos = x + i*width - (len(algorithms)-1)*width/2
         ax.bar(pos, times, width, label=algo_name,
-               color=colors[i % len(colors)])
+               color=colors[i])
 
     ax.set_xlabel('Тип данных', fontsize=12)
     ax.set_ylabel('Время выполнения (секунды)', fontsize=12)
@@ -104,7 +114,8 @@ def create_summary_table(results):
         for algo_name in results:
             print(f"{algo_name:<25}", end="")
             for size in sizes:
-                time_val = results[algo_name][data_type][size]
+                time_val = results[algo_name][data_type].get(
+                    size, float('nan'))
                 print(f"{time_val:>12.6f}", end="")
             print()
 
@@ -131,8 +142,9 @@ def save_results_to_csv(results, filename='results.csv'):
             for data_type in data_types:
                 row = [algo_name, data_type]
                 for size in sizes:
-                    time_val = results[algo_name][data_type].get(size, 0)
-                    row.append(f"{time_val:.6f}")
+                    # Пустая ячейка - не замерено, nan - замер не удался
+                    time_val = results[algo_name][data_type].get(size)
+                    row.append('' if time_val is None else f"{time_val:.6f}")
                 writer.writerow(row)
 
     print(f"\nРезультаты сохранены в файл: {filename}")
@@ -150,8 +162,7 @@ def plot_comparison_line(results):
     fig, axes = plt.subplots(2, 2, figsize=(15, 12))
     axes = axes.flatten()
 
-    colors = ['#1f77b4', '#ff7f0e', '#2ca02c',
-              '#d62728', '#9467bd', '#8c564b']
+    colors = _algorithm_colors(len(algorithms))
 
     for idx, (data_type, data_type_rus) in enumerate(zip(data_types,
                                                          data_types_rus)):
@@ -159,9 +170,10 @@ def plot_comparison_line(results):
         sizes = sorted(list(next(iter(results.values()))[data_type].keys()))
 
         for i, algo_name in enumerate(algorithms):
-            times = [results[algo_name][data_type][size] for size in sizes]
+            times = [results[algo_name][data_type].get(size, float('nan'))
+                     for size in sizes]
             ax.plot(sizes, times, marker='o', label=algo_name,
-                    linewidth=2, color=colors[i % len(colors)])
+                    linewidth=2, color=colors[i])
 
         ax.set_xlabel('Размер массива (n)', fontsize=10)
         ax.set_ylabel('Время (сек)', fontsize=10)
@@ -178,6 +190,37 @@ def plot_comparison_line(results):
     plt.show()
 
 
+def plot_operation_counts(counts, filename='operation_counts.png'):
+    """
+    Графики числа сравнений и записей в зависимости от размера.
+
+    Args:
+        counts: алгоритм -> размер -> счетчики (compare_operation_counts)
+    """
+    metrics = [('comparisons', 'Сравнения'), ('writes', 'Записи'),
+               ('allocated', 'Скопировано во вспомогательные списки')]
+    colors = _algorithm_colors(len(counts))
+
+    fig, axes = plt.subplots(1, len(metrics), figsize=(18, 6))
+    for ax, (metric, title) in zip(axes, metrics):
+        for i, (algo_name, by_size) in enumerate(counts.items()):
+            sizes = sorted(by_size)
+            values = [max(by_size[size][metric], 1) for size in sizes]
+            ax.plot(sizes, values, marker='o', label=algo_name,
+                    linewidth=2, color=colors[i])
+        ax.set_xlabel('Размер массива (n)', fontsize=10)
+        ax.set_ylabel('Количество операций', fontsize=10)
+        ax.set_title(title, fontsize=12)
+        ax.grid(True, linestyle='--', alpha=0.6)
+        ax.set_xscale('log')
+        ax.set_yscale('log')
+    axes[0].legend(fontsize=9)
+
+    plt.tight_layout()
+    plt.savefig(filename, dpi=300, bbox_inches='tight')
+    plt.show()
+
+
 def create_detailed_report_from_csv():
     """
     Создание детализированного отчета на основе CSV файла.
@@ -198,7 +241,7 @@ def create_detailed_report_from_csv():
         for row in data[1:]:
             algo = row[0]
             data_type = row[1]
-            times = [float(x) for x in row[2:]]
+            times = [float(x) if x else float('nan') for x in row[2:]]
 
             if algo not in results:
                 results[algo] = {}
@@ -259,19 +302,37 @@ def create_detailed_report_from_csv():
 if __name__ == "__main__":
     plt.style.use('default')
 
-    algorithms = {
-        'Bubble Sort': bubble_sort,
-        'Selection Sort': selection_sort,
-        'Insertion Sort': insertion_sort,
-        'Merge Sort': merge_sort,
-        'Quick Sort': quick_sort_optimized
-    }
+    # Подписи и функции берутся из performance_test.ALGORITHMS: под одной
+    # подписью в общем хранилище лежат замеры одной и той же функции
+    algorithms = {algo_name: ALGORITHMS[algo_name] for algo_name in [
+        'Bubble Sort',
+        'Selection Sort',
+        'Insertion Sort',
+        'Merge Sort',
+        'Quick Sort (оптимизированный)',
+        'Tim Sort'
+    ]}
 
     sizes = [100, 500, 1000, 5000]
 
-    print("Генерация данных и тестирование...")
-    data_sets = generate_data_sets(sizes)
-    results = test_all_algorithms(data_sets, sizes, algorithms)
+    # Графики строятся по последнему сохраненному запуску только для
+    # алгоритмов из algorithms; замеры выполняются, если в запуске
+    # есть не все из них
+    store = ResultsStore()
+    stored = {}
+    if store.latest_run_id() is not None:
+        stored = store.median_results()
+    if all(algo_name in stored for algo_name in algorithms):
+        print(f"Загрузка запуска {store.latest_run_id()} из хранилища...")
+        results = {algo_name: stored[algo_name] for algo_name in algorithms}
+    else:
+        print("Генерация данных и тестирование...")
+        data_sets = generate_data_sets(sizes)
+        samples = {}
+        started = datetime.now()
+        results = test_all_algorithms(data_sets, sizes, algorithms, samples,
+                                      repeats=COMPARISON_REPEATS)
+        store.append_run(samples, started)
 
     save_results_to_csv(results, 'results.csv')
 
@@ -284,6 +345,11 @@ if __name__ == "__main__":
     plot_time_vs_datatype(results, size=5000)
     plot_comparison_line(results)
 
+    operation_sizes = [100, 500, 1000]
+    counts = compare_operation_counts(generate_data_sets(operation_sizes),
+                                      operation_sizes, algorithms)
+    plot_operation_counts(counts)
+
     create_summary_table(results)
     create_detailed_report_from_csv()
 
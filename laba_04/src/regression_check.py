@@ -0,0 +1,254 @@
+"""
+Поиск регрессий производительности между двумя запусками замеров.
+
+Запуски берутся из хранилища результатов (results_store). Для каждой
+ячейки (алгоритм, тип данных, размер), присутствующей в обоих запусках,
+выборки времени сравниваются U-критерием Манна-Уитни, который не
+предполагает нормальности распределения времени. Размер эффекта
+описывается двумя величинами:
+    - относительное изменение медианы: median(new) / median(old) - 1;
+    - дельта Клиффа: P(new > old) - P(new < old), от -1 до 1.
+
+Ячейка считается регрессией (улучшением), если различие значимо и
+медиана выросла (уменьшилась) больше чем на порог. Ячейка, замер
+которой не удался хотя бы в одном запуске (NaN в хранилище), получает
+вердикт 'failed'.
+
+Запуск из командной строки:
+    python regression_check.py [baseline candidate] [--threshold 0.1]
+По умолчанию сравниваются два последних запуска. Код возврата 1, если
+найдена хотя бы одна регрессия.
+"""
+
+import argparse
+import math
+import sys
+from itertools import combinations
+
+import numpy as np
+
+from results_store import STORE_DIR, ResultsStore
+
+# Уровень значимости и порог относительного изменения медианы
+DEFAULT_ALPHA = 0.05
+DEFAULT_THRESHOLD = 0.10
+# Максимальное число сочетаний для точного вычисления p-значения
+_EXACT_LIMIT = 20000
+
+
+def _u_statistic(old, new):
+    """Статистика U для выборки new (с учетом совпадений по 0.5)."""
+    old = np.asarray(old)
+    return sum(float(np.sum(old < x) + 0.5 * np.sum(old == x)) for x in new)
+
+
+def mann_whitney_u(old, new):
+    """
+    Двусторонний U-критерий Манна-Уитни.
+
+    Для малых выборок p-значение вычисляется точно перебором всех
+    разбиений объединенной выборки, для больших - по нормальному
+    приближению с поправкой на совпадения.
+
+    Returns:
+        (u, p_value): U для выборки new и p-значение
+    """
+    n1, n2 = len(old), len(new)
+    u = _u_statistic(old, new)
+    mean_u = n1 * n2 / 2
+
+    pooled = np.concatenate([np.asarray(old, dtype=float),
+                             np.asarray(new, dtype=float)])
+    if math.comb(n1 + n2, n2) <= _EXACT_LIMIT:
+        observed = abs(u - mean_u)
+        extreme = total = 0
+        for chosen in combinations(range(n1 + n2), n2):
+            mask = np.zeros(n1 + n2, dtype=bool)
+            mask[list(chosen)] = True
+            u_perm = _u_statistic(pooled[~mask], pooled[mask])
+            total += 1
+            if abs(u_perm - mean_u) >= observed - 1e-12:
+                extreme += 1
+        return u, extreme / total
+
+    _, counts = np.unique(pooled, return_counts=True)
+    n = n1 + n2
+    tie_term = float(np.sum(counts ** 3 - counts)) / (n * (n - 1))
+    sigma = math.sqrt(n1 * n2 / 12 * ((n + 1) - tie_term))
+    if sigma == 0:
+        return u, 1.0
+    z = (abs(u - mean_u) - 0.5) / sigma
+    return u, math.erfc(max(z, 0.0) / math.sqrt(2))
+
+
+def cliffs_delta(old, new):
+    """Дельта Клиффа: P(new > old) - P(new < old)."""
+    old = np.asarray(old)
+    greater = sum(int(np.sum(x > old)) for x in new)
+    less = sum(int(np.sum(x < old)) for x in new)
+    return (greater - less) / (len(old) * len(new))
+
+
+def compare_runs(store, baseline=None, candidate=None,
+                 alpha=DEFAULT_ALPHA, threshold=DEFAULT_THRESHOLD):
+    """
+    Сравнение двух запусков по всем общим ячейкам.
+
+    Args:
+        store: хранилище результатов
+        baseline, candidate: идентификаторы запусков (по умолчанию -
+            предпоследний и последний)
+        alpha: уровень значимости
+        threshold: минимальное относительное изменение медианы
+
+    Returns:
+        Список словарей по ячейкам: algorithm, data_type, size, old,
+        new (медианы), change, delta, p_value, verdict ('regression',
+        'improvement', 'unchanged', 'insufficient' или 'failed')
+    """
+    if baseline is None or candidate is None:
+        runs = [run['run_id'] for run in store.runs()]
+        if len(runs) < 2:
+            raise ValueError("Для сравнения нужны хотя бы два запуска")
+        baseline, candidate = runs[-2], runs[-1]
+
+    old_samples = store.samples(baseline)
+    new_samples = store.samples(candidate)
+    rows = []
+    for algo_name, by_type in new_samples.items():
+        for data_type, by_size in by_type.items():
+            for size, new in by_size.items():
+                old = old_samples.get(algo_name, {}).get(data_type, {}).get(
+                    size)
+                if old is None:
+                    continue
+                if np.isnan(old).any() or np.isnan(new).any():
+                    rows.append({
+                        'algorithm': algo_name,
+                        'data_type': data_type,
+                        'size': size,
+                        'old': float(np.median(old)),
+                        'new': float(np.median(new)),
+                        'change': float('nan'),
+                        'delta': float('nan'),
+                        'p_value': float('nan'),
+                        'verdict': 'failed',
+                    })
+                    continue
+                old_median = float(np.median(old))
+                new_median = float(np.median(new))
+                change = new_median / old_median - 1 if old_median > 0 \
+                    else float('nan')
+                _, p_value = mann_whitney_u(old, new)
+
+                # Наименьшее достижимое p-значение при таких размерах
+                # выборок: если оно больше alpha, вывод невозможен
+                min_p = 2 / math.comb(len(old) + len(new), len(new))
+                if min_p > alpha:
+                    verdict = 'insufficient'
+                elif p_value < alpha and change > threshold:
+                    verdict = 'regression'
+                elif p_value < alpha and change < -threshold:
+                    verdict = 'improvement'
+                else:
+                    verdict = 'unchanged'
+
+                rows.append({
+                    'algorithm': algo_name,
+                    'data_type': data_type,
+                    'size': size,
+                    'old': old_median,
+                    'new': new_median,
+                    'change': change,
+                    'delta': cliffs_delta(old, new),
+                    'p_value': p_value,
+                    'verdict': verdict,
+                })
+    return rows
+
+
+def print_report(rows):
+    """Вывод значимых регрессий и улучшений, отсортированных по изменению."""
+    labels = {'regression': 'Регрессии', 'improvement': 'Улучшения'}
+    for verdict, label in labels.items():
+        selected = sorted((row for row in rows if row['verdict'] == verdict),
+                          key=lambda row: -abs(row['change']))
+        print(f"\n{label}: {len(selected)}")
+        if not selected:
+            continue
+        print(f"{'Алгоритм':<30} {'Тип данных':<15} {'n':>7} "
+              f"{'Было (с)':>11} {'Стало (с)':>11} {'Изм.':>8} "
+              f"{'Клифф':>6} {'p':>7}")
+        for row in selected:
+            print(f"{row['algorithm']:<30} {row['data_type']:<15} "
+                  f"{row['size']:>7} {row['old']:>11.6f} {row['new']:>11.6f} "
+                  f"{row['change']:>+7.1%} {row['delta']:>6.2f} "
+                  f"{row['p_value']:>7.4f}")
+
+    insufficient = sum(row['verdict'] == 'insufficient' for row in rows)
+    if insufficient:
+        print(f"\nЯчеек с недостаточным числом замеров: {insufficient} "
+              f"(нужно не меньше 4 запусков на ячейку, см. "
+              f"performance_test.COMPARISON_REPEATS)")
+    failed = sum(row['verdict'] == 'failed' for row in rows)
+    if failed:
+        print(f"Ячеек с неудавшимся замером: {failed}")
+
+
+def plot_changes(rows, filename='regressions.png'):
+    """Горизонтальная диаграмма изменений медиан значимых ячеек."""
+    import matplotlib.pyplot as plt
+
+    selected = sorted((row for row in rows
+                       if row['verdict'] in ('regression', 'improvement')),
+                      key=lambda row: row['change'])
+    if not selected:
+        print("Значимых изменений нет, график не построен")
+        return
+
+    labels = [f"{row['algorithm']}, {row['data_type']}, n={row['size']}"
+              for row in selected]
+    changes = [row['change'] * 100 for row in selected]
+    colors = ['tab:red' if row['verdict'] == 'regression' else 'tab:green'
+              for row in selected]
+
+    fig, ax = plt.subplots(figsize=(10, 0.4 * len(selected) + 1.5))
+    ax.barh(labels, changes, color=colors)
+    ax.axvline(0, color='black', linewidth=0.8)
+    ax.set_xlabel('Изменение медианы времени, %')
+    ax.set_title('Регрессии (красный) и улучшения (зеленый)')
+    ax.grid(True, axis='x', alpha=0.3)
+    fig.tight_layout()
+    fig.savefig(filename, dpi=150, bbox_inches='tight')
+    plt.close(fig)
+    print(f"График сохранен в файл: {filename}")
+
+
+def main(argv=None):
+    """Точка входа командной строки; возвращает код завершения."""
+    parser = argparse.ArgumentParser(
+        description="Сравнение двух запусков замеров сортировок")
+    parser.add_argument('runs', nargs='*',
+                        help="идентификаторы базового и нового запусков")
+    parser.add_argument('--store', default=STORE_DIR)
+    parser.add_argument('--alpha', type=float, default=DEFAULT_ALPHA)
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help="порог относительного изменения медианы")
+    parser.add_argument('--plot', default=None,
+                        help="PNG-файл для диаграммы изменений")
+    args = parser.parse_args(argv)
+    if len(args.runs) not in (0, 2):
+        parser.error("укажите либо два запуска, либо ни одного")
+
+    rows = compare_runs(ResultsStore(args.store), *(args.runs or [None, None]),
+                        alpha=args.alpha, threshold=args.threshold)
+    print_report(rows)
+    if args.plot:
+        plot_changes(rows, args.plot)
+
+    regressions = sum(row['verdict'] == 'regression' for row in rows)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
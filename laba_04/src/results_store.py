@@ -0,0 +1,261 @@
+"""
+Хранилище результатов замеров с добавлением запусков.
+
+Каждый запуск сохраняется в отдельный каталог хранилища и больше не
+изменяется:
+    meta.json        - метаданные: время начала и конца, машина,
+                       версия Python, ревизия git, словари подписей;
+    algorithm.npy    - код алгоритма (индекс в meta['algorithms']);
+    data_type.npy    - код типа данных (индекс в meta['data_types']);
+    size.npy, run.npy, time.npy, copy_time.npy - остальные столбцы.
+
+Столбцы хранятся в формате .npy и при чтении отображаются в память,
+поэтому список запусков читается только из meta.json, а данные
+загружаются по запросу.
+"""
+
+import csv
+import json
+import os
+import platform
+import subprocess
+import uuid
+from datetime import datetime
+
+import numpy as np
+
+STORE_DIR = 'benchmark_store'
+COLUMNS = ('algorithm', 'data_type', 'size', 'run', 'time', 'copy_time')
+
+
+def _git_revision(path):
+    """Ревизия git и наличие незафиксированных изменений (или None)."""
+    try:
+        revision = subprocess.run(
+            ['git', 'rev-parse', 'HEAD'], cwd=path, capture_output=True,
+            text=True, check=True, timeout=10).stdout.strip()
+        status = subprocess.run(
+            ['git', 'status', '--porcelain', '--untracked-files=no'],
+            cwd=path, capture_output=True, text=True, check=True,
+            timeout=10).stdout
+    except (OSError, subprocess.SubprocessError):
+        return None, None
+    return revision, bool(status.strip())
+
+
+def collect_metadata():
+    """Сведения о машине, интерпретаторе и ревизии исходного кода."""
+    revision, dirty = _git_revision(os.path.dirname(os.path.abspath(__file__)))
+    return {
+        'machine': platform.machine(),
+        'processor': platform.processor(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'git_revision': revision,
+        'git_dirty': dirty,
+    }
+
+
+class ResultsStore:
+    """Хранилище запусков замеров в каталоге path."""
+
+    def __init__(self, path=STORE_DIR):
+        self.path = path
+
+    def _run_dir(self, run_id):
+        return os.path.join(self.path, run_id)
+
+    def append_run(self, samples, started=None, metadata=None):
+        """
+        Сохранение нового запуска.
+
+        Args:
+            samples: алгоритм -> тип_данных -> размер -> (выборки,
+                время копии), как заполняет test_all_algorithms
+            started: время начала замеров (по умолчанию - текущее)
+            metadata: дополнительные поля метаданных
+
+        Returns:
+            Идентификатор запуска
+        """
+        finished = datetime.now()
+        if started is None:
+            started = finished
+        algorithms = list(samples)
+        data_types = []
+        columns = {name: [] for name in COLUMNS}
+
+        for algo_code, algo_name in enumerate(algorithms):
+            for data_type, by_size in samples[algo_name].items():
+                if data_type not in data_types:
+                    data_types.append(data_type)
+                type_code = data_types.index(data_type)
+                for size, (run_samples, copy_time) in by_size.items():
+                    for run, time_val in enumerate(run_samples):
+                        columns['algorithm'].append(algo_code)
+                        columns['data_type'].append(type_code)
+                        columns['size'].append(size)
+                        columns['run'].append(run)
+                        columns['time'].append(time_val)
+                        columns['copy_time'].append(copy_time)
+
+        run_id = (finished.strftime('%Y%m%d-%H%M%S%f-') +
+                  uuid.uuid4().hex[:6])
+        meta = collect_metadata()
+        meta.update(metadata or {})
+        meta.update({
+            'run_id': run_id,
+            'started': started.isoformat(timespec='seconds'),
+            'finished': finished.isoformat(timespec='seconds'),
+            'algorithms': algorithms,
+            'data_types': data_types,
+            'rows': len(columns['time']),
+        })
+
+        # Запись во временный каталог и переименование: незавершенный
+        # запуск не попадает в хранилище
+        tmp_dir = self._run_dir('.tmp-' + run_id)
+        os.makedirs(tmp_dir)
+        dtypes = {'algorithm': np.int16, 'data_type': np.int16,
+                  'size': np.int64, 'run': np.int32,
+                  'time': np.float64, 'copy_time': np.float64}
+        for name, values in columns.items():
+            np.save(os.path.join(tmp_dir, name + '.npy'),
+                    np.array(values, dtype=dtypes[name]))
+        with open(os.path.join(tmp_dir, 'meta.json'), 'w',
+                  encoding='utf-8') as f:
+            json.dump(meta, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_dir, self._run_dir(run_id))
+
+        print(f"Запуск {run_id} сохранен в хранилище: {self.path}")
+        return run_id
+
+    def runs(self):
+        """Метаданные всех запусков в порядке времени сохранения."""
+        if not os.path.isdir(self.path):
+            return []
+        metas = []
+        for name in sorted(os.listdir(self.path)):
+            meta_path = os.path.join(self.path, name, 'meta.json')
+            if not name.startswith('.') and os.path.exists(meta_path):
+                with open(meta_path, 'r', encoding='utf-8') as f:
+                    metas.append(json.load(f))
+        return metas
+
+    def latest_run_id(self):
+        """Идентификатор последнего запуска (None, если их нет)."""
+        runs = self.runs()
+        return runs[-1]['run_id'] if runs else None
+
+    def _meta(self, run_id):
+        with open(os.path.join(self._run_dir(run_id), 'meta.json'), 'r',
+                  encoding='utf-8') as f:
+            return json.load(f)
+
+    def _resolve(self, run_id):
+        if run_id is None:
+            run_id = self.latest_run_id()
+            if run_id is None:
+                raise FileNotFoundError(f"Хранилище {self.path} пусто")
+        return run_id
+
+    def query(self, run_id=None, algorithm=None, data_type=None, size=None):
+        """
+        Строки запуска, отфильтрованные по алгоритму, типу данных и
+        размеру (None - без фильтра).
+
+        Returns:
+            Словарь столбцов: algorithm и data_type - массивы подписей,
+            остальные - массивы NumPy
+        """
+        run_id = self._resolve(run_id)
+        meta = self._meta(run_id)
+        columns = {
+            name: np.load(os.path.join(self._run_dir(run_id), name + '.npy'),
+                          mmap_mode='r')
+            for name in COLUMNS
+        }
+
+        mask = np.ones(len(columns['time']), dtype=bool)
+        if algorithm is not None:
+            if algorithm not in meta['algorithms']:
+                mask[:] = False
+            else:
+                mask &= (columns['algorithm'] ==
+                         meta['algorithms'].index(algorithm))
+        if data_type is not None:
+            if data_type not in meta['data_types']:
+                mask[:] = False
+            else:
+                mask &= (columns['data_type'] ==
+                         meta['data_types'].index(data_type))
+        if size is not None:
+            mask &= columns['size'] == size
+
+        selected = {name: np.asarray(values[mask])
+                    for name, values in columns.items()}
+        selected['algorithm'] = np.array(meta['algorithms'],
+                                         dtype=object)[selected['algorithm']]
+        selected['data_type'] = np.array(meta['data_types'],
+                                         dtype=object)[selected['data_type']]
+        return selected
+
+    def samples(self, run_id=None):
+        """
+        Сырые выборки запуска.
+
+        Returns:
+            Словарь: алгоритм -> тип_данных -> размер -> массив времен
+        """
+        rows = self.query(run_id)
+        grouped = {}
+        for algo_name, data_type, size, time_val in zip(
+                rows['algorithm'], rows['data_type'], rows['size'],
+                rows['time']):
+            by_size = grouped.setdefault(algo_name, {}).setdefault(
+                data_type, {})
+            by_size.setdefault(int(size), []).append(float(time_val))
+        return {algo_name: {data_type: {size: np.array(values)
+                                        for size, values in by_size.items()}
+                            for data_type, by_size in by_type.items()}
+                for algo_name, by_type in grouped.items()}
+
+    def median_results(self, run_id=None):
+        """
+        Медианное время по ячейкам в формате test_all_algorithms:
+        алгоритм -> тип_данных -> размер -> время.
+        """
+        return {algo_name: {data_type: {size: float(np.median(values))
+                                        for size, values in by_size.items()}
+                            for data_type, by_size in by_type.items()}
+                for algo_name, by_type in self.samples(run_id).items()}
+
+    def export_csv(self, filename='samples.csv', run_ids=None):
+        """
+        Выгрузка запусков в CSV: по строке на каждый замер с
+        идентификатором запуска и ревизией git.
+
+        Args:
+            run_ids: список запусков (None - все запуски)
+        """
+        metas = self.runs()
+        if run_ids is not None:
+            metas = [meta for meta in metas if meta['run_id'] in run_ids]
+
+        with open(filename, 'w', newline='', encoding='utf-8') as csvfile:
+            writer = csv.writer(csvfile)
+            writer.writerow(['run_id', 'started', 'git_revision',
+                             'Алгоритм', 'Тип данных', 'Размер', 'Запуск',
+                             'Время', 'Время копии'])
+            for meta in metas:
+                rows = self.query(meta['run_id'])
+                for row in zip(*(rows[name] for name in COLUMNS)):
+                    algo_name, data_type, size, run, time_val, copy_time = row
+                    writer.writerow([meta['run_id'], meta['started'],
+                                     meta['git_revision'], algo_name,
+                                     data_type, int(size), int(run),
+                                     f"{time_val:.9f}", f"{copy_time:.9f}"])
+
+        print(f"Замеры выгружены в файл: {filename}")
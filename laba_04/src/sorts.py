@@ -1,9 +1,174 @@
 """
 Реализация 5 алгоритмов сортировки с указанием временной и
 пространственной сложности.
+
+Все сортировки сортируют массив на месте, возвращают его и принимают
+необязательные именованные аргументы, как sorted():
+    key: функция ключа; вычисляется один раз для каждого элемента
+        (преобразование Шварца), после чего сортируются тройки
+        (ключ, индекс, элемент) - сами элементы не сравниваются;
+    reverse: сортировка по убыванию с сохранением исходного порядка
+        равных элементов;
+    stable: гарантировать устойчивость; для неустойчивых алгоритмов
+        элементы дополняются исходным индексом.
+Без этих аргументов алгоритм вызывается напрямую, без накладных расходов.
+
+Помимо списков сортировки принимают array.array и одномерные массивы
+NumPy и сортируют их на месте, без преобразования в список.
 """
 
+import heapq
+from array import array
+from functools import wraps
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+def _is_ndarray(arr):
+    return np is not None and isinstance(arr, np.ndarray)
+
+
+def _copy_range(arr, lo, hi):
+    """Копия arr[lo:hi] (срез массива NumPy - представление, а не копия)."""
+    part = arr[lo:hi]
+    return part.copy() if _is_ndarray(part) else part
+
+
+def _aux_list(arr, values):
+    """
+    Вспомогательный список сортировки arr (счетчики, буферы, копии
+    ключей). Если arr подсчитывает операции (у него есть метод
+    aux_list, как у instrumentation.CountingList), список создается
+    им и тоже подсчитывается; иначе values возвращается как есть.
+    """
+    make = getattr(arr, 'aux_list', None)
+    return values if make is None else make(values)
+
+
+def _new_buffer(arr, n):
+    """Вспомогательный буфер длины n того же типа, что и arr."""
+    if isinstance(arr, array):
+        return array(arr.typecode, bytes(n * arr.itemsize))
+    if _is_ndarray(arr):
+        return np.empty(n, dtype=arr.dtype)
+    return _aux_list(arr, [None] * n)
+
+
+def _like(arr, values):
+    """Приведение списка values к типу arr для присваивания в срез."""
+    if isinstance(arr, array):
+        return array(arr.typecode, values)
+    return values
+
+
+def write_back(arr, values):
+    """
+    Запись отсортированных значений (список или массив NumPy) обратно
+    во входной массив arr на месте.
+    """
+    if _is_ndarray(arr):
+        arr[:] = values
+        return
+    if _is_ndarray(values):
+        values = values.tolist()
+    arr[:] = _like(arr, values)
+
+
+def _py_values(arr):
+    """Элементы arr как объекты Python (без скаляров NumPy)."""
+    if isinstance(arr, array) or _is_ndarray(arr):
+        return arr.tolist()
+    return arr
+
+
+def _sort_decorated(sort_func, arr, keys, reverse):
+    """
+    Сортировка arr по заранее вычисленным ключам через тройки
+    (ключ, индекс, элемент). Уникальный индекс делает порядок
+    устойчивым при любом алгоритме; при reverse индекс берется со
+    знаком минус, и результат разворачивается. Кортежи сравниваются
+    на уровне C, поэтому ключи должны поддерживать согласованные
+    == и <.
+    """
+    sign = -1 if reverse else 1
+    items = [(k, sign * i, x) for i, (k, x) in enumerate(zip(keys, arr))]
+    sort_func(items)
+    if reverse:
+        items.reverse()
+    arr[:] = _like(arr, [item[2] for item in items])
+    return arr
 
+
+def _sort_encoded(sort_func, arr, keys, reverse):
+    """
+    Сортировка arr по целочисленным ключам для поразрядных алгоритмов:
+    пара (ключ, индекс) кодируется одним числом (k - min) * n + i
+    (или (max - k) * n + i при reverse), что дает устойчивый порядок.
+    """
+    n = len(arr)
+    low, high = min(keys), max(keys)
+    if reverse:
+        codes = [(high - k) * n + i for i, k in enumerate(keys)]
+    else:
+        codes = [(k - low) * n + i for i, k in enumerate(keys)]
+    sort_func(codes)
+    values = list(arr)
+    arr[:] = _like(arr, [values[code % n] for code in codes])
+    return arr
+
+
+def supports_key(stable, integer=False, by_key=None):
+    """
+    Декоратор, добавляющий сортировке аргументы key, reverse и stable.
+
+    Args:
+        stable: является ли алгоритм устойчивым сам по себе
+        integer: алгоритм сортирует только целые числа (ключи
+            кодируются вместе с индексом через _sort_encoded)
+        by_key: собственная реализация сортировки по ключам
+            (arr, keys, reverse, stable) вместо общей; stable - нужно
+            ли сохранить порядок равных ключей (для неустойчивого
+            алгоритма это должна обеспечить сама by_key)
+    """
+    def decorator(sort_func):
+        @wraps(sort_func)
+        def wrapper(arr, *args, key=None, reverse=False, stable=False,
+                    **kwargs):
+            if key is None and not reverse and (
+                    not stable or wrapper.is_stable or integer):
+                return sort_func(arr, *args, **kwargs)
+            if len(arr) <= 1:
+                return arr
+
+            def run(items):
+                return sort_func(items, *args, **kwargs)
+
+            if key is None and (integer or wrapper.is_stable):
+                # Целые числа или устойчивый алгоритм: разворот без ключей
+                if wrapper.is_stable:
+                    arr[:] = arr[::-1]
+                run(arr)
+                arr[:] = arr[::-1]
+                return arr
+
+            values = _py_values(arr)
+            keys = values if key is None else [key(x) for x in values]
+            if by_key is not None:
+                return by_key(arr, keys, reverse, stable)
+            if integer:
+                return _sort_encoded(run, arr, keys, reverse)
+            return _sort_decorated(run, arr, keys, reverse)
+
+        wrapper.is_stable = stable
+        wrapper.is_integer = integer
+        return wrapper
+    return decorator
+
+
+@supports_key(stable=True)
 def bubble_sort(arr):
     """
     Сортировка пузырьком (Bubble Sort)
@@ -26,6 +191,7 @@ def bubble_sort(arr):
     return arr
 
 
+@supports_key(stable=False)
 def selection_sort(arr):
     """
     Сортировка выбором (Selection Sort)
@@ -46,6 +212,7 @@ def selection_sort(arr):
     return arr
 
 
+@supports_key(stable=True)
 def insertion_sort(arr):
     """
     Сортировка вставками (Insertion Sort)
@@ -66,6 +233,7 @@ def insertion_sort(arr):
     return arr
 
 
+@supports_key(stable=True)
 def merge_sort(arr):
     """
     Сортировка слиянием (Merge Sort)
@@ -75,19 +243,24 @@ def merge_sort(arr):
         - Средний случай: O(n log n)
         - Лучший случай: O(n log n)
     Пространственная сложность: O(n) (требует дополнительной памяти)
+    Устойчивость: да (при равенстве берется элемент левой половины)
     """
+    return _merge_sort_recursive(arr)
+
+
+def _merge_sort_recursive(arr):
     if len(arr) > 1:
         mid = len(arr) // 2
-        left_half = arr[:mid]
-        right_half = arr[mid:]
+        left_half = _copy_range(arr, 0, mid)
+        right_half = _copy_range(arr, mid, len(arr))
 
-        merge_sort(left_half)
-        merge_sort(right_half)
+        _merge_sort_recursive(left_half)
+        _merge_sort_recursive(right_half)
 
         i = j = k = 0
 
         while i < len(left_half) and j < len(right_half):
-            if left_half[i] < right_half[j]:
+            if left_half[i] <= right_half[j]:
                 arr[k] = left_half[i]
                 i += 1
             else:
@@ -107,6 +280,7 @@ def merge_sort(arr):
     return arr
 
 
+@supports_key(stable=False)
 def quick_sort(arr):
     """
     Быстрая сортировка (Quick Sort)
@@ -152,6 +326,55 @@ def quick_sort(arr):
     return arr
 
 
+def _partition_opt(arr, low, high):
+    """
+    Разбиение arr[low:high + 1] с опорным элементом - медианой трех
+    (первого, среднего и последнего). Требует high - low >= 2.
+
+    Returns:
+        Итоговая позиция опорного элемента: слева от нее элементы
+        не больше, справа - не меньше опорного
+    """
+    mid = (low + high) // 2
+    if arr[high] < arr[low]:
+        arr[low], arr[high] = arr[high], arr[low]
+    if arr[mid] < arr[low]:
+        arr[mid], arr[low] = arr[low], arr[mid]
+    if arr[high] < arr[mid]:
+        arr[mid], arr[high] = arr[high], arr[mid]
+    pivot = arr[mid]
+
+    arr[mid], arr[high - 1] = arr[high - 1], arr[mid]
+    i = low
+    j = high - 1
+
+    while True:
+        i += 1
+        while arr[i] < pivot:
+            i += 1
+        j -= 1
+        while pivot < arr[j]:
+            j -= 1
+        if i >= j:
+            break
+        arr[i], arr[j] = arr[j], arr[i]
+
+    arr[i], arr[high - 1] = arr[high - 1], arr[i]
+    return i
+
+
+def _insertion_sort_sublist(arr, low, high):
+    """Сортировка вставками отрезка arr[low:high + 1]."""
+    for i in range(low + 1, high + 1):
+        key = arr[i]
+        j = i - 1
+        while j >= low and arr[j] > key:
+            arr[j + 1] = arr[j]
+            j -= 1
+        arr[j + 1] = key
+
+
+@supports_key(stable=False)
 def quick_sort_optimized(arr):
     """
     Оптимизированная быстрая сортировка с переключением на
@@ -173,45 +396,1292 @@ def quick_sort_optimized(arr):
                 _quick_sort_opt(arr, pi + 1, high)
                 high = pi - 1
 
-    def _partition_opt(arr, low, high):
-        mid = (low + high) // 2
-        if arr[high] < arr[low]:
-            arr[low], arr[high] = arr[high], arr[low]
-        if arr[mid] < arr[low]:
-            arr[mid], arr[low] = arr[low], arr[mid]
-        if arr[high] < arr[mid]:
-            arr[mid], arr[high] = arr[high], arr[mid]
-        pivot = arr[mid]
+    if len(arr) <= 1:
+        return arr
 
-        arr[mid], arr[high - 1] = arr[high - 1], arr[mid]
-        i = low
-        j = high - 1
+    _quick_sort_opt(arr, 0, len(arr) - 1)
+    return arr
 
-        while True:
-            i += 1
-            while arr[i] < pivot:
+
+# Параметры адаптивной сортировки (Timsort)
+_MIN_MERGE = 32
+_MIN_GALLOP = 7
+
+
+def _compute_minrun(n):
+    """
+    Вычисление минимальной длины серии для Timsort.
+
+    Берутся старшие 5-6 бит n, и добавляется 1, если среди оставшихся
+    бит есть ненулевые. Так n / minrun равно степени двойки или чуть
+    меньше, что дает сбалансированные слияния.
+    """
+    r = 0
+    while n >= _MIN_MERGE:
+        r |= n & 1
+        n >>= 1
+    return n + r
+
+
+def _count_run_and_make_ascending(arr, lo, hi):
+    """
+    Определение длины естественной серии, начинающейся с lo.
+
+    Строго убывающая серия разворачивается на месте (строгость
+    сохраняет устойчивость). Возвращает длину серии.
+    """
+    run_hi = lo + 1
+    if run_hi == hi:
+        return 1
+
+    if arr[run_hi] < arr[lo]:
+        run_hi += 1
+        while run_hi < hi and arr[run_hi] < arr[run_hi - 1]:
+            run_hi += 1
+        arr[lo:run_hi] = arr[lo:run_hi][::-1]
+    else:
+        run_hi += 1
+        while run_hi < hi and not arr[run_hi] < arr[run_hi - 1]:
+            run_hi += 1
+    return run_hi - lo
+
+
+def _binary_insertion_sort(arr, lo, hi, start):
+    """
+    Сортировка бинарными вставками отрезка arr[lo:hi], где arr[lo:start]
+    уже отсортирован.
+
+    Число сравнений O(n log n), число перемещений O(n²), но перемещения
+    выполняются срезами, что для коротких серий дешево.
+    """
+    for i in range(max(start, lo + 1), hi):
+        pivot = arr[i]
+        left, right = lo, i
+        while left < right:
+            mid = (left + right) >> 1
+            if pivot < arr[mid]:
+                right = mid
+            else:
+                left = mid + 1
+        arr[left + 1:i + 1] = arr[left:i]
+        arr[left] = pivot
+
+
+def _gallop_left(key, arr, base, length, hint):
+    """
+    Галопирующий поиск позиции k в arr[base:base+length], такой что
+    arr[base+k-1] < key <= arr[base+k]. Поиск начинается с base+hint
+    экспоненциальными шагами и завершается бинарным поиском.
+    """
+    last_ofs = 0
+    ofs = 1
+    if arr[base + hint] < key:
+        max_ofs = length - hint
+        while ofs < max_ofs and arr[base + hint + ofs] < key:
+            last_ofs = ofs
+            ofs = (ofs << 1) + 1
+        ofs = min(ofs, max_ofs)
+        last_ofs += hint
+        ofs += hint
+    else:
+        max_ofs = hint + 1
+        while ofs < max_ofs and not arr[base + hint - ofs] < key:
+            last_ofs = ofs
+            ofs = (ofs << 1) + 1
+        ofs = min(ofs, max_ofs)
+        last_ofs, ofs = hint - ofs, hint - last_ofs
+
+    last_ofs += 1
+    while last_ofs < ofs:
+        mid = last_ofs + ((ofs - last_ofs) >> 1)
+        if arr[base + mid] < key:
+            last_ofs = mid + 1
+        else:
+            ofs = mid
+    return ofs
+
+
+def _gallop_right(key, arr, base, length, hint):
+    """
+    Галопирующий поиск позиции k в arr[base:base+length], такой что
+    arr[base+k-1] <= key < arr[base+k] (правая граница равных key).
+    """
+    last_ofs = 0
+    ofs = 1
+    if key < arr[base + hint]:
+        max_ofs = hint + 1
+        while ofs < max_ofs and key < arr[base + hint - ofs]:
+            last_ofs = ofs
+            ofs = (ofs << 1) + 1
+        ofs = min(ofs, max_ofs)
+        last_ofs, ofs = hint - ofs, hint - last_ofs
+    else:
+        max_ofs = length - hint
+        while ofs < max_ofs and not key < arr[base + hint + ofs]:
+            last_ofs = ofs
+            ofs = (ofs << 1) + 1
+        ofs = min(ofs, max_ofs)
+        last_ofs += hint
+        ofs += hint
+
+    last_ofs += 1
+    while last_ofs < ofs:
+        mid = last_ofs + ((ofs - last_ofs) >> 1)
+        if key < arr[base + mid]:
+            ofs = mid
+        else:
+            last_ofs = mid + 1
+    return ofs
+
+
+def _merge_lo(arr, base1, len1, base2, len2, min_gallop):
+    """
+    Слияние соседних серий arr[base1:base1+len1] и arr[base2:base2+len2]
+    с копированием левой серии во временный буфер.
+
+    Если одна серия выигрывает min_gallop сравнений подряд, слияние
+    переходит в режим галопа и копирует целые блоки срезами. Порог
+    адаптируется: успешный галоп уменьшает его, неудачный - увеличивает.
+    Возвращает новое значение порога.
+    """
+    tmp = _copy_range(arr, base1, base1 + len1)
+    i = 0
+    j = base2
+    end2 = base2 + len2
+    dest = base1
+
+    while i < len1 and j < end2:
+        count1 = count2 = 0
+        while i < len1 and j < end2:
+            if arr[j] < tmp[i]:
+                arr[dest] = arr[j]
+                j += 1
+                count2 += 1
+                count1 = 0
+            else:
+                arr[dest] = tmp[i]
                 i += 1
+                count1 += 1
+                count2 = 0
+            dest += 1
+            if count1 >= min_gallop or count2 >= min_gallop:
+                break
+
+        while i < len1 and j < end2:
+            count1 = _gallop_right(arr[j], tmp, i, len1 - i, 0)
+            arr[dest:dest + count1] = tmp[i:i + count1]
+            dest += count1
+            i += count1
+            if i >= len1:
+                break
+
+            count2 = _gallop_left(tmp[i], arr, j, end2 - j, 0)
+            arr[dest:dest + count2] = arr[j:j + count2]
+            dest += count2
+            j += count2
+            if j >= end2:
+                break
+
+            if count1 < _MIN_GALLOP and count2 < _MIN_GALLOP:
+                min_gallop += 1
+                break
+            if min_gallop > 1:
+                min_gallop -= 1
+
+    # Остаток правой серии уже на своем месте
+    if i < len1:
+        arr[dest:dest + len1 - i] = tmp[i:]
+    return min_gallop
+
+
+def _merge_at(arr, runs, idx, min_gallop):
+    """Слияние серий runs[idx] и runs[idx + 1] в стеке серий."""
+    base1, len1 = runs[idx]
+    base2, len2 = runs[idx + 1]
+    runs[idx] = (base1, len1 + len2)
+    del runs[idx + 1]
+
+    # Элементы левой серии, не большие arr[base2], уже на месте
+    k = _gallop_right(arr[base2], arr, base1, len1, 0)
+    base1 += k
+    len1 -= k
+    if len1 == 0:
+        return min_gallop
+
+    # Элементы правой серии, не меньшие последнего левого, тоже на месте
+    len2 = _gallop_left(arr[base1 + len1 - 1], arr, base2, len2, len2 - 1)
+    if len2 == 0:
+        return min_gallop
+
+    return _merge_lo(arr, base1, len1, base2, len2, min_gallop)
+
+
+def _merge_collapse(arr, runs, min_gallop):
+    """
+    Поддержание инвариантов стека серий (A > B + C, B > C) слиянием
+    верхних серий, чтобы глубина стека оставалась O(log n).
+    """
+    while len(runs) > 1:
+        n = len(runs) - 2
+        if ((n > 0 and runs[n - 1][1] <= runs[n][1] + runs[n + 1][1]) or
+                (n > 1 and runs[n - 2][1] <= runs[n - 1][1] + runs[n][1])):
+            if runs[n - 1][1] < runs[n + 1][1]:
+                n -= 1
+        elif runs[n][1] > runs[n + 1][1]:
+            break
+        min_gallop = _merge_at(arr, runs, n, min_gallop)
+    return min_gallop
+
+
+@supports_key(stable=True)
+def tim_sort(arr):
+    """
+    Адаптивная сортировка слиянием естественных серий (Timsort)
+
+    Массив разбивается на уже упорядоченные (или строго убывающие)
+    серии; короткие серии дополняются до minrun бинарными вставками,
+    серии сливаются с галопирующим поиском.
+
+    Временная сложность:
+        - Худший случай: O(n log n)
+        - Средний случай: O(n log n)
+        - Лучший случай: O(n) (отсортированный или обратный массив)
+    Пространственная сложность: O(n) (буфер для слияния)
+    Устойчивость: да
+    """
+    n = len(arr)
+    if n < 2:
+        return arr
+
+    if n < _MIN_MERGE:
+        run_len = _count_run_and_make_ascending(arr, 0, n)
+        _binary_insertion_sort(arr, 0, n, run_len)
+        return arr
+
+    min_run = _compute_minrun(n)
+    min_gallop = _MIN_GALLOP
+    runs = []
+    lo = 0
+    while lo < n:
+        run_len = _count_run_and_make_ascending(arr, lo, n)
+        if run_len < min_run:
+            forced = min(min_run, n - lo)
+            _binary_insertion_sort(arr, lo, lo + forced, lo + run_len)
+            run_len = forced
+        runs.append((lo, run_len))
+        min_gallop = _merge_collapse(arr, runs, min_gallop)
+        lo += run_len
+
+    while len(runs) > 1:
+        n = len(runs) - 2
+        if n > 0 and runs[n - 1][1] < runs[n + 1][1]:
+            n -= 1
+        min_gallop = _merge_at(arr, runs, n, min_gallop)
+    return arr
+
+
+# Длина начальных серий восходящей сортировки слиянием
+_BOTTOM_UP_RUN = 16
+
+
+def _merge_pair(src, dst, lo, mid, hi):
+    """
+    Слияние src[lo:mid] и src[mid:hi] в dst[lo:hi].
+
+    Если половины уже упорядочены друг относительно друга, слияние
+    заменяется копированием блока.
+    """
+    if mid >= hi or not src[mid] < src[mid - 1]:
+        dst[lo:hi] = src[lo:hi]
+        return
+
+    i, j, k = lo, mid, lo
+    while i < mid and j < hi:
+        if src[j] < src[i]:
+            dst[k] = src[j]
+            j += 1
+        else:
+            dst[k] = src[i]
+            i += 1
+        k += 1
+
+    if i < mid:
+        dst[k:hi] = src[i:mid]
+    else:
+        dst[k:hi] = src[j:hi]
+
+
+def _merge_k(src, dst, lo, width, hi):
+    """
+    Слияние соседних серий длины width из src[lo:hi] в dst[lo:hi].
+
+    Минимум выбирается линейным просмотром голов серий; при равенстве
+    берется серия с меньшим номером, что сохраняет устойчивость.
+    """
+    starts = list(range(lo, hi, width))
+    if all(not src[b] < src[b - 1] for b in starts[1:]):
+        dst[lo:hi] = src[lo:hi]
+        return
+
+    heads = starts
+    ends = [min(start + width, hi) for start in starts]
+    runs = range(len(heads))
+    for k in range(lo, hi):
+        best = -1
+        for r in runs:
+            if heads[r] < ends[r] and (
+                    best < 0 or src[heads[r]] < src[heads[best]]):
+                best = r
+        dst[k] = src[heads[best]]
+        heads[best] += 1
+
+
+@supports_key(stable=True)
+def merge_sort_bottom_up(arr, ways=2):
+    """
+    Восходящая (итеративная) сортировка слиянием (Bottom-up Merge Sort)
+
+    Вместо рекурсии и срезов на каждом уровне используется один заранее
+    выделенный буфер: проходы поочередно сливают данные из массива в
+    буфер и обратно. Слияние уже упорядоченных соседних серий
+    пропускается. При ways > 2 за проход сливается ways серий, и
+    количество проходов сокращается до log_ways(n).
+
+    Временная сложность:
+        - Худший случай: O(n log n)
+        - Средний случай: O(n log n)
+        - Лучший случай: O(n) (отсортированный массив)
+    Пространственная сложность: O(n) (один вспомогательный буфер)
+    Устойчивость: да
+
+    Raises:
+        ValueError: Если ways < 2
+    """
+    if ways < 2:
+        raise ValueError("Количество сливаемых серий должно быть не меньше 2")
+
+    n = len(arr)
+    if n < 2:
+        return arr
+
+    width = min(_BOTTOM_UP_RUN, n)
+    for lo in range(0, n, width):
+        _binary_insertion_sort(arr, lo, min(lo + width, n), lo + 1)
+
+    src = arr
+    dst = _new_buffer(arr, n)
+    while width < n:
+        step = width * ways
+        for lo in range(0, n, step):
+            hi = min(lo + step, n)
+            if ways == 2:
+                _merge_pair(src, dst, lo, min(lo + width, hi), hi)
+            else:
+                _merge_k(src, dst, lo, width, hi)
+        src, dst = dst, src
+        width = step
+
+    if src is not arr:
+        arr[:] = src
+    return arr
+
+
+# Параметры интроспективной сортировки
+_INTRO_INSERTION_CUTOFF = 16
+_NINTHER_THRESHOLD = 128
+
+
+def _sift_down_range(arr, lo, root, size):
+    """Просеивание вниз в max-куче, занимающей arr[lo:lo+size]."""
+    while True:
+        child = 2 * root + 1
+        if child >= size:
+            break
+        if child + 1 < size and arr[lo + child] < arr[lo + child + 1]:
+            child += 1
+        if not arr[lo + root] < arr[lo + child]:
+            break
+        arr[lo + root], arr[lo + child] = arr[lo + child], arr[lo + root]
+        root = child
+
+
+def _heap_sort_range(arr, lo, hi):
+    """Сортировка кучей отрезка arr[lo:hi + 1] на месте. O(n log n)."""
+    size = hi - lo + 1
+    for root in range(size // 2 - 1, -1, -1):
+        _sift_down_range(arr, lo, root, size)
+    for end in range(size - 1, 0, -1):
+        arr[lo], arr[lo + end] = arr[lo + end], arr[lo]
+        _sift_down_range(arr, lo, 0, end)
+
+
+def _median_of_three(arr, a, b, c):
+    """Индекс медианы из arr[a], arr[b], arr[c]."""
+    if arr[a] < arr[b]:
+        if arr[b] < arr[c]:
+            return b
+        return c if arr[a] < arr[c] else a
+    if arr[a] < arr[c]:
+        return a
+    return c if arr[b] < arr[c] else b
+
+
+def _choose_pivot(arr, lo, hi):
+    """
+    Выбор опорного элемента: медиана трех для небольших отрезков и
+    псевдомедиана девяти (ninther, Тьюки) для больших.
+    """
+    mid = (lo + hi) // 2
+    if hi - lo + 1 > _NINTHER_THRESHOLD:
+        step = (hi - lo + 1) // 8
+        first = _median_of_three(arr, lo, lo + step, lo + 2 * step)
+        middle = _median_of_three(arr, mid - step, mid, mid + step)
+        last = _median_of_three(arr, hi - 2 * step, hi - step, hi)
+        return _median_of_three(arr, first, middle, last)
+    return _median_of_three(arr, lo, mid, hi)
+
+
+def _partition_three_way(arr, lo, hi, pivot):
+    """
+    Трехпутевое разбиение (задача о голландском флаге) arr[lo:hi + 1].
+
+    Returns:
+        (lt, gt): arr[lo:lt] < pivot, arr[lt:gt + 1] == pivot,
+        arr[gt + 1:hi + 1] > pivot
+    """
+    lt, i, gt = lo, lo, hi
+    while i <= gt:
+        if arr[i] < pivot:
+            arr[lt], arr[i] = arr[i], arr[lt]
+            lt += 1
+            i += 1
+        elif pivot < arr[i]:
+            arr[i], arr[gt] = arr[gt], arr[i]
+            gt -= 1
+        else:
+            i += 1
+    return lt, gt
+
+
+def _partition_hoare(arr, lo, hi, pivot_index):
+    """
+    Разбиение Хоара arr[lo:hi + 1] относительно arr[pivot_index].
+
+    Опорный элемент переносится в начало отрезка, что гарантирует
+    непустоту обеих частей.
+
+    Returns:
+        j: arr[lo:j + 1] <= pivot, arr[j + 1:hi + 1] >= pivot, lo <= j < hi
+    """
+    arr[lo], arr[pivot_index] = arr[pivot_index], arr[lo]
+    pivot = arr[lo]
+    i, j = lo - 1, hi + 1
+    while True:
+        i += 1
+        while arr[i] < pivot:
+            i += 1
+        j -= 1
+        while pivot < arr[j]:
             j -= 1
-            while pivot < arr[j]:
-                j -= 1
-            if i >= j:
+        if i >= j:
+            return j
+        arr[i], arr[j] = arr[j], arr[i]
+
+
+def _sample_has_duplicates(arr, lo, hi, pivot_index):
+    """Совпадает ли опорный элемент с другим элементом из выборки."""
+    pivot = arr[pivot_index]
+    for index in (lo, (lo + hi) // 2, hi):
+        if index != pivot_index and not (
+                arr[index] < pivot or pivot < arr[index]):
+            return True
+    return False
+
+
+def _intro_sort_range(arr, lo, hi, depth_limit):
+    while hi - lo >= _INTRO_INSERTION_CUTOFF:
+        if depth_limit == 0:
+            _heap_sort_range(arr, lo, hi)
+            return
+        depth_limit -= 1
+
+        pivot_index = _choose_pivot(arr, lo, hi)
+        if _sample_has_duplicates(arr, lo, hi, pivot_index):
+            lt, gt = _partition_three_way(arr, lo, hi, arr[pivot_index])
+        else:
+            split = _partition_hoare(arr, lo, hi, pivot_index)
+            lt, gt = split + 1, split
+
+        # Рекурсивно сортируем меньшую часть, итеративно - большую
+        if lt - lo < hi - gt:
+            _intro_sort_range(arr, lo, lt - 1, depth_limit)
+            lo = gt + 1
+        else:
+            _intro_sort_range(arr, gt + 1, hi, depth_limit)
+            hi = lt - 1
+
+    if lo < hi:
+        _binary_insertion_sort(arr, lo, hi + 1, lo + 1)
+
+
+@supports_key(stable=False)
+def intro_sort(arr):
+    """
+    Интроспективная сортировка (Introsort)
+
+    Быстрая сортировка с выбором опорного элемента медианой трех или
+    девяти. Если опорный элемент совпадает с другим элементом выборки,
+    используется трехпутевое разбиение, которое сразу исключает все
+    равные ему элементы (много повторов), иначе - разбиение Хоара.
+    Глубина рекурсии ограничена 2·log2(n): при ее превышении отрезок
+    досортировывается кучей, что исключает деградацию до O(n²). Короткие
+    отрезки сортируются вставками.
+
+    Временная сложность:
+        - Худший случай: O(n log n)
+        - Средний случай: O(n log n)
+        - Лучший случай: O(n) (все элементы равны)
+    Пространственная сложность: O(log n) для стека рекурсии
+    Устойчивость: нет
+    """
+    n = len(arr)
+    if n <= 1:
+        return arr
+
+    _intro_sort_range(arr, 0, n - 1, 2 * (n.bit_length() - 1))
+    return arr
+
+
+# Параметры pdqsort
+_PDQ_INSERTION_CUTOFF = 24
+_PDQ_PARTIAL_INSERTION_LIMIT = 8
+_PDQ_BLOCK_SIZE = 64
+
+
+def _sort2(arr, a, b):
+    if arr[b] < arr[a]:
+        arr[a], arr[b] = arr[b], arr[a]
+
+
+def _sort3(arr, a, b, c):
+    _sort2(arr, a, b)
+    _sort2(arr, b, c)
+    _sort2(arr, a, b)
+
+
+def _partial_insertion_sort(arr, begin, end):
+    """
+    Попытка досортировать arr[begin:end] вставками.
+
+    Прерывается, если перемещено больше _PDQ_PARTIAL_INSERTION_LIMIT
+    элементов. Возвращает True, если отрезок отсортирован полностью.
+    """
+    limit = 0
+    for cur in range(begin + 1, end):
+        if limit > _PDQ_PARTIAL_INSERTION_LIMIT:
+            return False
+        sift = cur
+        if arr[sift] < arr[sift - 1]:
+            tmp = arr[sift]
+            while True:
+                arr[sift] = arr[sift - 1]
+                sift -= 1
+                if sift == begin or not tmp < arr[sift - 1]:
+                    break
+            arr[sift] = tmp
+            limit += cur - sift
+    return True
+
+
+def _partition_left(arr, begin, end):
+    """
+    Разбиение arr[begin:end] с опорным arr[begin] так, что равные
+    опорному элементы попадают в левую часть. Используется, когда
+    предшествующий отрезку элемент равен опорному: тогда левая часть
+    целиком состоит из равных элементов и дальше не сортируется.
+
+    Returns:
+        Итоговая позиция опорного элемента
+    """
+    pivot = arr[begin]
+    first = begin
+    last = end
+
+    last -= 1
+    while pivot < arr[last]:
+        last -= 1
+
+    if last + 1 == end:
+        while first < last:
+            first += 1
+            if pivot < arr[first]:
+                break
+    else:
+        first += 1
+        while not pivot < arr[first]:
+            first += 1
+
+    while first < last:
+        arr[first], arr[last] = arr[last], arr[first]
+        last -= 1
+        while pivot < arr[last]:
+            last -= 1
+        first += 1
+        while not pivot < arr[first]:
+            first += 1
+
+    arr[begin] = arr[last]
+    arr[last] = pivot
+    return last
+
+
+def _partition_right(arr, begin, end):
+    """
+    Разбиение arr[begin:end] с опорным arr[begin]; равные опорному
+    элементы уходят вправо.
+
+    Returns:
+        (pivot_pos, already_partitioned): позиция опорного элемента и
+        признак того, что обменов не потребовалось
+    """
+    pivot = arr[begin]
+    first = begin
+    last = end
+
+    # Медиана трех гарантирует элемент >= pivot справа от begin
+    first += 1
+    while arr[first] < pivot:
+        first += 1
+
+    if first - 1 == begin:
+        while first < last:
+            last -= 1
+            if arr[last] < pivot:
+                break
+    else:
+        last -= 1
+        while not arr[last] < pivot:
+            last -= 1
+
+    already_partitioned = first >= last
+
+    while first < last:
+        arr[first], arr[last] = arr[last], arr[first]
+        first += 1
+        while arr[first] < pivot:
+            first += 1
+        last -= 1
+        while not arr[last] < pivot:
+            last -= 1
+
+    pivot_pos = first - 1
+    arr[begin] = arr[pivot_pos]
+    arr[pivot_pos] = pivot
+    return pivot_pos, already_partitioned
+
+
+def _partition_right_block(arr, begin, end):
+    """
+    Блочное разбиение arr[begin:end] с опорным arr[begin] (BlockQuicksort,
+    Edelkamp и Weiß). Элементы, стоящие не на своей стороне, сначала
+    собираются в буферы смещений блоками по _PDQ_BLOCK_SIZE, причем
+    счетчик увеличивается на результат сравнения без ветвления; затем
+    найденные пары обмениваются. Равные опорному элементы уходят вправо.
+
+    Returns:
+        (pivot_pos, already_partitioned): позиция опорного элемента и
+        признак того, что обменов не потребовалось
+    """
+    pivot = arr[begin]
+    first = begin
+    last = end
+
+    first += 1
+    while arr[first] < pivot:
+        first += 1
+
+    if first - 1 == begin:
+        while first < last:
+            last -= 1
+            if arr[last] < pivot:
                 break
-            arr[i], arr[j] = arr[j], arr[i]
+    else:
+        last -= 1
+        while not arr[last] < pivot:
+            last -= 1
+
+    already_partitioned = first >= last
+    if not already_partitioned:
+        arr[first], arr[last] = arr[last], arr[first]
+        first += 1
+
+        offsets_l = [0] * _PDQ_BLOCK_SIZE
+        offsets_r = [0] * _PDQ_BLOCK_SIZE
+        offsets_l_base = first
+        offsets_r_base = last
+        num_l = num_r = start_l = start_r = 0
+
+        while first < last:
+            num_unknown = last - first
+            if num_l == 0:
+                left_split = num_unknown // 2 if num_r == 0 else num_unknown
+            else:
+                left_split = 0
+            right_split = num_unknown - left_split if num_r == 0 else 0
+
+            for i in range(min(left_split, _PDQ_BLOCK_SIZE)):
+                offsets_l[num_l] = i
+                num_l += not arr[first] < pivot
+                first += 1
+
+            for i in range(1, min(right_split, _PDQ_BLOCK_SIZE) + 1):
+                offsets_r[num_r] = i
+                last -= 1
+                num_r += arr[last] < pivot
+
+            num = min(num_l, num_r)
+            for k in range(num):
+                left = offsets_l_base + offsets_l[start_l + k]
+                right = offsets_r_base - offsets_r[start_r + k]
+                arr[left], arr[right] = arr[right], arr[left]
+            num_l -= num
+            num_r -= num
+            start_l += num
+            start_r += num
+
+            if num_l == 0:
+                start_l = 0
+                offsets_l_base = first
+            if num_r == 0:
+                start_r = 0
+                offsets_r_base = last
+
+        # Оставшиеся элементы одного из буферов переносятся к границе
+        if num_l:
+            while num_l:
+                num_l -= 1
+                last -= 1
+                left = offsets_l_base + offsets_l[start_l + num_l]
+                arr[left], arr[last] = arr[last], arr[left]
+            first = last
+        if num_r:
+            while num_r:
+                num_r -= 1
+                right = offsets_r_base - offsets_r[start_r + num_r]
+                arr[right], arr[first] = arr[first], arr[right]
+                first += 1
+            last = first
+
+    pivot_pos = first - 1
+    arr[begin] = arr[pivot_pos]
+    arr[pivot_pos] = pivot
+    return pivot_pos, already_partitioned
+
+
+def _break_patterns(arr, begin, pivot_pos, end):
+    """
+    Перемешивание после сильно несбалансированного разбиения: несколько
+    элементов обеих частей обмениваются с элементами из их четвертей,
+    что разрушает закономерности, на которых деградирует выбор опорного.
+    """
+    l_size = pivot_pos - begin
+    r_size = end - (pivot_pos + 1)
+
+    if l_size >= _PDQ_INSERTION_CUTOFF:
+        quarter = l_size // 4
+        swaps = [(begin, begin + quarter),
+                 (pivot_pos - 1, pivot_pos - quarter)]
+        if l_size > _NINTHER_THRESHOLD:
+            swaps += [(begin + 1, begin + quarter + 1),
+                      (begin + 2, begin + quarter + 2),
+                      (pivot_pos - 2, pivot_pos - quarter - 1),
+                      (pivot_pos - 3, pivot_pos - quarter - 2)]
+        for a, b in swaps:
+            arr[a], arr[b] = arr[b], arr[a]
+
+    if r_size >= _PDQ_INSERTION_CUTOFF:
+        quarter = r_size // 4
+        swaps = [(pivot_pos + 1, pivot_pos + 1 + quarter),
+                 (end - 1, end - quarter)]
+        if r_size > _NINTHER_THRESHOLD:
+            swaps += [(pivot_pos + 2, pivot_pos + 2 + quarter),
+                      (pivot_pos + 3, pivot_pos + 3 + quarter),
+                      (end - 2, end - 1 - quarter),
+                      (end - 3, end - 2 - quarter)]
+        for a, b in swaps:
+            arr[a], arr[b] = arr[b], arr[a]
+
+
+def _pdq_sort_loop(arr, begin, end, bad_allowed, leftmost, partition):
+    while True:
+        size = end - begin
+        if size < _PDQ_INSERTION_CUTOFF:
+            _binary_insertion_sort(arr, begin, end, begin + 1)
+            return
+
+        # Опорный элемент переносится в arr[begin]
+        half = size // 2
+        if size > _NINTHER_THRESHOLD:
+            _sort3(arr, begin, begin + half, end - 1)
+            _sort3(arr, begin + 1, begin + half - 1, end - 2)
+            _sort3(arr, begin + 2, begin + half + 1, end - 3)
+            _sort3(arr, begin + half - 1, begin + half, begin + half + 1)
+            arr[begin], arr[begin + half] = arr[begin + half], arr[begin]
+        else:
+            _sort3(arr, begin + half, begin, end - 1)
+
+        # Предыдущий элемент не меньше опорного - значит, равен ему
+        if not leftmost and not arr[begin - 1] < arr[begin]:
+            begin = _partition_left(arr, begin, end) + 1
+            continue
+
+        pivot_pos, already_partitioned = partition(arr, begin, end)
+
+        l_size = pivot_pos - begin
+        r_size = end - (pivot_pos + 1)
+        if l_size < size // 8 or r_size < size // 8:
+            bad_allowed -= 1
+            if bad_allowed == 0:
+                _heap_sort_range(arr, begin, end - 1)
+                return
+            _break_patterns(arr, begin, pivot_pos, end)
+        elif (already_partitioned and
+              _partial_insertion_sort(arr, begin, pivot_pos) and
+              _partial_insertion_sort(arr, pivot_pos + 1, end)):
+            return
 
-        arr[i], arr[high - 1] = arr[high - 1], arr[i]
-        return i
+        _pdq_sort_loop(arr, begin, pivot_pos, bad_allowed, leftmost,
+                       partition)
+        begin = pivot_pos + 1
+        leftmost = False
 
-    def _insertion_sort_sublist(arr, low, high):
-        for i in range(low + 1, high + 1):
-            key = arr[i]
-            j = i - 1
-            while j >= low and arr[j] > key:
-                arr[j + 1] = arr[j]
-                j -= 1
-            arr[j + 1] = key
 
+@supports_key(stable=False)
+def pdq_sort(arr):
+    """
+    Быстрая сортировка, побеждающая шаблоны (Pattern-defeating Quicksort)
+
+    Развитие Introsort (Orson Peters):
+        - если разбиение не потребовало обменов, отрезок пробуется
+          досортировать ограниченными вставками (почти отсортированные
+          данные обрабатываются за O(n));
+        - после несбалансированного разбиения элементы перемешиваются,
+          а после log2(n) таких разбиений отрезок сортируется кучей;
+        - элементы, равные предыдущему опорному, отделяются за один
+          проход (много повторов - O(n·k) для k различных значений).
+
+    Временная сложность:
+        - Худший случай: O(n log n)
+        - Средний случай: O(n log n)
+        - Лучший случай: O(n) (отсортированный массив, все равные)
+    Пространственная сложность: O(log n) для стека рекурсии
+    Устойчивость: нет
+    """
+    n = len(arr)
+    if n <= 1:
+        return arr
+
+    _pdq_sort_loop(arr, 0, n, n.bit_length() - 1, True, _partition_right)
+    return arr
+
+
+@supports_key(stable=False)
+def pdq_sort_branchless(arr):
+    """
+    pdqsort с блочным разбиением (BlockQuicksort) вместо классического.
+
+    Результаты сравнений накапливаются в буферах смещений без условных
+    переходов, что в компилируемых языках устраняет ошибки предсказания
+    ветвлений. В CPython каждое сравнение и так стоит вызова функции,
+    поэтому вариант медленнее pdq_sort и оставлен для сравнения.
+
+    Сложность та же, что у pdq_sort.
+    """
+    n = len(arr)
+    if n <= 1:
+        return arr
+
+    _pdq_sort_loop(arr, 0, n, n.bit_length() - 1, True,
+                   _partition_right_block)
+    return arr
+
+
+# Параметры поразрядных сортировок
+_RADIX_BITS = 8
+_RADIX = 1 << _RADIX_BITS
+_RADIX_MASK = _RADIX - 1
+_MSD_INSERTION_CUTOFF = 32
+_COUNTING_RANGE_FACTOR = 4
+
+
+def _counting_sort_by_key(arr, keys, reverse, stable=True):
+    """
+    Устойчивая сортировка подсчетом элементов arr по целым ключам:
+    префиксные суммы счетчиков дают начальную позицию каждого ключа.
+    """
+    low, high = min(keys), max(keys)
+    counts = _aux_list(arr, [0] * (high - low + 2))
+    for k in keys:
+        counts[(high - k if reverse else k - low) + 1] += 1
+    for i in range(1, len(counts)):
+        counts[i] += counts[i - 1]
+
+    result = _aux_list(arr, [None] * len(arr))
+    for k, x in zip(keys, arr):
+        slot = high - k if reverse else k - low
+        result[counts[slot]] = x
+        counts[slot] += 1
+    arr[:] = _like(arr, result)
+    return arr
+
+
+@supports_key(stable=True, integer=True, by_key=_counting_sort_by_key)
+def counting_sort(arr):
+    """
+    Сортировка подсчетом (Counting Sort) для целых чисел
+
+    Подсчитывается количество каждого значения в диапазоне [min, max],
+    затем массив перезаписывается значениями по возрастанию. С key
+    выполняется устойчивый вариант с префиксными суммами.
+
+    Временная сложность: O(n + k), где k = max - min + 1
+    Пространственная сложность: O(k)
+    """
     if len(arr) <= 1:
         return arr
 
-    _quick_sort_opt(arr, 0, len(arr) - 1)
+    values = _py_values(arr)
+    min_val = min(values)
+    counts = _aux_list(arr, [0] * (max(values) - min_val + 1))
+    for x in values:
+        counts[x - min_val] += 1
+
+    pos = 0
+    for offset, count in enumerate(counts):
+        if count:
+            arr[pos:pos + count] = _like(arr, [offset + min_val] * count)
+            pos += count
     return arr
+
+
+@supports_key(stable=True, integer=True)
+def radix_sort_lsd(arr):
+    """
+    Поразрядная сортировка с младшего разряда (LSD Radix Sort)
+
+    Числа (сдвинутые на минимум, чтобы поддержать отрицательные)
+    сортируются устойчивым подсчетом по байтам, начиная с младшего.
+    Вместо списков-корзин используется массив счетчиков на 256
+    значений и один плоский буфер того же размера, что и вход.
+
+    Временная сложность: O(d · (n + 256)), где d - число байтов в
+    max - min
+    Пространственная сложность: O(n)
+    Устойчивость: да
+    """
+    n = len(arr)
+    if n <= 1:
+        return arr
+
+    values = _py_values(arr)
+    min_val = min(values)
+    span = max(values) - min_val
+    passes = (span.bit_length() + _RADIX_BITS - 1) // _RADIX_BITS
+    if passes == 0:
+        return arr
+
+    src = _aux_list(arr, [x - min_val for x in values])
+    dst = _aux_list(arr, [0] * n)
+    shift = 0
+    for _ in range(passes):
+        counts = _aux_list(arr, [0] * (_RADIX + 1))
+        for x in src:
+            counts[((x >> shift) & _RADIX_MASK) + 1] += 1
+        for digit in range(_RADIX):
+            counts[digit + 1] += counts[digit]
+        for x in src:
+            digit = (x >> shift) & _RADIX_MASK
+            dst[counts[digit]] = x
+            counts[digit] += 1
+        src, dst = dst, src
+        shift += _RADIX_BITS
+
+    arr[:] = _like(arr, [x + min_val for x in src])
+    return arr
+
+
+def _msd_radix_range(arr, buf, lo, hi, shift):
+    if hi - lo <= _MSD_INSERTION_CUTOFF:
+        _binary_insertion_sort(arr, lo, hi, lo + 1)
+        return
+
+    counts = _aux_list(arr, [0] * (_RADIX + 1))
+    for i in range(lo, hi):
+        counts[((arr[i] >> shift) & _RADIX_MASK) + 1] += 1
+    for digit in range(_RADIX):
+        counts[digit + 1] += counts[digit]
+    starts = counts[:]
+
+    for i in range(lo, hi):
+        x = arr[i]
+        digit = (x >> shift) & _RADIX_MASK
+        buf[lo + counts[digit]] = x
+        counts[digit] += 1
+    arr[lo:hi] = buf[lo:hi]
+
+    if shift == 0:
+        return
+    for digit in range(_RADIX):
+        start, end = lo + starts[digit], lo + starts[digit + 1]
+        if end - start > 1:
+            _msd_radix_range(arr, buf, start, end, shift - _RADIX_BITS)
+
+
+@supports_key(stable=True, integer=True)
+def radix_sort_msd(arr):
+    """
+    Поразрядная сортировка со старшего разряда (MSD Radix Sort)
+
+    Массив распределяется по корзинам старшего байта, затем каждая
+    корзина рекурсивно сортируется по следующему байту. Корзины не
+    длиннее 32 элементов досортировываются вставками, что экономит
+    проходы подсчета по почти пустым корзинам.
+
+    Временная сложность: O(d · (n + 256)) в худшем случае, обычно
+    быстрее, так как глубина ограничивается размером корзин
+    Пространственная сложность: O(n + d · 256)
+    """
+    n = len(arr)
+    if n <= 1:
+        return arr
+
+    values = _py_values(arr)
+    min_val = min(values)
+    span = max(values) - min_val
+    if span == 0:
+        return arr
+    top_shift = ((span.bit_length() - 1) // _RADIX_BITS) * _RADIX_BITS
+
+    keys = _aux_list(arr, [x - min_val for x in values])
+    _msd_radix_range(keys, _aux_list(arr, [0] * n), 0, n, top_shift)
+    arr[:] = _like(arr, [x + min_val for x in keys])
+    return arr
+
+
+def _integer_sort_by_key(arr, keys, reverse, stable=True):
+    if max(keys) - min(keys) + 1 <= _COUNTING_RANGE_FACTOR * len(arr):
+        return _counting_sort_by_key(arr, keys, reverse)
+    return _sort_encoded(radix_sort_lsd, arr, keys, reverse)
+
+
+@supports_key(stable=True, integer=True, by_key=_integer_sort_by_key)
+def integer_sort(arr):
+    """
+    Сортировка целых чисел с автоматическим выбором алгоритма:
+        - диапазон значений не больше 4n - сортировка подсчетом;
+        - иначе - LSD поразрядная сортировка.
+
+    Временная сложность: O(n + k) или O(d · n)
+    """
+    n = len(arr)
+    if n <= 1:
+        return arr
+
+    values = _py_values(arr)
+    if max(values) - min(values) + 1 <= _COUNTING_RANGE_FACTOR * n:
+        return counting_sort(arr)
+    return radix_sort_lsd(arr)
+
+
+# Параметры выбора порядковой статистики
+_SELECT_INSERTION_CUTOFF = 16
+_SELECT_CHECK_STEPS = 2
+_MEDIAN_GROUP = 5
+
+
+def _median_of_medians(arr, lo, hi):
+    """
+    Опорный элемент по правилу медианы медиан (BFPRT).
+
+    Медианы групп по 5 элементов переносятся в начало отрезка, и среди
+    них рекурсивно выбирается медиана. По обе стороны от такого
+    опорного элемента остается не менее ~3/10 отрезка.
+
+    Returns:
+        Индекс опорного элемента
+    """
+    dest = lo
+    for start in range(lo, hi + 1, _MEDIAN_GROUP):
+        end = min(start + _MEDIAN_GROUP - 1, hi)
+        _insertion_sort_sublist(arr, start, end)
+        median = (start + end) // 2
+        arr[dest], arr[median] = arr[median], arr[dest]
+        dest += 1
+
+    mid = lo + (dest - lo - 1) // 2
+    _select_range(arr, lo, dest - 1, mid)
+    return mid
+
+
+def _select_range(arr, lo, hi, k):
+    """
+    Introselect: перестановка arr[lo:hi + 1], после которой arr[k]
+    стоит на своем месте в отсортированном порядке.
+
+    Сначала используется разбиение с медианой трех (_partition_opt).
+    Если за _SELECT_CHECK_STEPS разбиений отрезок не сократился вдвое,
+    выбор переключается на медиану медиан с трехпутевым разбиением,
+    что гарантирует O(n) в худшем случае.
+    """
+    guaranteed = False
+    steps = 0
+    checkpoint = hi - lo + 1
+    while hi - lo >= _SELECT_INSERTION_CUTOFF:
+        if guaranteed:
+            pivot_index = _median_of_medians(arr, lo, hi)
+            lt, gt = _partition_three_way(arr, lo, hi, arr[pivot_index])
+        else:
+            lt = gt = _partition_opt(arr, lo, hi)
+
+        if k < lt:
+            hi = lt - 1
+        elif k > gt:
+            lo = gt + 1
+        else:
+            return
+
+        steps += 1
+        if steps == _SELECT_CHECK_STEPS:
+            if hi - lo + 1 > checkpoint // 2:
+                guaranteed = True
+            checkpoint = hi - lo + 1
+            steps = 0
+
+    _insertion_sort_sublist(arr, lo, hi)
+
+
+def _selection_keys(arr, key):
+    """Ключи элементов arr для выбора по ключу."""
+    values = _py_values(arr)
+    return values if key is None else [key(x) for x in values]
+
+
+def nth_element(arr, k, key=None, reverse=False):
+    """
+    Частичное упорядочивание (аналог std::nth_element)
+
+    После вызова arr[k] равен k-му по порядку элементу (с нуля),
+    элементы arr[:k] не больше, а arr[k + 1:] не меньше него
+    (при reverse - наоборот).
+
+    Временная сложность:
+        - Худший случай: O(n) (медиана медиан)
+        - Средний случай: O(n)
+    Пространственная сложность: O(log n)
+    Устойчивость: нет
+    """
+    n = len(arr)
+    if not 0 <= k < n:
+        raise IndexError("k вне диапазона массива")
+    if key is None and not reverse:
+        _select_range(arr, 0, n - 1, k)
+        return arr
+
+    # При reverse результат разворачивается, поэтому выбирается
+    # симметричная позиция
+    target = n - 1 - k if reverse else k
+    return _sort_decorated(
+        lambda items: _select_range(items, 0, n - 1, target),
+        arr, _selection_keys(arr, key), reverse)
+
+
+def quickselect(arr, k, key=None, reverse=False):
+    """
+    Выбор k-го по порядку элемента (с нуля) за линейное время.
+
+    Массив переставляется на месте, как в nth_element.
+
+    Returns:
+        k-й элемент массива в отсортированном порядке
+    """
+    nth_element(arr, k, key=key, reverse=reverse)
+    return arr[k]
+
+
+def partial_sort(arr, k, key=None, reverse=False):
+    """
+    Частичная сортировка (аналог std::partial_sort)
+
+    Первые k позиций занимают k наименьших (при reverse - наибольших)
+    элементов в отсортированном порядке; порядок остальных не
+    определен. Вместо полной сортировки выбирается k-й элемент и
+    сортируется только префикс.
+
+    Временная сложность: O(n + k log k)
+    Пространственная сложность: O(log n)
+    Устойчивость: нет
+    """
+    n = len(arr)
+    k = min(k, n)
+    if k <= 0 or n <= 1:
+        return arr
+
+    def select_and_sort(items):
+        # При reverse нужные элементы собираются в конце и после
+        # разворота оказываются в начале
+        lo, hi = (n - k, n - 1) if reverse else (0, k - 1)
+        if k < n:
+            _select_range(items, 0, n - 1, lo if reverse else hi)
+        _intro_sort_range(items, lo, hi, 2 * (k.bit_length() - 1))
+
+    if key is None and not reverse:
+        select_and_sort(arr)
+        return arr
+    return _sort_decorated(select_and_sort, arr,
+                           _selection_keys(arr, key), reverse)
+
+
+def top_k(iterable, k, key=None, reverse=False):
+    """
+    k наименьших (при reverse - наибольших) элементов потока.
+
+    Хранится куча из k лучших элементов: для наименьших - max-куча, на
+    вершине которой худший из отобранных; новый элемент заменяет его,
+    только если он лучше. Результат совпадает с
+    sorted(iterable, key=key, reverse=reverse)[:k], включая порядок
+    равных элементов.
+
+    Временная сложность: O(n log k)
+    Пространственная сложность: O(k)
+    """
+    if k <= 0:
+        return []
+
+    # Кортежи (ключ, ±номер, элемент): номер делает порядок устойчивым
+    sign = -1 if reverse else 1
+    heap = []
+    for index, item in enumerate(iterable):
+        entry = (item if key is None else key(item), sign * index, item)
+        if len(heap) < k:
+            heap.append(entry)
+            if len(heap) == k:
+                if reverse:
+                    heapq.heapify(heap)
+                else:
+                    for root in range(k // 2 - 1, -1, -1):
+                        _sift_down_range(heap, 0, root, k)
+        elif reverse:
+            if heap[0] < entry:
+                heapq.heapreplace(heap, entry)
+        elif entry < heap[0]:
+            heap[0] = entry
+            _sift_down_range(heap, 0, 0, k)
+
+    if reverse:
+        heapq.heapify(heap)
+        result = [heapq.heappop(heap) for _ in range(len(heap))]
+        result.reverse()
+    else:
+        result = heap
+        _heap_sort_range(result, 0, len(result) - 1)
+    return [entry[2] for entry in result]
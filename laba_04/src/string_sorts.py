@@ -0,0 +1,247 @@
+"""
+Сортировки строк str и байтовых строк bytes.
+
+Сортировки сравнением сравнивают строки целиком и при длинных общих
+префиксах много раз повторяют сравнение одних и тех же символов.
+Строковые сортировки просматривают каждый символ префикса один раз:
+    - многоключевая быстрая сортировка (трехпутевое разбиение по d-му
+      символу, Bentley-Sedgewick);
+    - MSD поразрядная сортировка по байтам.
+
+Конец строки считается символом, меньшим любого другого, поэтому
+порядок совпадает с встроенным сравнением строк. Строки str для MSD
+сортировки кодируются в UTF-8: побайтовый порядок UTF-8 совпадает с
+порядком кодовых точек.
+"""
+
+import os
+
+from sorts import supports_key, write_back
+
+# Отрезки короче порога досортировываются вставками
+_STRING_INSERTION_CUTOFF = 16
+# Количество корзин MSD: конец строки и 256 значений байта
+_BYTE_BUCKETS = 257
+
+
+def _insertion_sort_keys(keys, order, lo, hi):
+    """
+    Сортировка вставками keys[lo:hi] (и перестановки order, если она
+    задана). Общий префикс строк отрезка уже совпадает, поэтому
+    сравниваются строки целиком - сравнение строк выполняется на C.
+    """
+    for i in range(lo + 1, hi):
+        key = keys[i]
+        index = order[i] if order is not None else None
+        j = i - 1
+        while j >= lo and key < keys[j]:
+            keys[j + 1] = keys[j]
+            if order is not None:
+                order[j + 1] = order[j]
+            j -= 1
+        keys[j + 1] = key
+        if order is not None:
+            order[j + 1] = index
+
+
+def _common_prefix_length(keys, lo, hi):
+    """
+    Длина общего префикса строк keys[lo:hi]. Она равна общему префиксу
+    наименьшей и наибольшей строк, которые находятся сравнениями на C.
+    Позволяет пропустить совпадающие символы за один шаг вместо
+    прохода по отрезку на каждый символ.
+    """
+    part = keys[lo:hi]
+    return len(os.path.commonprefix([min(part), max(part)]))
+
+
+def _multikey_quicksort_range(keys, order, lo, hi):
+    """
+    Многоключевая быстрая сортировка keys[lo:hi]. Вместо рекурсии
+    используется явный стек (lo, hi, d): глубина по символам равна
+    длине общего префикса и может превышать предел рекурсии.
+    """
+    stack = [(lo, hi, 0)]
+    while stack:
+        lo, hi, d = stack.pop()
+        if hi - lo < _STRING_INSERTION_CUTOFF:
+            _insertion_sort_keys(keys, order, lo, hi)
+            continue
+        d = max(d, _common_prefix_length(keys, lo, hi))
+
+        # Опорный символ - медиана трех; срез дает '' (b'') в конце строки
+        a = keys[lo][d:d + 1]
+        b = keys[(lo + hi) // 2][d:d + 1]
+        c = keys[hi - 1][d:d + 1]
+        if a < b:
+            pivot = b if b < c else (c if a < c else a)
+        else:
+            pivot = a if a < c else (c if b < c else b)
+
+        # Трехпутевое разбиение по d-му символу
+        lt, i, gt = lo, lo, hi - 1
+        while i <= gt:
+            char = keys[i][d:d + 1]
+            if char < pivot:
+                keys[lt], keys[i] = keys[i], keys[lt]
+                if order is not None:
+                    order[lt], order[i] = order[i], order[lt]
+                lt += 1
+                i += 1
+            elif pivot < char:
+                keys[i], keys[gt] = keys[gt], keys[i]
+                if order is not None:
+                    order[i], order[gt] = order[gt], order[i]
+                gt -= 1
+            else:
+                i += 1
+
+        stack.append((lo, lt, d))
+        stack.append((gt + 1, hi, d))
+        # Строки, закончившиеся на позиции d, равны между собой
+        if pivot:
+            stack.append((lt, gt + 1, d + 1))
+
+
+def _msd_string_range(keys, order, lo, hi):
+    """
+    MSD поразрядная сортировка байтовых строк keys[lo:hi] вместе с
+    перестановкой order. Распределение по корзинам устойчиво.
+    """
+    key_buf = [None] * len(keys)
+    order_buf = [0] * len(keys)
+    stack = [(lo, hi, 0)]
+    while stack:
+        lo, hi, d = stack.pop()
+        if hi - lo < _STRING_INSERTION_CUTOFF:
+            _insertion_sort_keys(keys, order, lo, hi)
+            continue
+        d = max(d, _common_prefix_length(keys, lo, hi))
+
+        digits = [key[d] + 1 if d < len(key) else 0
+                  for key in keys[lo:hi]]
+        counts = [0] * (_BYTE_BUCKETS + 1)
+        for digit in digits:
+            counts[digit + 1] += 1
+        for digit in range(_BYTE_BUCKETS):
+            counts[digit + 1] += counts[digit]
+
+        starts = counts[:]
+        for offset, digit in enumerate(digits):
+            pos = lo + starts[digit]
+            starts[digit] += 1
+            key_buf[pos] = keys[lo + offset]
+            order_buf[pos] = order[lo + offset]
+        keys[lo:hi] = key_buf[lo:hi]
+        order[lo:hi] = order_buf[lo:hi]
+
+        # Корзина 0 - строки, закончившиеся на позиции d, уже на месте
+        for digit in range(1, _BYTE_BUCKETS):
+            start, end = lo + counts[digit], lo + counts[digit + 1]
+            if end - start > 1:
+                stack.append((start, end, d + 1))
+
+
+def _order_ties(keys, order, descending):
+    """
+    Упорядочивание индексов order внутри каждой серии равных ключей
+    отсортированного keys (по убыванию при descending).
+    """
+    start = 0
+    for i in range(1, len(keys) + 1):
+        if i == len(keys) or keys[i] != keys[start]:
+            if i - start > 1:
+                order[start:i] = sorted(order[start:i], reverse=descending)
+            start = i
+
+
+def _sort_by_order(sort_keys, arr, keys, reverse, stable=False):
+    """
+    Сортировка arr по строковым ключам: sort_keys упорядочивает ключи
+    вместе с перестановкой индексов, затем элементы переставляются.
+    При reverse вход и результат разворачиваются, поэтому равные ключи
+    сохраняют исходный порядок у устойчивых алгоритмов. Для
+    неустойчивого sort_keys при stable равные ключи после сортировки
+    упорядочиваются по исходному индексу.
+    """
+    n = len(arr)
+    keys = list(keys)
+    order = list(range(n))
+    if reverse:
+        keys.reverse()
+        order.reverse()
+    sort_keys(keys, order)
+    if stable:
+        # После разворота при reverse индексы серии станут возрастающими
+        _order_ties(keys, order, reverse)
+    if reverse:
+        order.reverse()
+    values = list(arr)
+    write_back(arr, [values[i] for i in order])
+    return arr
+
+
+def _multikey_by_key(arr, keys, reverse, stable):
+    return _sort_by_order(
+        lambda keys, order: _multikey_quicksort_range(keys, order, 0,
+                                                      len(keys)),
+        arr, keys, reverse, stable)
+
+
+def _utf8_keys(keys):
+    """Строки str кодируются в UTF-8, байтовые строки не изменяются."""
+    return [key.encode('utf-8', 'surrogatepass') if isinstance(key, str)
+            else key for key in keys]
+
+
+def _msd_by_key(arr, keys, reverse, stable=True):
+    return _sort_by_order(
+        lambda keys, order: _msd_string_range(keys, order, 0, len(keys)),
+        arr, _utf8_keys(keys), reverse)
+
+
+@supports_key(stable=False, by_key=_multikey_by_key)
+def multikey_quicksort(arr):
+    """
+    Многоключевая (трехпутевая поразрядная) быстрая сортировка строк
+
+    Разбиение выполняется по d-му символу на три части: меньше, равно и
+    больше опорного символа; средняя часть сортируется дальше по
+    символу d + 1. Каждый символ общего префикса сравнивается O(1) раз
+    в среднем на строку.
+
+    Временная сложность: O(n log n + D) в среднем, где D - суммарная
+    длина различающих префиксов
+    Пространственная сложность: O(log n + длина строки) для стека
+    Устойчивость: нет (с key и stable=True равные ключи сохраняют
+    исходный порядок)
+    """
+    if len(arr) > 1:
+        _multikey_quicksort_range(arr, None, 0, len(arr))
+    return arr
+
+
+@supports_key(stable=True, by_key=_msd_by_key)
+def msd_string_sort(arr):
+    """
+    MSD поразрядная сортировка строк str и bytes
+
+    Строки распределяются по 257 корзинам (конец строки и значение
+    байта) по d-му байту, затем каждая корзина сортируется по байту
+    d + 1. Короткие корзины досортировываются вставками.
+
+    Временная сложность: O(D + n · 257 / cutoff), где D - суммарная
+    длина различающих префиксов
+    Пространственная сложность: O(n)
+    Устойчивость: да
+    """
+    n = len(arr)
+    if n <= 1:
+        return arr
+
+    keys = _utf8_keys(arr)
+    order = list(range(n))
+    _msd_string_range(keys, order, 0, n)
+    values = list(arr)
+    arr[:] = [values[i] for i in order]
+    return arr
@@ -2,18 +2,134 @@
 Тесты для проверки корректности реализации алгоритмов сортировки.
 """
 
+import math
+import os
+import tempfile
+import tracemalloc
 import unittest
 import random
+from array import array
+
+import numpy as np
+
+from benchmark_runner import load_checkpoint, run_matrix, save_checkpoint
+from external_sort import (
+    CHUNK_ITEM_MEMORY,
+    ITEM_SIZE,
+    TEXT_BLOCK_ITEMS,
+    external_sort,
+    generate_random_file,
+    is_sorted_file,
+    _read_chunks
+)
+from generate_data import (
+    NUMPY_GENERATORS,
+    generate_cached_array,
+    generate_few_unique_array,
+    generate_median_of_three_killer,
+    generate_numpy_array,
+    generate_numpy_data_sets,
+    generate_random_strings,
+    generate_shared_prefix_strings
+)
+from instrumentation import CountingList, OperationCounter, count_operations
+from parallel_sort import parallel_sort
+from performance_test import (
+    COMPARISON_REPEATS,
+    measure_sorting_samples,
+    # Псевдоним: иначе pytest собирает функцию как тест
+    test_all_algorithms as run_all_algorithms
+)
+from regression_check import compare_runs, main, mann_whitney_u
+from results_store import ResultsStore
+from string_sorts import msd_string_sort, multikey_quicksort
 from sorts import (
     bubble_sort,
     selection_sort,
     insertion_sort,
     merge_sort,
+    merge_sort_bottom_up,
     quick_sort,
-    quick_sort_optimized
+    quick_sort_optimized,
+    intro_sort,
+    pdq_sort,
+    pdq_sort_branchless,
+    tim_sort,
+    counting_sort,
+    radix_sort_lsd,
+    radix_sort_msd,
+    integer_sort,
+    nth_element,
+    quickselect,
+    partial_sort,
+    top_k
+)
+from vectorized_sorts import (
+    bitonic_sort_numpy,
+    odd_even_merge_sort_numpy,
+    counting_sort_numpy,
+    radix_sort_numpy
 )
 
 
+class CountingItem:
+    """Элемент, подсчитывающий количество сравнений."""
+
+    comparisons = 0
+
+    def __init__(self, value):
+        self.value = value
+
+    def __lt__(self, other):
+        CountingItem.comparisons += 1
+        return self.value < other.value
+
+
+class StabilityItem:
+    """Элемент, сравниваемый только по значению (индекс - метка)."""
+
+    def __init__(self, value, index):
+        self.value = value
+        self.index = index
+
+    def __lt__(self, other):
+        return self.value < other.value
+
+    def __le__(self, other):
+        return self.value <= other.value
+
+    def __gt__(self, other):
+        return self.value > other.value
+
+    def __eq__(self, other):
+        return self.value == other.value
+
+
+COMPARISON_SORTS = [
+    bubble_sort, selection_sort, insertion_sort, merge_sort,
+    merge_sort_bottom_up, quick_sort, quick_sort_optimized, intro_sort,
+    pdq_sort, pdq_sort_branchless, tim_sort
+]
+INTEGER_SORTS = [
+    counting_sort, radix_sort_lsd, radix_sort_msd, integer_sort,
+    parallel_sort
+]
+ALL_SORTS = COMPARISON_SORTS + INTEGER_SORTS
+VECTORIZED_SORTS = [
+    bitonic_sort_numpy, odd_even_merge_sort_numpy, counting_sort_numpy,
+    radix_sort_numpy
+]
+
+
+def count_comparisons(sort_func, arr):
+    """Количество сравнений, выполненных sort_func на копии arr."""
+    CountingItem.comparisons = 0
+    items = [CountingItem(x) for x in arr]
+    sort_func(items)
+    assert [item.value for item in items] == sorted(arr)
+    return CountingItem.comparisons
+
+
 class TestSortingAlgorithms(unittest.TestCase):
 
     def setUp(self):
@@ -79,10 +195,321 @@ class TestSortingAlgorithms(unittest.TestCase):
                 result = quick_sort_optimized(arr.copy())
                 self.assertEqual(result, expected)
 
+    def test_tim_sort(self):
+        """Тест адаптивной сортировки Timsort."""
+        for arr in self.test_cases:
+            with self.subTest(arr=arr):
+                expected = sorted(arr.copy())
+                result = tim_sort(arr.copy())
+                self.assertEqual(result, expected)
+
+    def test_tim_sort_runs(self):
+        """Тест Timsort на данных с естественными сериями."""
+        ascending = list(range(500))
+        descending = list(range(500, 0, -1))
+        sawtooth = [i % 37 for i in range(2000)]
+        almost = ascending.copy()
+        almost[10], almost[400] = almost[400], almost[10]
+        for arr in [ascending, descending, sawtooth, almost,
+                    ascending + descending]:
+            with self.subTest(size=len(arr)):
+                self.assertEqual(tim_sort(arr.copy()), sorted(arr))
+
+    def test_merge_sort_bottom_up(self):
+        """Тест восходящей сортировки слиянием (2- и k-путевой)."""
+        for ways in [2, 3, 4]:
+            for arr in self.test_cases + [self.large_array]:
+                with self.subTest(ways=ways, size=len(arr)):
+                    expected = sorted(arr.copy())
+                    result = merge_sort_bottom_up(arr.copy(), ways)
+                    self.assertEqual(result, expected)
+
+    def test_merge_sort_bottom_up_invalid_ways(self):
+        """Тест недопустимого количества сливаемых серий."""
+        with self.assertRaises(ValueError):
+            merge_sort_bottom_up([3, 1, 2], ways=1)
+
+    def test_intro_sort(self):
+        """Тест интроспективной сортировки."""
+        few_unique = generate_few_unique_array(1000, unique_count=3)
+        for arr in self.test_cases + [self.large_array, few_unique]:
+            with self.subTest(size=len(arr)):
+                expected = sorted(arr.copy())
+                result = intro_sort(arr.copy())
+                self.assertEqual(result, expected)
+
+    def test_intro_sort_worst_case(self):
+        """
+        Вход-«убийца» медианы трех делает quick_sort_optimized
+        квадратичной, а intro_sort остается в пределах O(n log n),
+        в том числе на входе, построенном против нее самой.
+        """
+        n = 500
+        killer = generate_median_of_three_killer(n)
+        self.assertEqual(sorted(killer), list(range(n)))
+        self.assertGreater(count_comparisons(quick_sort_optimized, killer),
+                           n * n // 8)
+
+        bound = 20 * n * n.bit_length()
+        self.assertLess(count_comparisons(intro_sort, killer), bound)
+        self_killer = generate_median_of_three_killer(n, intro_sort)
+        self.assertLess(count_comparisons(intro_sort, self_killer), bound)
+
+    def test_pdq_sort(self):
+        """Тест pdqsort (классическое и блочное разбиение)."""
+        patterns = [
+            generate_few_unique_array(1000, unique_count=3),
+            list(range(1000)),
+            list(range(1000, 0, -1)),
+            [i % 17 for i in range(1000)],
+            [7] * 300
+        ]
+        for sort_func in [pdq_sort, pdq_sort_branchless]:
+            for arr in self.test_cases + [self.large_array] + patterns:
+                with self.subTest(sort_func=sort_func.__name__,
+                                  size=len(arr)):
+                    expected = sorted(arr.copy())
+                    result = sort_func(arr.copy())
+                    self.assertEqual(result, expected)
+
+    def test_pdq_sort_worst_case(self):
+        """pdqsort остается O(n log n) на входе-«убийце»."""
+        n = 500
+        bound = 20 * n * n.bit_length()
+        for sort_func in [pdq_sort, pdq_sort_branchless]:
+            with self.subTest(sort_func=sort_func.__name__):
+                killer = generate_median_of_three_killer(n, sort_func)
+                self.assertLess(count_comparisons(sort_func, killer), bound)
+
+    def test_integer_sorts(self):
+        """Тест сортировки подсчетом и поразрядных сортировок."""
+        wide_range = [random.randint(-10 ** 12, 10 ** 12)
+                      for _ in range(1000)]
+        for sort_func in [counting_sort, radix_sort_lsd, radix_sort_msd,
+                          integer_sort]:
+            cases = self.test_cases + [self.large_array, [7] * 50]
+            if sort_func is not counting_sort:
+                cases.append(wide_range)
+            for arr in cases:
+                with self.subTest(sort_func=sort_func.__name__,
+                                  size=len(arr)):
+                    expected = sorted(arr.copy())
+                    result = sort_func(arr.copy())
+                    self.assertEqual(result, expected)
+
+    def test_parallel_sort(self):
+        """Тест параллельной сортировки (пул процессов и откат)."""
+        few_unique = generate_few_unique_array(5000, unique_count=3)
+        for workers in [1, 2, 3]:
+            for arr in self.test_cases + [self.large_array, few_unique]:
+                with self.subTest(workers=workers, size=len(arr)):
+                    expected = sorted(arr.copy())
+                    result = parallel_sort(arr.copy(), workers=workers,
+                                           threshold=0)
+                    self.assertEqual(result, expected)
+
+    def test_external_sort(self):
+        """Тест внешней сортировки с многопроходным слиянием."""
+        count = 5000
+        for file_format in ['binary', 'text']:
+            with self.subTest(file_format=file_format), \
+                    tempfile.TemporaryDirectory() as work_dir:
+                input_path = os.path.join(work_dir, 'input')
+                output_path = os.path.join(work_dir, 'output')
+                generate_random_file(input_path, count, file_format,
+                                     min_val=-1000, max_val=1000)
+                expected = sorted(
+                    x for chunk in _read_chunks(input_path, file_format, 1000)
+                    for x in chunk)
+
+                stats = external_sort(input_path, output_path, file_format,
+                                      memory_budget=10000, fan_in=3)
+                self.assertEqual(stats['items'], count)
+                self.assertGreater(stats['merge_passes'], 1)
+                self.assertTrue(is_sorted_file(output_path, file_format))
+                result = [x for chunk in
+                          _read_chunks(output_path, file_format, 1000)
+                          for x in chunk]
+                self.assertEqual(result, expected)
+
+    def test_external_sort_chunk_memory(self):
+        """Пик памяти формирования серий укладывается в оценку."""
+        chunk_items = 20000
+        # Запас на блок np.fromiter (с ростом буфера) и буферы файла
+        budget = (chunk_items * CHUNK_ITEM_MEMORY +
+                  4 * TEXT_BLOCK_ITEMS * ITEM_SIZE)
+        for file_format in ['binary', 'text']:
+            with self.subTest(file_format=file_format), \
+                    tempfile.TemporaryDirectory() as work_dir:
+                input_path = os.path.join(work_dir, 'input')
+                generate_random_file(input_path, 3 * chunk_items,
+                                     file_format)
+                tracemalloc.start()
+                try:
+                    for chunk in _read_chunks(input_path, file_format,
+                                              chunk_items):
+                        chunk.sort()
+                    peak = tracemalloc.get_traced_memory()[1]
+                finally:
+                    tracemalloc.stop()
+                self.assertLessEqual(peak, budget)
+
+    def test_selection(self):
+        """Тест nth_element, quickselect, partial_sort и top_k."""
+        few_unique = generate_few_unique_array(500, unique_count=3)
+        for data in self.test_cases[1:] + [self.large_array, few_unique]:
+            for reverse in [False, True]:
+                expected = sorted(data, reverse=reverse)
+                for k in {0, len(data) // 2, len(data) - 1}:
+                    with self.subTest(size=len(data), k=k, reverse=reverse):
+                        arr = nth_element(data.copy(), k, reverse=reverse)
+                        self.assertEqual(arr[k], expected[k])
+                        self.assertEqual(sorted(arr[:k], reverse=reverse),
+                                         expected[:k])
+                        self.assertEqual(
+                            quickselect(data.copy(), k, reverse=reverse),
+                            expected[k])
+
+                for k in [0, 1, len(data) // 3, len(data), len(data) + 1]:
+                    with self.subTest(size=len(data), k=k, reverse=reverse):
+                        arr = partial_sort(data.copy(), k, reverse=reverse)
+                        self.assertEqual(arr[:k], expected[:k])
+                        self.assertEqual(sorted(arr), sorted(data))
+                        self.assertEqual(
+                            top_k(iter(data), k, reverse=reverse),
+                            expected[:k])
+
+        records = [(random.randint(0, 5), i) for i in range(100)]
+        self.assertEqual(top_k(records, 10, key=lambda r: r[0]),
+                         sorted(records, key=lambda r: r[0])[:10])
+        with self.assertRaises(IndexError):
+            nth_element([1, 2, 3], 3)
+
+    def test_selection_worst_case(self):
+        """nth_element линеен на входе-антагонисте для медианы трех."""
+        size = 2000
+        data = generate_median_of_three_killer(
+            size, lambda arr: nth_element(arr, len(arr) // 2))
+        CountingItem.comparisons = 0
+        items = nth_element([CountingItem(x) for x in data], size // 2)
+        self.assertEqual(items[size // 2].value, sorted(data)[size // 2])
+        self.assertLess(CountingItem.comparisons, 20 * size)
+
+    def test_array_inputs(self):
+        """Сортировка array.array и массивов NumPy на месте."""
+        makers = {
+            'array': lambda data: array('q', data),
+            'numpy': lambda data: np.array(data, dtype=np.int64),
+        }
+        for sort_func in ALL_SORTS + VECTORIZED_SORTS:
+            for name, make in makers.items():
+                for data in self.test_cases + [self.large_array]:
+                    with self.subTest(sort_func=sort_func.__name__,
+                                      container=name, size=len(data)):
+                        arr = make(data)
+                        result = sort_func(arr)
+                        self.assertIs(result, arr)
+                        self.assertEqual(list(arr), sorted(data))
+
+                with self.subTest(sort_func=sort_func.__name__,
+                                  container=name, reverse=True):
+                    if sort_func in (bitonic_sort_numpy,
+                                     odd_even_merge_sort_numpy):
+                        continue
+                    arr = make(self.large_array)
+                    sort_func(arr, key=lambda x: x % 10, reverse=True)
+                    self.assertEqual(list(arr), sorted(
+                        self.large_array, key=lambda x: x % 10,
+                        reverse=True))
+
+    def test_vectorized_sorts(self):
+        """Тест векторизованных сортировок на NumPy."""
+        for sort_func in VECTORIZED_SORTS:
+            for data in self.test_cases + [self.large_array]:
+                with self.subTest(sort_func=sort_func.__name__,
+                                  size=len(data)):
+                    self.assertEqual(sort_func(list(data)), sorted(data))
+
+        extremes = [random.choice([-2 ** 63, 2 ** 63 - 1, 0, -1])
+                    for _ in range(100)]
+        arr = np.array(extremes, dtype=np.int64)
+        radix_sort_numpy(arr)
+        self.assertEqual(arr.tolist(), sorted(extremes))
+
+        # Пакет строк сортируется сетью построчно
+        for sort_func in [bitonic_sort_numpy, odd_even_merge_sort_numpy]:
+            for width in [5, 16]:
+                with self.subTest(sort_func=sort_func.__name__, width=width):
+                    batch = np.random.rand(50, width)
+                    expected = np.sort(batch, axis=1)
+                    sort_func(batch)
+                    self.assertTrue(np.array_equal(batch, expected))
+
+    def test_key_and_reverse(self):
+        """Тест аргументов key и reverse для всех сортировок."""
+        records = [(random.randint(-5, 5), i) for i in range(200)]
+        for sort_func in ALL_SORTS:
+            for reverse in [False, True]:
+                with self.subTest(sort_func=sort_func.__name__,
+                                  reverse=reverse):
+                    result = sort_func(records.copy(),
+                                       key=lambda r: r[0], reverse=reverse)
+                    expected = sorted(records, key=lambda r: r[0],
+                                      reverse=reverse)
+                    self.assertEqual(result, expected)
+
+                    numbers = [r[0] for r in records]
+                    self.assertEqual(sort_func(numbers, reverse=reverse),
+                                     sorted(numbers, reverse=reverse))
+
+    def test_key_computed_once(self):
+        """Ключ вычисляется ровно один раз для каждого элемента."""
+        calls = []
+
+        def key(x):
+            calls.append(x)
+            return -x
+
+        for sort_func in ALL_SORTS:
+            with self.subTest(sort_func=sort_func.__name__):
+                calls.clear()
+                result = sort_func(self.large_array.copy(), key=key)
+                self.assertEqual(result, sorted(self.large_array,
+                                                reverse=True))
+                self.assertEqual(len(calls), len(self.large_array))
+
+    def test_stable_flag(self):
+        """stable=True делает устойчивыми все сортировки сравнением."""
+        items = [StabilityItem(random.randint(0, 5), i) for i in range(300)]
+        expected = sorted(items, key=lambda item: item.value)
+        for sort_func in COMPARISON_SORTS:
+            for reverse in [False, True]:
+                with self.subTest(sort_func=sort_func.__name__,
+                                  reverse=reverse):
+                    result = sort_func(items.copy(), stable=True,
+                                       reverse=reverse)
+                    if reverse:
+                        expected_order = sorted(items,
+                                                key=lambda item: item.value,
+                                                reverse=True)
+                    else:
+                        expected_order = expected
+                    self.assertEqual([item.index for item in result],
+                                     [item.index for item in expected_order])
+            if sort_func.is_stable:
+                with self.subTest(sort_func=sort_func.__name__,
+                                  native=True):
+                    result = sort_func(items.copy())
+                    self.assertEqual([item.index for item in result],
+                                     [item.index for item in expected])
+
     def test_large_array(self):
         """Тест на большом массиве."""
         for sort_func in [bubble_sort, selection_sort, insertion_sort,
-                          merge_sort, quick_sort, quick_sort_optimized]:
+                          merge_sort, merge_sort_bottom_up, quick_sort,
+                          quick_sort_optimized, intro_sort, pdq_sort,
+                          pdq_sort_branchless, tim_sort, counting_sort,
+                          radix_sort_lsd, radix_sort_msd, integer_sort]:
             with self.subTest(sort_func=sort_func.__name__):
                 arr_copy = self.large_array.copy()
                 result = sort_func(arr_copy)
@@ -129,6 +556,285 @@ class TestSortingAlgorithms(unittest.TestCase):
         self.assertTrue(check_stability(result, test_arr),
                         "Insertion Sort должен быть устойчивым")
 
+        # Timsort устойчив
+        arr_copy = test_arr.copy()
+        result = tim_sort(arr_copy)
+        self.assertTrue(check_stability(result, test_arr),
+                        "Tim Sort должен быть устойчивым")
+
+    def test_benchmark_runner(self):
+        """Параллельный прогон матрицы с таймаутом и возобновлением."""
+        sizes = [50, 3000]
+        data_sets = {'random': {size: random.sample(range(10 ** 6), size)
+                                for size in sizes}}
+        algorithms = {'Tim Sort': tim_sort, 'Bubble Sort': bubble_sort}
+        with tempfile.TemporaryDirectory() as work_dir:
+            filename = os.path.join(work_dir, 'results.csv')
+            # Готовая ячейка из прошлого запуска не пересчитывается
+            save_checkpoint({'Tim Sort': {'random': {50: 123.0}}},
+                            algorithms, ['random'], sizes, filename)
+            self.assertNotIn(3000, load_checkpoint(filename)['Tim Sort']
+                             ['random'])
+
+            store = ResultsStore(os.path.join(work_dir, 'store'))
+            results = run_matrix(data_sets, sizes, algorithms, filename,
+                                 workers=2, timeout=0.2, store=store)
+            self.assertEqual(results['Tim Sort']['random'][50], 123.0)
+            self.assertGreater(results['Tim Sort']['random'][3000], 0)
+            self.assertTrue(math.isnan(results['Bubble Sort']['random'][3000]))
+            checkpoint = load_checkpoint(filename)
+            for algo_name in algorithms:
+                self.assertEqual(set(checkpoint[algo_name]['random']),
+                                 set(sizes))
+
+            # В хранилище - выборки замеренных ячеек и NaN для прерванных
+            stored = store.samples()
+            self.assertEqual(len(stored['Tim Sort']['random'][3000]), 3)
+            self.assertNotIn(50, stored['Tim Sort']['random'])
+            self.assertTrue(np.isnan(stored['Bubble Sort']['random'][3000])
+                            .all())
+
+    def test_results_store(self):
+        """Запуски добавляются в хранилище и читаются без пересчета."""
+        samples = {
+            'Tim Sort': {'random': {100: ([0.3, 0.1, 0.2], 0.01)},
+                         'sorted': {100: ([0.05], 0.01)}},
+            'Pdq Sort': {'random': {100: ([0.4, 0.6], 0.02),
+                                    500: ([1.0], 0.02)}},
+        }
+        with tempfile.TemporaryDirectory() as work_dir:
+            store = ResultsStore(os.path.join(work_dir, 'store'))
+            self.assertIsNone(store.latest_run_id())
+            first = store.append_run(samples)
+            second = store.append_run({'Tim Sort': {'random': {100: (
+                [0.7], 0.01)}}}, metadata={'note': 'повтор'})
+
+            runs = store.runs()
+            self.assertEqual([run['run_id'] for run in runs],
+                             [first, second])
+            self.assertEqual(runs[1]['note'], 'повтор')
+            for field in ['python', 'machine', 'git_revision', 'started']:
+                self.assertIn(field, runs[0])
+
+            self.assertEqual(store.median_results(first), {
+                'Tim Sort': {'random': {100: 0.2}, 'sorted': {100: 0.05}},
+                'Pdq Sort': {'random': {100: 0.5, 500: 1.0}},
+            })
+            self.assertEqual(store.median_results(),
+                             {'Tim Sort': {'random': {100: 0.7}}})
+            rows = store.query(first, algorithm='Pdq Sort', size=100)
+            self.assertEqual(list(rows['time']), [0.4, 0.6])
+            self.assertEqual(list(rows['data_type']), ['random', 'random'])
+
+            csv_path = os.path.join(work_dir, 'samples.csv')
+            store.export_csv(csv_path)
+            with open(csv_path, encoding='utf-8') as f:
+                self.assertEqual(len(f.readlines()), 1 + 7 + 1)
+
+    def test_regression_check(self):
+        """Значимые регрессии находятся, шум и одиночные замеры - нет."""
+        _, p_value = mann_whitney_u([1, 2, 3, 4, 5], [6, 7, 8, 9, 10])
+        self.assertAlmostEqual(p_value, 2 / 252)
+
+        baseline = {'Tim Sort': {'random': {
+            1000: ([1.0, 1.1, 0.9, 1.05, 0.95], 0.0),
+            5000: ([2.0, 2.1, 1.9, 2.05, 1.95], 0.0),
+            10000: ([5.0], 0.0),
+            20000: ([8.0, 8.1, 7.9, 8.05, 7.95], 0.0)}}}
+        candidate = {'Tim Sort': {'random': {
+            1000: ([1.5, 1.6, 1.4, 1.55, 1.45], 0.0),
+            5000: ([2.1, 1.9, 2.0, 1.95, 2.05], 0.0),
+            10000: ([9.0], 0.0),
+            20000: ([float('nan')], float('nan'))}}}
+        with tempfile.TemporaryDirectory() as work_dir:
+            store_dir = os.path.join(work_dir, 'store')
+            store = ResultsStore(store_dir)
+            old = store.append_run(baseline)
+            new = store.append_run(candidate)
+
+            verdicts = {row['size']: row['verdict']
+                        for row in compare_runs(store)}
+            self.assertEqual(verdicts, {1000: 'regression',
+                                        5000: 'unchanged',
+                                        10000: 'insufficient',
+                                        20000: 'failed'})
+            self.assertEqual(main([old, new, '--store', store_dir]), 1)
+            self.assertEqual(main([new, old, '--store', store_dir]), 0)
+            self.assertEqual(main(['--store', store_dir,
+                                   '--threshold', '0.6']), 0)
+
+    def test_regression_check_large_size(self):
+        """Замедление в 2 раза при большом n находится по реальным замерам."""
+        size = 20000
+        data_sets = {'random': {size: random.sample(range(10 ** 6), size)}}
+
+        def twice_slower(arr):
+            merge_sort(list(arr))
+            return merge_sort(arr)
+
+        with tempfile.TemporaryDirectory() as work_dir:
+            store = ResultsStore(os.path.join(work_dir, 'store'))
+            for sort_func in (merge_sort, twice_slower):
+                samples = {}
+                run_all_algorithms(data_sets, [size],
+                                   {'Merge Sort': sort_func}, samples,
+                                   repeats=COMPARISON_REPEATS)
+                store.append_run(samples)
+
+            rows = store.query(size=size)
+            self.assertEqual(len(rows['time']), COMPARISON_REPEATS)
+            (row,) = compare_runs(store)
+            self.assertEqual(row['verdict'], 'regression')
+            self.assertGreater(row['change'], 0.5)
+
+    def test_numpy_generators(self):
+        """Векторизованные генераторы воспроизводимы и кешируются."""
+        for data_type in NUMPY_GENERATORS:
+            with self.subTest(data_type=data_type):
+                arr = generate_numpy_array(data_type, 500, seed=7)
+                self.assertEqual(arr.dtype, np.int64)
+                self.assertEqual(len(arr), 500)
+                self.assertTrue(np.array_equal(
+                    arr, generate_numpy_array(data_type, 500, seed=7)))
+
+        self.assertFalse(np.array_equal(
+            generate_numpy_array('random', 500, seed=1),
+            generate_numpy_array('random', 500, seed=2)))
+        self.assertTrue(np.all(np.diff(
+            generate_numpy_array('sorted', 500)) >= 0))
+        self.assertTrue(np.all(np.diff(
+            generate_numpy_array('reversed', 500)) <= 0))
+        self.assertLessEqual(len(np.unique(
+            generate_numpy_array('few_unique', 500))), 10)
+        almost = generate_numpy_array('almost_sorted', 500)
+        descents = np.count_nonzero(np.diff(almost) < 0)
+        self.assertTrue(0 < descents <= 2 * 25)
+
+        with tempfile.TemporaryDirectory() as work_dir:
+            first = generate_cached_array('zipf', 1000, 3, work_dir)
+            self.assertEqual(len(os.listdir(work_dir)), 1)
+            cached = generate_cached_array('zipf', 1000, 3, work_dir)
+            self.assertIsInstance(cached, np.memmap)
+            self.assertTrue(np.array_equal(first, cached))
+
+            data_sets = generate_numpy_data_sets(
+                [10, 100], ['random', 'sawtooth'], cache_dir=work_dir,
+                as_list=True)
+            self.assertEqual(data_sets['sawtooth'][100],
+                             generate_numpy_array('sawtooth', 100).tolist())
+            del first, cached
+
+    def test_count_operations(self):
+        """Подсчет сравнений, записей и выделений для сортировок."""
+        data = self.large_array.copy()
+        for sort_func in COMPARISON_SORTS:
+            with self.subTest(sort_func=sort_func.__name__):
+                counts = count_operations(sort_func, data, memory=False)
+                self.assertGreater(counts['comparisons'], 0)
+                self.assertGreater(counts['writes'], 0)
+                self.assertIsNone(counts['peak_bytes'])
+        self.assertEqual(data, self.large_array)
+
+        n = len(data)
+        self.assertEqual(count_operations(tim_sort, data)['comparisons'],
+                         count_comparisons(tim_sort, data))
+        self.assertLessEqual(count_operations(selection_sort, data)['writes'],
+                             2 * n)
+        self.assertEqual(
+            count_operations(insertion_sort, sorted(data))['comparisons'],
+            n - 1)
+        self.assertGreaterEqual(count_operations(merge_sort, data)[
+            'allocated'], n)
+
+        counts = count_operations(radix_sort_lsd, data)
+        self.assertEqual(counts['comparisons'], 0)
+        self.assertGreater(counts['peak_bytes'], 0)
+        # Буферы src и dst
+        self.assertGreaterEqual(counts['allocated'], 2 * n)
+
+        # Каждый из 6 проходов слияния (серии от 16 до 1024) записывает
+        # все n элементов в буфер или обратно
+        counts = count_operations(merge_sort_bottom_up, data, memory=False)
+        self.assertGreaterEqual(counts['writes'], 6 * n)
+        self.assertGreaterEqual(counts['allocated'], n)
+        counts = count_operations(counting_sort, data, memory=False)
+        self.assertGreaterEqual(counts['allocated'],
+                                max(data) - min(data) + 1)
+
+        with self.assertRaises(AssertionError):
+            count_operations(lambda arr: arr, [3, 1, 2])
+
+        # Копирование среза: 5 чтений источника и 5 записей
+        counter = OperationCounter()
+        a = CountingList(range(10), counter)
+        b = CountingList(range(10), counter)
+        a[0:5] = b[0:5]
+        self.assertEqual((counter.reads, counter.writes), (5, 5))
+
+    def test_string_sorts(self):
+        """Многоключевая быстрая и MSD сортировки строк."""
+        cases = [
+            [],
+            ['a'],
+            ['b', '', 'a', 'ab', '', 'abc', 'ab', 'b'],
+            generate_random_strings(300),
+            generate_shared_prefix_strings(300, prefix_count=3),
+            generate_shared_prefix_strings(300, as_bytes=True),
+            [bytes([random.randint(0, 255)
+                    for _ in range(random.randint(0, 6))])
+             for _ in range(300)],
+            [''.join(random.choice('aяé\u4e2d\U0001f600')
+                     for _ in range(random.randint(0, 5)))
+             for _ in range(300)],
+        ]
+        for sort_func in (multikey_quicksort, msd_string_sort):
+            for data in cases:
+                with self.subTest(sort_func=sort_func.__name__, n=len(data)):
+                    self.assertEqual(sort_func(data.copy()), sorted(data))
+                    self.assertEqual(sort_func(data.copy(), reverse=True),
+                                     sorted(data, reverse=True))
+
+            words = generate_random_strings(200)
+            self.assertEqual(sort_func(words.copy(), key=str.lower),
+                             sorted(words, key=str.lower))
+
+        # Устойчивость MSD: пары (строка, исходный индекс)
+        records = [(random.choice(['ab', 'a', 'abc', '']), i)
+                   for i in range(200)]
+        for reverse in (False, True):
+            self.assertEqual(
+                msd_string_sort(records.copy(), key=lambda r: r[0],
+                                reverse=reverse),
+                sorted(records, key=lambda r: r[0], reverse=reverse))
+
+        # Многоключевая сортировка неустойчива, но с stable=True равные
+        # ключи сохраняют исходный порядок
+        words = generate_random_strings(200)
+        for reverse in (False, True):
+            self.assertEqual(
+                multikey_quicksort(words.copy(), key=lambda w: w[:2],
+                                   reverse=reverse, stable=True),
+                sorted(words, key=lambda w: w[:2], reverse=reverse))
+            self.assertEqual(
+                multikey_quicksort(records.copy(), key=lambda r: r[0],
+                                   reverse=reverse, stable=True),
+                sorted(records, key=lambda r: r[0], reverse=reverse))
+
+        strings = generate_shared_prefix_strings(50, prefix_count=2,
+                                                 prefix_length=5)
+        self.assertEqual(len(strings), 50)
+        self.assertLessEqual(len({s[:5] for s in strings}), 2)
+
+    def test_measure_sorting_samples(self):
+        """Замер не изменяет входной массив и дает выборку на запуск."""
+        for arr in [self.large_array.copy(), np.array(self.large_array)]:
+            original = list(arr)
+            samples, copy_time = measure_sorting_samples(tim_sort, arr, 3)
+            self.assertEqual(len(samples), 3)
+            self.assertTrue(all(sample > 0 for sample in samples))
+            self.assertGreaterEqual(copy_time, 0)
+            self.assertEqual(list(arr), original)
+
 
 if __name__ == '__main__':
     unittest.main(verbosity=2)
@@ -0,0 +1,228 @@
+"""
+Векторизованные сортировки на NumPy.
+
+Сортирующие сети (битоническая и четно-нечетная сеть Бэтчера)
+выполняют фиксированную последовательность сравнений, не зависящую от
+данных. Сравнения одного слоя попарно независимы, поэтому слой
+выполняется одной парой операций np.minimum / np.maximum над всеми
+элементами сразу. Сети подходят для массивов небольшого фиксированного
+размера и особенно для пакетов таких массивов: двумерный массив
+сортируется построчно за то же число слоев.
+
+Целочисленные сортировки (подсчетом и поразрядная) используют
+np.bincount вместо цикла по элементам.
+"""
+
+import numpy as np
+
+from sorts import supports_key, write_back
+
+# Кеш слоев сортирующих сетей: (вид сети, размер) -> [(lo, hi), ...]
+_NETWORK_CACHE = {}
+
+
+def _bitonic_comparators(size):
+    """Компараторы битонической сети для size = 2^k по слоям."""
+    layers = []
+    block = 2
+    while block <= size:
+        step = block // 2
+        while step > 0:
+            lo, hi = [], []
+            for i in range(size):
+                j = i ^ step
+                if j > i:
+                    # В блоках с четным номером - по возрастанию
+                    if i & block == 0:
+                        lo.append(i)
+                        hi.append(j)
+                    else:
+                        lo.append(j)
+                        hi.append(i)
+            layers.append((lo, hi))
+            step //= 2
+        block *= 2
+    return layers
+
+
+def _odd_even_merge(lo, hi, r):
+    """Компараторы слияния Бэтчера для отрезка [lo, hi] с шагом r."""
+    step = r * 2
+    if step < hi - lo:
+        yield from _odd_even_merge(lo, hi, step)
+        yield from _odd_even_merge(lo + r, hi, step)
+        for i in range(lo + r, hi - r, step):
+            yield i, i + r
+    else:
+        yield lo, lo + r
+
+
+def _odd_even_merge_sort(lo, hi):
+    """Компараторы четно-нечетной сортировки слиянием отрезка [lo, hi]."""
+    if hi - lo >= 1:
+        mid = lo + (hi - lo) // 2
+        yield from _odd_even_merge_sort(lo, mid)
+        yield from _odd_even_merge_sort(mid + 1, hi)
+        yield from _odd_even_merge(lo, hi, 1)
+
+
+def _odd_even_comparators(size):
+    """
+    Компараторы сети Бэтчера, сгруппированные в слои: компаратор
+    попадает в первый слой после последних слоев обоих его входов.
+    """
+    depth = [0] * size
+    layers = []
+    for i, j in _odd_even_merge_sort(0, size - 1):
+        layer = max(depth[i], depth[j])
+        if layer == len(layers):
+            layers.append(([], []))
+        layers[layer][0].append(i)
+        layers[layer][1].append(j)
+        depth[i] = depth[j] = layer + 1
+    return layers
+
+
+_NETWORKS = {
+    'bitonic': _bitonic_comparators,
+    'odd_even': _odd_even_comparators,
+}
+
+
+def _network_layers(kind, size):
+    """Слои сети в виде пар массивов индексов (с кешированием)."""
+    if (kind, size) not in _NETWORK_CACHE:
+        _NETWORK_CACHE[kind, size] = [
+            (np.array(lo, dtype=np.intp), np.array(hi, dtype=np.intp))
+            for lo, hi in _NETWORKS[kind](size)
+        ]
+    return _NETWORK_CACHE[kind, size]
+
+
+def _padding_value(dtype):
+    """Значение-заполнитель, которое окажется в конце после сортировки."""
+    if np.issubdtype(dtype, np.integer):
+        return np.iinfo(dtype).max
+    return np.inf
+
+
+def _network_sort(arr, kind):
+    """
+    Сортировка сетью: одномерный массив целиком, двумерный - построчно.
+    Длина дополняется до степени двойки максимальным значением типа.
+    """
+    data = arr if isinstance(arr, np.ndarray) else np.array(arr)
+    if data.ndim not in (1, 2):
+        raise ValueError(
+            "Поддерживаются только одномерные и двумерные массивы")
+    n = data.shape[-1]
+    if n <= 1:
+        return arr
+
+    size = 1 << (n - 1).bit_length()
+    if size == n:
+        work = data
+    else:
+        pad = np.full(data.shape[:-1] + (size - n,),
+                      _padding_value(data.dtype), dtype=data.dtype)
+        work = np.concatenate([data, pad], axis=-1)
+
+    for lo, hi in _network_layers(kind, size):
+        a = work[..., lo]
+        b = work[..., hi]
+        work[..., lo] = np.minimum(a, b)
+        work[..., hi] = np.maximum(a, b)
+
+    if work is not data:
+        data[...] = work[..., :n]
+    if data is not arr:
+        write_back(arr, data)
+    return arr
+
+
+def bitonic_sort_numpy(arr):
+    """
+    Битоническая сортирующая сеть на NumPy
+
+    Args:
+        arr: массив NumPy (одномерный или двумерный - сортируется
+            построчно), список или array.array чисел без NaN;
+            сортируется на месте
+
+    Временная сложность: O(n log² n) сравнений за O(log² n) слоев
+    Пространственная сложность: O(n)
+    Устойчивость: нет (сортируются только числа)
+    """
+    return _network_sort(arr, 'bitonic')
+
+
+def odd_even_merge_sort_numpy(arr):
+    """
+    Четно-нечетная сортирующая сеть Бэтчера на NumPy
+
+    Использует меньше компараторов, чем битоническая сеть, при той же
+    глубине O(log² n).
+
+    Временная сложность: O(n log² n) сравнений за O(log² n) слоев
+    Пространственная сложность: O(n)
+    Устойчивость: нет (сортируются только числа)
+    """
+    return _network_sort(arr, 'odd_even')
+
+
+@supports_key(stable=True, integer=True)
+def counting_sort_numpy(arr):
+    """
+    Сортировка подсчетом через np.bincount и np.repeat
+
+    Временная сложность: O(n + k), где k - диапазон значений
+    Пространственная сложность: O(n + k)
+    Устойчивость: да
+    """
+    n = len(arr)
+    if n <= 1:
+        return arr
+
+    values = np.asarray(arr, dtype=np.int64)
+    min_val = int(values.min())
+    counts = np.bincount(values - min_val)
+    write_back(arr, np.repeat(
+        np.arange(min_val, min_val + len(counts), dtype=np.int64), counts))
+    return arr
+
+
+@supports_key(stable=True, integer=True)
+def radix_sort_numpy(arr):
+    """
+    LSD поразрядная сортировка int64 на NumPy по байтам
+
+    На каждом проходе np.bincount подсчитывает байты разряда; проход
+    пропускается, если все элементы попали в одну корзину. Перестановка
+    строится устойчивой сортировкой uint8 (в NumPy это сортировка
+    подсчетом за O(n)).
+
+    Временная сложность: O(d · n), d - число значащих байтов
+    Пространственная сложность: O(n)
+    Устойчивость: да
+    """
+    n = len(arr)
+    if n <= 1:
+        return arr
+
+    values = np.array(arr, dtype=np.int64)
+    min_val = int(values.min())
+    span = int(values.max()) - min_val
+    # Сдвиг на минимум по модулю 2^64: ключи неотрицательны и в uint64
+    keys = values.astype(np.uint64) - np.uint64(min_val % 2 ** 64)
+
+    for shift in range(0, span.bit_length(), 8):
+        digits = ((keys >> np.uint64(shift)) &
+                  np.uint64(0xFF)).astype(np.uint8)
+        if np.count_nonzero(np.bincount(digits, minlength=256)) == 1:
+            continue
+        order = np.argsort(digits, kind='stable')
+        keys = keys[order]
+        values = values[order]
+
+    write_back(arr, values)
+    return arr
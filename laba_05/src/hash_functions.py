@@ -1,13 +1,59 @@
 """
 Реализация хеш-функций для строковых ключей.
+
+Ключи - строки str или байтовые последовательности (bytes, bytearray,
+memoryview). Функции simple_hash, polynomial_hash, djb2_hash и fnv_hash
+работают с кодами символов строки (для байтов - со значениями байтов).
+64-битные функции fnv1a_64_hash, xxh64_hash и siphash24_hash работают с
+байтами, строки кодируются в UTF-8.
+
+batch_hash вычисляет хеши списка ключей векторно на NumPy: ключи
+укладываются в матрицу кодов, и каждый шаг алгоритма выполняется сразу
+для всех ключей (для xxh64 и SipHash - для всех ключей одной длины).
 """
 
+import os
+
+import numpy as np
+
+HASH_RANGE_64 = 2 ** 64
+_MASK_64 = HASH_RANGE_64 - 1
+
+# Константы FNV-1a 64
+_FNV64_OFFSET_BASIS = 0xCBF29CE484222325
+_FNV64_PRIME = 0x100000001B3
+
+# Константы XXH64
+_XXH_PRIME_1 = 0x9E3779B185EBCA87
+_XXH_PRIME_2 = 0xC2B2AE3D27D4EB4F
+_XXH_PRIME_3 = 0x165667B19E3779F9
+_XXH_PRIME_4 = 0x85EBCA77C2B2AE63
+_XXH_PRIME_5 = 0x27D4EB2F165667C5
+
+# Секретный ключ SipHash по умолчанию: новый при каждом запуске, поэтому
+# подобрать заранее множество коллизий нельзя
+SIPHASH_KEY = os.urandom(16)
+
+
+def _codes(key):
+    """Коды символов строки или значения байтов."""
+    if isinstance(key, str):
+        return map(ord, key)
+    return memoryview(key).cast('B')
+
+
+def _as_bytes(key):
+    """Байтовое представление ключа (строки - в UTF-8)."""
+    if isinstance(key, str):
+        return key.encode('utf-8', 'surrogatepass')
+    return bytes(memoryview(key).cast('B'))
+
 
 def simple_hash(key, table_size):
     """Простая хеш-функция: сумма кодов символов."""
     if not key:
         return 0
-    return sum(ord(char) for char in key) % table_size
+    return sum(_codes(key)) % table_size
 
 
 def polynomial_hash(key, table_size, base=31):
@@ -15,8 +61,8 @@ def polynomial_hash(key, table_size, base=31):
     if not key:
         return 0
     hash_value = 0
-    for char in key:
-        hash_value = (hash_value * base + ord(char)) % table_size
+    for code in _codes(key):
+        hash_value = (hash_value * base + code) % table_size
     return hash_value
 
 
@@ -25,8 +71,8 @@ def djb2_hash(key, table_size):
     if not key:
         return 0
     hash_value = 5381
-    for char in key:
-        hash_value = ((hash_value << 5) + hash_value) + ord(char)
+    for code in _codes(key):
+        hash_value = ((hash_value << 5) + hash_value) + code
     return hash_value % table_size
 
 
@@ -37,12 +83,389 @@ def fnv_hash(key, table_size):
     FNV_OFFSET_BASIS = 2166136261
     FNV_PRIME = 16777619
     hash_value = FNV_OFFSET_BASIS
-    for char in key:
-        hash_value = hash_value ^ ord(char)
+    for code in _codes(key):
+        hash_value = hash_value ^ code
         hash_value = (hash_value * FNV_PRIME) % (2 ** 32)
     return hash_value % table_size
 
 
+def fnv1a_64_hash(key, table_size=HASH_RANGE_64):
+    """Хеш-функция FNV-1a, 64 бита."""
+    hash_value = _FNV64_OFFSET_BASIS
+    for byte in _as_bytes(key):
+        hash_value = ((hash_value ^ byte) * _FNV64_PRIME) & _MASK_64
+    return hash_value % table_size
+
+
+def _rotl64(value, shift):
+    return ((value << shift) | (value >> (64 - shift))) & _MASK_64
+
+
+def _xxh_round(acc, lane):
+    acc = (acc + lane * _XXH_PRIME_2) & _MASK_64
+    return (_rotl64(acc, 31) * _XXH_PRIME_1) & _MASK_64
+
+
+def _xxh_merge(acc, value):
+    acc ^= _xxh_round(0, value)
+    return (acc * _XXH_PRIME_1 + _XXH_PRIME_4) & _MASK_64
+
+
+def _xxh_avalanche(hash_value):
+    hash_value ^= hash_value >> 33
+    hash_value = (hash_value * _XXH_PRIME_2) & _MASK_64
+    hash_value ^= hash_value >> 29
+    hash_value = (hash_value * _XXH_PRIME_3) & _MASK_64
+    return hash_value ^ (hash_value >> 32)
+
+
+def xxh64_hash(key, table_size=HASH_RANGE_64, seed=0):
+    """
+    Хеш-функция XXH64: четыре независимых аккумулятора обрабатывают
+    блоки по 32 байта, хвост добавляется по 8, 4 и 1 байту, результат
+    перемешивается (avalanche).
+    """
+    data = _as_bytes(key)
+    length = len(data)
+    pos = 0
+    if length >= 32:
+        acc = [(seed + _XXH_PRIME_1 + _XXH_PRIME_2) & _MASK_64,
+               (seed + _XXH_PRIME_2) & _MASK_64,
+               seed & _MASK_64,
+               (seed - _XXH_PRIME_1) & _MASK_64]
+        while pos + 32 <= length:
+            for lane in range(4):
+                acc[lane] = _xxh_round(acc[lane], int.from_bytes(
+                    data[pos + 8 * lane:pos + 8 * lane + 8], 'little'))
+            pos += 32
+        hash_value = (_rotl64(acc[0], 1) + _rotl64(acc[1], 7) +
+                      _rotl64(acc[2], 12) + _rotl64(acc[3], 18)) & _MASK_64
+        for value in acc:
+            hash_value = _xxh_merge(hash_value, value)
+    else:
+        hash_value = (seed + _XXH_PRIME_5) & _MASK_64
+
+    hash_value = (hash_value + length) & _MASK_64
+    while pos + 8 <= length:
+        hash_value ^= _xxh_round(
+            0, int.from_bytes(data[pos:pos + 8], 'little'))
+        hash_value = (_rotl64(hash_value, 27) * _XXH_PRIME_1 +
+                      _XXH_PRIME_4) & _MASK_64
+        pos += 8
+    if pos + 4 <= length:
+        hash_value ^= (int.from_bytes(data[pos:pos + 4], 'little') *
+                       _XXH_PRIME_1) & _MASK_64
+        hash_value = (_rotl64(hash_value, 23) * _XXH_PRIME_2 +
+                      _XXH_PRIME_3) & _MASK_64
+        pos += 4
+    while pos < length:
+        hash_value ^= (data[pos] * _XXH_PRIME_5) & _MASK_64
+        hash_value = (_rotl64(hash_value, 11) * _XXH_PRIME_1) & _MASK_64
+        pos += 1
+    return _xxh_avalanche(hash_value) % table_size
+
+
+def _sip_round(v0, v1, v2, v3):
+    v0 = (v0 + v1) & _MASK_64
+    v1 = _rotl64(v1, 13) ^ v0
+    v0 = _rotl64(v0, 32)
+    v2 = (v2 + v3) & _MASK_64
+    v3 = _rotl64(v3, 16) ^ v2
+    v0 = (v0 + v3) & _MASK_64
+    v3 = _rotl64(v3, 21) ^ v0
+    v2 = (v2 + v1) & _MASK_64
+    v1 = _rotl64(v1, 17) ^ v2
+    v2 = _rotl64(v2, 32)
+    return v0, v1, v2, v3
+
+
+def siphash24_hash(key, table_size=HASH_RANGE_64, secret=None):
+    """
+    Хеш-функция SipHash-2-4 с 128-битным секретным ключом. Без знания
+    ключа нельзя подобрать множество ключей с одинаковым хешем, поэтому
+    таблица с SipHash устойчива к атакам на переполнение корзин (DoS).
+    """
+    secret = SIPHASH_KEY if secret is None else secret
+    k0 = int.from_bytes(secret[:8], 'little')
+    k1 = int.from_bytes(secret[8:16], 'little')
+    v0 = k0 ^ 0x736F6D6570736575
+    v1 = k1 ^ 0x646F72616E646F6D
+    v2 = k0 ^ 0x6C7967656E657261
+    v3 = k1 ^ 0x7465646279746573
+
+    data = _as_bytes(key)
+    length = len(data)
+    tail_start = length - length % 8
+    for pos in range(0, tail_start, 8):
+        block = int.from_bytes(data[pos:pos + 8], 'little')
+        v3 ^= block
+        for _ in range(2):
+            v0, v1, v2, v3 = _sip_round(v0, v1, v2, v3)
+        v0 ^= block
+
+    # Последний блок: остаток байтов и младший байт длины в старшем байте
+    block = (int.from_bytes(data[tail_start:], 'little') |
+             ((length & 0xFF) << 56))
+    v3 ^= block
+    for _ in range(2):
+        v0, v1, v2, v3 = _sip_round(v0, v1, v2, v3)
+    v0 ^= block
+    v2 ^= 0xFF
+    for _ in range(4):
+        v0, v1, v2, v3 = _sip_round(v0, v1, v2, v3)
+    return (v0 ^ v1 ^ v2 ^ v3) % table_size
+
+
+# Векторные версии. Арифметика uint64 в NumPy выполняется по модулю 2^64,
+# поэтому маска после сложений и умножений не нужна. Константы
+# оборачиваются в np.uint64, чтобы операции не переходили к float64.
+
+def _u64(value):
+    return np.uint64(value & _MASK_64)
+
+
+def _code_matrix(keys, as_bytes):
+    """
+    Матрица кодов n x max_len (недостающие позиции - нули) и длины
+    ключей. as_bytes - байты UTF-8, иначе коды символов строк.
+    """
+    # Все ключи кодируются одним вызовом и образуют общий буфер
+    if as_bytes:
+        parts = [_as_bytes(key) for key in keys]
+        flat = np.frombuffer(b''.join(parts), dtype=np.uint8)
+    elif all(isinstance(key, str) for key in keys):
+        parts = keys
+        flat = np.frombuffer(''.join(keys).encode('utf-32-le',
+                                                  'surrogatepass'),
+                             dtype=np.uint32)
+    else:
+        parts = [np.frombuffer(key.encode('utf-32-le', 'surrogatepass'),
+                               dtype=np.uint32) if isinstance(key, str)
+                 else np.frombuffer(_as_bytes(key), dtype=np.uint8)
+                 for key in keys]
+        flat = np.concatenate(parts).astype(np.uint32)
+    lengths = np.array([len(part) for part in parts], dtype=np.int64)
+    width = int(lengths.max(initial=0))
+
+    if np.all(lengths == width):
+        matrix = flat.reshape(len(keys), width)
+    else:
+        matrix = np.zeros((len(keys), width), dtype=flat.dtype)
+        rows = np.repeat(np.arange(len(keys)), lengths)
+        offsets = np.cumsum(lengths) - lengths
+        cols = np.arange(len(flat)) - np.repeat(offsets, lengths)
+        matrix[rows, cols] = flat
+    return matrix.astype(np.uint64), lengths
+
+
+def _batch_per_code(step, initial, matrix, lengths):
+    """Посимвольный алгоритм: шаг step применяется к столбцам матрицы."""
+    hashes = np.full(len(lengths), initial, dtype=np.uint64)
+    shortest = int(lengths.min(initial=0))
+    for col in range(matrix.shape[1]):
+        if col < shortest:
+            hashes = step(hashes, matrix[:, col])
+        else:
+            hashes = np.where(lengths > col, step(hashes, matrix[:, col]),
+                              hashes)
+    return hashes
+
+
+def _batch_legacy(hash_func, keys, table_size):
+    """Векторные simple, polynomial, djb2 и fnv для table_size <= 2^32."""
+    matrix, lengths = _code_matrix(keys, as_bytes=False)
+    size = np.uint64(table_size)
+    if hash_func is simple_hash:
+        hashes = matrix.sum(axis=1) % size
+    elif hash_func is polynomial_hash:
+        hashes = _batch_per_code(
+            lambda h, c: (h * np.uint64(31) + c) % size, 0, matrix, lengths)
+    elif hash_func is djb2_hash:
+        # (h * 33 + c) mod m сохраняет остаток длинного целого h
+        hashes = _batch_per_code(
+            lambda h, c: (h * np.uint64(33) + c) % size,
+            5381 % table_size, matrix, lengths)
+    else:
+        hashes = _batch_per_code(
+            lambda h, c: ((h ^ c) * np.uint64(16777619)) &
+            np.uint64(0xFFFFFFFF), 2166136261, matrix, lengths) % size
+    hashes[lengths == 0] = 0
+    return hashes
+
+
+def _rotl64_np(value, shift):
+    return (value << np.uint64(shift)) | (value >> np.uint64(64 - shift))
+
+
+def _lanes(matrix, start, count, width=8):
+    """Слова width байт (little-endian) из столбцов start.. матрицы."""
+    block = np.ascontiguousarray(matrix[:, start:start + count * width])
+    dtype = '<u8' if width == 8 else '<u4'
+    return block.view(dtype).astype(np.uint64)
+
+
+def _xxh_round_np(acc, lane):
+    acc = acc + lane * _u64(_XXH_PRIME_2)
+    return _rotl64_np(acc, 31) * _u64(_XXH_PRIME_1)
+
+
+def _xxh64_same_length(matrix, length, seed):
+    """XXH64 для ключей одной длины (матрица uint8 n x length)."""
+    n = matrix.shape[0]
+    pos = 0
+    if length >= 32:
+        acc = [np.full(n, (seed + _XXH_PRIME_1 + _XXH_PRIME_2) & _MASK_64,
+                       dtype=np.uint64),
+               np.full(n, (seed + _XXH_PRIME_2) & _MASK_64, dtype=np.uint64),
+               np.full(n, seed & _MASK_64, dtype=np.uint64),
+               np.full(n, (seed - _XXH_PRIME_1) & _MASK_64, dtype=np.uint64)]
+        stripes = length // 32
+        lanes = _lanes(matrix, 0, stripes * 4)
+        for stripe in range(stripes):
+            for lane in range(4):
+                acc[lane] = _xxh_round_np(acc[lane],
+                                          lanes[:, stripe * 4 + lane])
+        pos = stripes * 32
+        hashes = (_rotl64_np(acc[0], 1) + _rotl64_np(acc[1], 7) +
+                  _rotl64_np(acc[2], 12) + _rotl64_np(acc[3], 18))
+        for value in acc:
+            hashes ^= _xxh_round_np(np.zeros(n, dtype=np.uint64), value)
+            hashes = hashes * _u64(_XXH_PRIME_1) + _u64(_XXH_PRIME_4)
+    else:
+        hashes = np.full(n, (seed + _XXH_PRIME_5) & _MASK_64, dtype=np.uint64)
+
+    hashes = hashes + _u64(length)
+    words = (length - pos) // 8
+    if words:
+        lanes = _lanes(matrix, pos, words)
+        for word in range(words):
+            hashes ^= _xxh_round_np(np.zeros(n, dtype=np.uint64),
+                                    lanes[:, word])
+            hashes = (_rotl64_np(hashes, 27) * _u64(_XXH_PRIME_1) +
+                      _u64(_XXH_PRIME_4))
+        pos += words * 8
+    if pos + 4 <= length:
+        hashes ^= _lanes(matrix, pos, 1, width=4)[:, 0] * _u64(_XXH_PRIME_1)
+        hashes = (_rotl64_np(hashes, 23) * _u64(_XXH_PRIME_2) +
+                  _u64(_XXH_PRIME_3))
+        pos += 4
+    for col in range(pos, length):
+        hashes ^= matrix[:, col].astype(np.uint64) * _u64(_XXH_PRIME_5)
+        hashes = _rotl64_np(hashes, 11) * _u64(_XXH_PRIME_1)
+
+    hashes ^= hashes >> np.uint64(33)
+    hashes = hashes * _u64(_XXH_PRIME_2)
+    hashes ^= hashes >> np.uint64(29)
+    hashes = hashes * _u64(_XXH_PRIME_3)
+    return hashes ^ (hashes >> np.uint64(32))
+
+
+def _sip_round_np(v0, v1, v2, v3):
+    v0 = v0 + v1
+    v1 = _rotl64_np(v1, 13) ^ v0
+    v0 = _rotl64_np(v0, 32)
+    v2 = v2 + v3
+    v3 = _rotl64_np(v3, 16) ^ v2
+    v0 = v0 + v3
+    v3 = _rotl64_np(v3, 21) ^ v0
+    v2 = v2 + v1
+    v1 = _rotl64_np(v1, 17) ^ v2
+    v2 = _rotl64_np(v2, 32)
+    return v0, v1, v2, v3
+
+
+def _siphash_same_length(matrix, length, secret):
+    """SipHash-2-4 для ключей одной длины (матрица uint8 n x length)."""
+    n = matrix.shape[0]
+    k0 = int.from_bytes(secret[:8], 'little')
+    k1 = int.from_bytes(secret[8:16], 'little')
+    v0 = np.full(n, k0 ^ 0x736F6D6570736575, dtype=np.uint64)
+    v1 = np.full(n, k1 ^ 0x646F72616E646F6D, dtype=np.uint64)
+    v2 = np.full(n, k0 ^ 0x6C7967656E657261, dtype=np.uint64)
+    v3 = np.full(n, k1 ^ 0x7465646279746573, dtype=np.uint64)
+
+    words = length // 8
+    lanes = _lanes(matrix, 0, words) if words else None
+    for word in range(words):
+        block = lanes[:, word]
+        v3 = v3 ^ block
+        for _ in range(2):
+            v0, v1, v2, v3 = _sip_round_np(v0, v1, v2, v3)
+        v0 = v0 ^ block
+
+    block = np.full(n, (length & 0xFF) << 56, dtype=np.uint64)
+    for col in range(words * 8, length):
+        block |= matrix[:, col].astype(np.uint64) << np.uint64(
+            8 * (col - words * 8))
+    v3 = v3 ^ block
+    for _ in range(2):
+        v0, v1, v2, v3 = _sip_round_np(v0, v1, v2, v3)
+    v0 = v0 ^ block
+    v2 = v2 ^ np.uint64(0xFF)
+    for _ in range(4):
+        v0, v1, v2, v3 = _sip_round_np(v0, v1, v2, v3)
+    return v0 ^ v1 ^ v2 ^ v3
+
+
+def _batch_by_length(kernel, keys, *params):
+    """Вызов kernel для каждой группы ключей одинаковой длины."""
+    parts = [_as_bytes(key) for key in keys]
+    lengths = np.array([len(part) for part in parts], dtype=np.int64)
+    hashes = np.zeros(len(parts), dtype=np.uint64)
+    for length in np.unique(lengths).tolist():
+        rows = np.flatnonzero(lengths == length)
+        if length:
+            matrix = np.frombuffer(b''.join(parts[row] for row in rows),
+                                   dtype=np.uint8).reshape(len(rows), length)
+        else:
+            matrix = np.zeros((len(rows), 0), dtype=np.uint8)
+        hashes[rows] = kernel(matrix, length, *params)
+    return hashes
+
+
+def batch_hash(keys, hash_func=fnv1a_64_hash, table_size=None, **params):
+    """
+    Векторное вычисление хешей списка ключей.
+
+    Args:
+        keys: строки или байтовые последовательности
+        hash_func: одна из функций модуля; результат совпадает с
+            поштучными вызовами hash_func(key, table_size, **params)
+        table_size: размер таблицы; для 64-битных функций по умолчанию
+            2^64, для остальных обязателен и не больше 2^32
+        params: seed для xxh64_hash, secret для siphash24_hash
+
+    Returns:
+        Массив NumPy uint64
+    """
+    keys = list(keys)
+    if hash_func in (simple_hash, polynomial_hash, djb2_hash, fnv_hash):
+        if table_size is None or not 0 < table_size <= 2 ** 32:
+            raise ValueError("Для 32-битных функций нужен table_size <= 2^32")
+        if not keys:
+            return np.zeros(0, dtype=np.uint64)
+        return _batch_legacy(hash_func, keys, table_size)
+
+    if hash_func is fnv1a_64_hash:
+        matrix, lengths = _code_matrix(keys, as_bytes=True)
+        hashes = _batch_per_code(
+            lambda h, c: (h ^ c) * np.uint64(_FNV64_PRIME),
+            _FNV64_OFFSET_BASIS, matrix, lengths)
+    elif hash_func is xxh64_hash:
+        hashes = _batch_by_length(_xxh64_same_length, keys,
+                                  params.get('seed', 0))
+    elif hash_func is siphash24_hash:
+        secret = params.get('secret')
+        hashes = _batch_by_length(_siphash_same_length, keys,
+                                  SIPHASH_KEY if secret is None else secret)
+    else:
+        raise ValueError(f"Нет векторной версии для {hash_func.__name__}")
+
+    if table_size is not None and table_size != HASH_RANGE_64:
+        hashes = hashes % np.uint64(table_size)
+    return hashes
+
+
 def test_hash_functions():
     """Тестирование хеш-функций."""
     test_keys = ["hello", "world", "test", "hash", "table"]
@@ -55,6 +478,9 @@ def test_hash_functions():
         print(f"  полиномиальная: {polynomial_hash(key, table_size)}")
         print(f"  djb2: {djb2_hash(key, table_size)}")
         print(f"  fnv-1a: {fnv_hash(key, table_size)}")
+        print(f"  fnv-1a 64: {fnv1a_64_hash(key):#018x}")
+        print(f"  xxh64: {xxh64_hash(key):#018x}")
+        print(f"  siphash-2-4: {siphash24_hash(key):#018x}")
 
 
 if __name__ == "__main__":
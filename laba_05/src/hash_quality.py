@@ -0,0 +1,310 @@
+"""
+Анализ качества хеш-функций.
+
+Для каждой функции из hash_functions вычисляются:
+    - критерий хи-квадрат равномерности распределения по корзинам
+      таблицы и его p-значение;
+    - отношение числа коллизий корзин к ожидаемому для идеальной
+      функции и число совпадений полного хеша;
+    - лавинный эффект: вероятность изменения каждого бита результата
+      при инверсии одного бита ключа (идеал - 0.5) и независимость
+      изменений разных битов результата (bit independence criterion);
+    - скорость поштучного вычисления в МБ/с.
+
+Наборы ключей выбраны так, чтобы выявлять слабые функции: кроме
+случайных строк - общий префикс, последовательные идентификаторы и
+анаграммы (simple_hash дает всем анаграммам один хеш).
+
+Параметры params функций анализа (seed для xxh64, secret для
+siphash-2-4) передаются в batch_hash: со случайным по умолчанию ключом
+siphash результаты от запуска к запуску различаются.
+"""
+
+import math
+import random
+import string
+
+import numpy as np
+
+from hash_functions import (
+    batch_hash,
+    djb2_hash,
+    fnv1a_64_hash,
+    fnv_hash,
+    polynomial_hash,
+    simple_hash,
+    siphash24_hash,
+    xxh64_hash
+)
+from performance_test import measure_hash_throughput
+
+# Функции: подпись -> (функция, разрядность полного хеша)
+HASH_FUNCTIONS = {
+    'простая': (simple_hash, 32),
+    'полиномиальная': (polynomial_hash, 32),
+    'djb2': (djb2_hash, 32),
+    'fnv-1a': (fnv_hash, 32),
+    'fnv-1a 64': (fnv1a_64_hash, 64),
+    'xxh64': (xxh64_hash, 64),
+    'siphash-2-4': (siphash24_hash, 64),
+}
+
+# Пороги для рекомендации: p-значение хи-квадрат и смещение лавины
+MIN_P_VALUE = 0.001
+MAX_AVALANCHE_BIAS = 0.1
+
+
+def random_keys(count, length=10, seed=0):
+    """Случайные строки из букв и цифр."""
+    rng = random.Random(seed)
+    chars = string.ascii_letters + string.digits
+    keys = set()
+    while len(keys) < count:
+        keys.add(''.join(rng.choice(chars) for _ in range(length)))
+    return sorted(keys)
+
+
+def shared_prefix_keys(count, seed=0):
+    """URL с длинным общим префиксом и коротким различающимся хвостом."""
+    prefix = 'https://example.com/api/v1/users/'
+    return [prefix + key for key in random_keys(count, 6, seed)]
+
+
+def sequential_keys(count):
+    """Последовательные идентификаторы: id00000000, id00000001, ..."""
+    return [f"id{i:08d}" for i in range(count)]
+
+
+def anagram_keys(count, seed=0):
+    """Различные перестановки одних и тех же символов."""
+    rng = random.Random(seed)
+    letters = list('abcdefghijkl')
+    keys = set()
+    while len(keys) < count:
+        rng.shuffle(letters)
+        keys.add(''.join(letters))
+    return sorted(keys)
+
+
+KEY_SETS = {
+    'случайные': random_keys,
+    'общий префикс': shared_prefix_keys,
+    'последовательные': sequential_keys,
+    'анаграммы': anagram_keys,
+}
+
+
+def _table_hashes(hash_func, keys, table_size, **params):
+    """Номера корзин; для 64-битных функций - остаток от деления."""
+    return batch_hash(keys, hash_func, table_size, **params)
+
+
+def chi_squared(hash_func, keys, table_size=1024, **params):
+    """
+    Критерий хи-квадрат равномерности по table_size корзинам.
+
+    p-значение вычисляется по приближению Уилсона-Хилферти, точному
+    при большом числе степеней свободы.
+
+    Returns:
+        (статистика, p-значение)
+    """
+    counts = np.bincount(
+        _table_hashes(hash_func, keys, table_size, **params).astype(
+            np.int64),
+        minlength=table_size)
+    expected = len(keys) / table_size
+    statistic = float(np.sum((counts - expected) ** 2) / expected)
+    df = table_size - 1
+    z = (((statistic / df) ** (1 / 3) - (1 - 2 / (9 * df))) /
+         math.sqrt(2 / (9 * df)))
+    return statistic, 0.5 * math.erfc(z / math.sqrt(2))
+
+
+def expected_collisions(count, table_size):
+    """
+    Ожидаемое для идеальной функции число коллизий: ключей, попавших
+    в уже занятую корзину.
+    """
+    occupied = table_size * (1 - (1 - 1 / table_size) ** count)
+    return count - occupied
+
+
+def collision_stats(hash_func, keys, table_size=1024, bits=32, **params):
+    """
+    Коллизии корзин и полного хеша.
+
+    Returns:
+        Словарь: bucket_collisions, expected_collisions, collision_ratio
+        (отношение к ожидаемому), full_collisions (совпадения полного
+        хеша разрядности bits)
+    """
+    buckets = _table_hashes(hash_func, keys, table_size, **params)
+    bucket_collisions = len(keys) - len(np.unique(buckets))
+    expected = expected_collisions(len(keys), table_size)
+    full = batch_hash(keys, hash_func, 2 ** 32 if bits == 32 else None,
+                      **params)
+    return {
+        'bucket_collisions': bucket_collisions,
+        'expected_collisions': expected,
+        'collision_ratio': bucket_collisions / expected if expected else 0.0,
+        'full_collisions': len(keys) - len(np.unique(full)),
+    }
+
+
+def _flip_matrix(hash_func, keys, bits, **params):
+    """
+    Изменения битов результата при инверсии каждого бита ключа.
+
+    Returns:
+        Массив bool формы (ключи, биты ключа, биты результата)
+    """
+    encoded = [key.encode('utf-8') if isinstance(key, str) else bytes(key)
+               for key in keys]
+    key_bits = 8 * len(encoded[0])
+    if any(len(key) * 8 != key_bits for key in encoded):
+        raise ValueError("Для лавинного теста нужны ключи одной длины")
+
+    table_size = 2 ** 32 if bits == 32 else None
+    flipped = [bytes(key[:bit // 8]) + bytes([key[bit // 8] ^ (1 << bit % 8)])
+               + bytes(key[bit // 8 + 1:])
+               for key in encoded for bit in range(key_bits)]
+    original = batch_hash(encoded, hash_func, table_size, **params)
+    changed = batch_hash(flipped, hash_func, table_size, **params).reshape(
+        len(encoded), key_bits)
+    diff = original[:, None] ^ changed
+    shifts = np.arange(bits, dtype=np.uint64)
+    return ((diff[..., None] >> shifts) & np.uint64(1)).astype(bool)
+
+
+def avalanche(hash_func, keys, bits=32, **params):
+    """
+    Лавинный эффект и независимость битов.
+
+    Returns:
+        Словарь:
+            avalanche_bias - среднее |P(изменение) - 0.5| · 2 по всем
+                парам (бит ключа, бит результата): 0 - идеал, 1 - биты
+                результата не зависят от бита ключа или всегда
+                меняются вместе с ним;
+            worst_bias - максимум того же смещения;
+            bit_independence - средний модуль корреляции изменений пар
+                битов результата (0 - идеал); пары с постоянным битом
+                не учитываются
+
+    Для идеальной функции оба показателя равны нулю только в пределе:
+    на n ключах шум выборки дает смещение около 1.6 · sqrt(0.25 / n).
+    """
+    flips = _flip_matrix(hash_func, keys, bits, **params)
+    probabilities = flips.mean(axis=0)
+    bias = np.abs(probabilities - 0.5) * 2
+
+    correlations = []
+    for input_bit in range(flips.shape[1]):
+        sample = flips[:, input_bit, :].astype(float)
+        varying = sample.std(axis=0) > 0
+        if varying.sum() < 2:
+            continue
+        corr = np.corrcoef(sample[:, varying], rowvar=False)
+        off_diagonal = corr[~np.eye(len(corr), dtype=bool)]
+        correlations.append(float(np.mean(np.abs(off_diagonal))))
+    return {
+        'avalanche_bias': float(bias.mean()),
+        'worst_bias': float(bias.max()),
+        'bit_independence': (float(np.mean(correlations))
+                             if correlations else 1.0),
+    }
+
+
+def analyze_hash_functions(count=4096, table_size=1024, avalanche_keys=200,
+                           hash_functions=None, key_sets=None):
+    """
+    Анализ всех функций на всех наборах ключей.
+
+    Returns:
+        Словарь: функция -> {'throughput': МБ/с поштучного вычисления
+        (performance_test.measure_hash_throughput), 'avalanche': {...},
+        'sets': набор ключей -> {'chi2', 'p_value', коллизии...}}
+    """
+    hash_functions = hash_functions or HASH_FUNCTIONS
+    key_sets = key_sets or KEY_SETS
+    data = {name: make_keys(count) for name, make_keys in key_sets.items()}
+    # Лавинный тест - на случайных ключах одинаковой длины
+    flip_keys = random_keys(avalanche_keys, 8, seed=1)
+    speed_keys = random_keys(count, 32, seed=2)
+
+    results = {}
+    for name, (hash_func, bits) in hash_functions.items():
+        sets = {}
+        for set_name, keys in data.items():
+            statistic, p_value = chi_squared(hash_func, keys, table_size)
+            sets[set_name] = {'chi2': statistic, 'p_value': p_value}
+            sets[set_name].update(
+                collision_stats(hash_func, keys, table_size, bits))
+        results[name] = {
+            'throughput': measure_hash_throughput(
+                hash_func, speed_keys, bits)[0],
+            'avalanche': avalanche(hash_func, flip_keys, bits),
+            'sets': sets,
+        }
+    return results
+
+
+def recommend(results, min_p_value=MIN_P_VALUE,
+              max_bias=MAX_AVALANCHE_BIAS):
+    """
+    Самая быстрая функция, прошедшая критерий хи-квадрат на всех
+    наборах ключей и с лавинным смещением не больше max_bias.
+
+    Returns:
+        Подпись функции или None, если ни одна не прошла проверки
+    """
+    passed = [name for name, result in results.items()
+              if all(stats['p_value'] >= min_p_value
+                     for stats in result['sets'].values()) and
+              result['avalanche']['avalanche_bias'] <= max_bias]
+    if not passed:
+        return None
+    return max(passed, key=lambda name: results[name]['throughput'])
+
+
+def print_report(results, table_size=1024):
+    """Вывод таблиц качества и рекомендации."""
+    set_names = list(next(iter(results.values()))['sets'])
+    print(f"\nХи-квадрат, p-значение ({table_size} корзин):")
+    print(f"  {'функция':<16} " +
+          " ".join(f"{name:>17}" for name in set_names))
+    for name, result in results.items():
+        print(f"  {name:<16} " + " ".join(
+            f"{result['sets'][set_name]['p_value']:>17.3g}"
+            for set_name in set_names))
+
+    print("\nКоллизии корзин относительно идеальной функции "
+          "(совпадения полного хеша):")
+    print(f"  {'функция':<16} " +
+          " ".join(f"{name:>17}" for name in set_names))
+    for name, result in results.items():
+        print(f"  {name:<16} " + " ".join(
+            f"{result['sets'][set_name]['collision_ratio']:>9.2f} "
+            f"({result['sets'][set_name]['full_collisions']:>5})"
+            for set_name in set_names))
+
+    print("\nЛавинный эффект и скорость:")
+    print(f"  {'функция':<16} {'смещение':>9} {'худшее':>8} "
+          f"{'корреляция':>11} {'МБ/с':>8}")
+    for name, result in results.items():
+        quality = result['avalanche']
+        print(f"  {name:<16} {quality['avalanche_bias']:>9.3f} "
+              f"{quality['worst_bias']:>8.3f} "
+              f"{quality['bit_independence']:>11.3f} "
+              f"{result['throughput']:>8.2f}")
+
+    best = recommend(results)
+    if best is None:
+        print("\nНи одна функция не прошла все проверки")
+    else:
+        print(f"\nСамая быстрая функция, прошедшая проверки: {best}")
+
+
+if __name__ == "__main__":
+    print_report(analyze_hash_functions())
@@ -1,25 +1,84 @@
 """
 Хеш-таблица с методом цепочек.
+
+При incremental=True расширение не перехешировает всю таблицу в одной
+вставке: старая таблица сохраняется, и каждая вставка или удаление
+переносят в новую migration_step корзин старой. Шаг увеличивается,
+если его не хватает, чтобы перенос закончился до следующего
+расширения. Пока перенос не закончен, поиск проверяет обе таблицы.
 """
 
 from hash_functions import polynomial_hash
 
 
+def migration_step_for(migration_step, old_capacity, headroom):
+    """
+    Шаг переноса, при котором old_capacity корзин старой таблицы
+    переносятся до следующего расширения: до него не меньше headroom
+    вставок, и каждая переносит шаг корзин.
+    """
+    headroom = max(1, int(headroom))
+    return max(migration_step, -(-old_capacity // headroom))
+
+
 class HashTableChaining:
     """Хеш-таблица с разрешением коллизий методом цепочек."""
 
     def __init__(self, initial_capacity=16, load_factor_threshold=0.75,
-                 hash_func=None):
+                 hash_func=None, incremental=False, migration_step=8):
         self.capacity = initial_capacity
         self.size = 0
         self.load_factor_threshold = load_factor_threshold
         self.hash_func = hash_func or polynomial_hash
         self.table = [[] for _ in range(self.capacity)]
+        self.incremental = incremental
+        self.migration_step = migration_step
+        # Старая таблица при постепенном расширении, номер первой
+        # еще не перенесенной корзины и число корзин, переносимых
+        # за одну операцию
+        self.old_table = None
+        self.migrate_index = 0
+        self.step = migration_step
 
     def _hash(self, key):
         return self.hash_func(key, self.capacity)
 
+    def _old_chain(self, key):
+        """Еще не перенесенная цепочка старой таблицы для ключа."""
+        if self.old_table is None:
+            return None
+        index = self.hash_func(key, len(self.old_table))
+        return self.old_table[index] if index >= self.migrate_index else None
+
+    def _migrate(self, buckets):
+        """Перенос не более buckets корзин старой таблицы в новую."""
+        old_table = self.old_table
+        end = min(self.migrate_index + buckets, len(old_table))
+        for index in range(self.migrate_index, end):
+            for key, value in old_table[index] or ():
+                new_index = self._hash(key)
+                if self.table[new_index] is None:
+                    self.table[new_index] = [(key, value)]
+                else:
+                    self.table[new_index].append((key, value))
+            old_table[index] = None
+        self.migrate_index = end
+        if end == len(old_table):
+            self.old_table = None
+
     def _resize(self, new_capacity):
+        if self.incremental:
+            self.old_table = self.table
+            self.migrate_index = 0
+            self.step = migration_step_for(
+                self.migration_step, len(self.old_table),
+                self.load_factor_threshold * new_capacity - self.size)
+            self.capacity = new_capacity
+            # Цепочки создаются при первой вставке в корзину: создание
+            # списков для всех корзин само заняло бы O(n) в одной вставке
+            self.table = [None] * self.capacity
+            return
+
         old_table = self.table
         self.capacity = new_capacity
         self.table = [[] for _ in range(self.capacity)]
@@ -29,10 +88,22 @@ class HashTableChaining:
                 self.insert(key, value)
 
     def insert(self, key, value):
+        if self.old_table is not None:
+            self._migrate(self.step)
         if self.size / self.capacity >= self.load_factor_threshold:
             self._resize(self.capacity * 2)
+
+        old_chain = self._old_chain(key)
+        if old_chain:
+            for i, (k, v) in enumerate(old_chain):
+                if k == key:
+                    old_chain[i] = (key, value)
+                    return True
+
         index = self._hash(key)
         chain = self.table[index]
+        if chain is None:
+            chain = self.table[index] = []
         for i, (k, v) in enumerate(chain):
             if k == key:
                 chain[i] = (key, value)
@@ -44,21 +115,33 @@ class HashTableChaining:
     def get(self, key, default=None):
         index = self._hash(key)
         chain = self.table[index]
-        for k, v in chain:
+        for k, v in chain or ():
+            if k == key:
+                return v
+        for k, v in self._old_chain(key) or ():
             if k == key:
                 return v
         return default
 
     def remove(self, key):
-        index = self._hash(key)
-        chain = self.table[index]
-        for i, (k, v) in enumerate(chain):
-            if k == key:
-                del chain[i]
-                self.size -= 1
-                return True
+        if self.old_table is not None:
+            self._migrate(self.step)
+        for chain in (self.table[self._hash(key)], self._old_chain(key)):
+            for i, (k, v) in enumerate(chain or ()):
+                if k == key:
+                    del chain[i]
+                    self.size -= 1
+                    return True
         return False
 
+    def _chains(self):
+        """Все цепочки: новой таблицы и неперенесенные старой."""
+        for chain in self.table:
+            yield chain or ()
+        if self.old_table is not None:
+            for chain in self.old_table[self.migrate_index:]:
+                yield chain or ()
+
     def contains(self, key):
         return self.get(key) is not None
 
@@ -85,22 +168,23 @@ class HashTableChaining:
         return self.contains(key)
 
     def keys(self):
-        for chain in self.table:
+        for chain in self._chains():
             for key, _ in chain:
                 yield key
 
     def values(self):
-        for chain in self.table:
+        for chain in self._chains():
             for _, value in chain:
                 yield value
 
     def items(self):
-        for chain in self.table:
+        for chain in self._chains():
             for key, value in chain:
                 yield key, value
 
     def get_statistics(self):
-        chain_lengths = [len(chain) for chain in self.table]
+        chain_lengths = [len(chain) if chain is not None else 0
+                         for chain in self.table]
         max_chain = max(chain_lengths) if chain_lengths else 0
         avg_chain = (sum(chain_lengths) / len(chain_lengths)
                      if chain_lengths else 0)
@@ -110,7 +194,9 @@ class HashTableChaining:
             'load_factor': self.load_factor(),
             'max_chain_length': max_chain,
             'avg_chain_length': avg_chain,
-            'empty_buckets': sum(1 for length in chain_lengths if length == 0)
+            'empty_buckets': sum(1 for length in chain_lengths if length == 0),
+            'pending_migration': (len(self.old_table) - self.migrate_index
+                                  if self.old_table is not None else 0)
         }
 
 
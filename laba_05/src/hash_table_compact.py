@@ -0,0 +1,207 @@
+"""
+Компактная хеш-таблица с открытой адресацией.
+
+Хеши, ключи и значения хранятся в трех параллельных массивах заранее
+выделенной длины вместо кортежей (key, value). Полный хеш ключа
+вычисляется один раз при вставке и сохраняется:
+    - при пробировании сначала сравниваются хеши, ключи сравниваются
+      только при совпадении хеша;
+    - при расширении таблицы позиции вычисляются по сохраненным хешам
+      без повторного вызова хеш-функции.
+Емкость - степень двойки, поэтому номер ячейки вычисляется маской
+(h & mask) вместо деления по модулю.
+"""
+
+from hash_functions import polynomial_hash
+
+# Диапазон полных хешей: хеш-функции вызываются с этим размером таблицы
+HASH_RANGE = 2 ** 32
+# Метки свободной и удаленной ячеек в массиве хешей
+_EMPTY = -1
+_DELETED = -2
+
+
+def round_up_power_of_two(n):
+    """Наименьшая степень двойки, не меньшая n (и не меньшая 8)."""
+    return max(8, 1 << (n - 1).bit_length())
+
+
+class HashTableCompact:
+    """Хеш-таблица с линейным пробированием на параллельных массивах."""
+
+    def __init__(self, initial_capacity=16, load_factor_threshold=0.75,
+                 hash_func=None):
+        self.capacity = round_up_power_of_two(initial_capacity)
+        self.mask = self.capacity - 1
+        self.size = 0
+        self.deleted_count = 0
+        self.load_factor_threshold = load_factor_threshold
+        self.hash_func = hash_func or polynomial_hash
+        self.hashes = [_EMPTY] * self.capacity
+        self.table_keys = [None] * self.capacity
+        self.table_values = [None] * self.capacity
+
+    def _full_hash(self, key):
+        return self.hash_func(key, HASH_RANGE)
+
+    def _find_index(self, key, h):
+        hashes = self.hashes
+        table_keys = self.table_keys
+        mask = self.mask
+        index = h & mask
+        while True:
+            slot_hash = hashes[index]
+            if slot_hash == _EMPTY:
+                return None
+            if slot_hash == h and table_keys[index] == key:
+                return index
+            index = (index + 1) & mask
+
+    def _resize(self, new_capacity):
+        old_hashes = self.hashes
+        old_keys = self.table_keys
+        old_values = self.table_values
+        self.capacity = new_capacity
+        self.mask = new_capacity - 1
+        self.hashes = [_EMPTY] * new_capacity
+        self.table_keys = [None] * new_capacity
+        self.table_values = [None] * new_capacity
+        self.deleted_count = 0
+
+        # Ключи различны, поэтому сравнивать их не нужно: достаточно
+        # найти свободную ячейку по сохраненному хешу
+        hashes = self.hashes
+        mask = self.mask
+        for i, h in enumerate(old_hashes):
+            if h >= 0:
+                index = h & mask
+                while hashes[index] != _EMPTY:
+                    index = (index + 1) & mask
+                hashes[index] = h
+                self.table_keys[index] = old_keys[i]
+                self.table_values[index] = old_values[i]
+
+    def insert(self, key, value):
+        # Удаленные ячейки удлиняют пробирование так же, как занятые
+        if ((self.size + self.deleted_count + 1) >
+                self.capacity * self.load_factor_threshold):
+            if self.size + 1 > self.capacity * self.load_factor_threshold / 2:
+                self._resize(self.capacity * 2)
+            else:
+                # Много удаленных ячеек - очистка без расширения
+                self._resize(self.capacity)
+
+        h = self._full_hash(key)
+        hashes = self.hashes
+        mask = self.mask
+        index = h & mask
+        free = None
+        while True:
+            slot_hash = hashes[index]
+            if slot_hash == _EMPTY:
+                break
+            if slot_hash == _DELETED:
+                if free is None:
+                    free = index
+            elif slot_hash == h and self.table_keys[index] == key:
+                self.table_values[index] = value
+                return True
+            index = (index + 1) & mask
+
+        if free is not None:
+            index = free
+            self.deleted_count -= 1
+        hashes[index] = h
+        self.table_keys[index] = key
+        self.table_values[index] = value
+        self.size += 1
+        return True
+
+    def get(self, key, default=None):
+        index = self._find_index(key, self._full_hash(key))
+        return self.table_values[index] if index is not None else default
+
+    def remove(self, key):
+        index = self._find_index(key, self._full_hash(key))
+        if index is None:
+            return False
+        self.hashes[index] = _DELETED
+        self.table_keys[index] = None
+        self.table_values[index] = None
+        self.size -= 1
+        self.deleted_count += 1
+        return True
+
+    def contains(self, key):
+        return self._find_index(key, self._full_hash(key)) is not None
+
+    def load_factor(self):
+        return self.size / self.capacity if self.capacity > 0 else 0
+
+    def __len__(self):
+        return self.size
+
+    def __getitem__(self, key):
+        index = self._find_index(key, self._full_hash(key))
+        if index is None:
+            raise KeyError(f"Key '{key}' not found")
+        return self.table_values[index]
+
+    def __setitem__(self, key, value):
+        self.insert(key, value)
+
+    def __delitem__(self, key):
+        if not self.remove(key):
+            raise KeyError(f"Key '{key}' not found")
+
+    def __contains__(self, key):
+        return self.contains(key)
+
+    def keys(self):
+        for i, h in enumerate(self.hashes):
+            if h >= 0:
+                yield self.table_keys[i]
+
+    def values(self):
+        for i, h in enumerate(self.hashes):
+            if h >= 0:
+                yield self.table_values[i]
+
+    def items(self):
+        for i, h in enumerate(self.hashes):
+            if h >= 0:
+                yield self.table_keys[i], self.table_values[i]
+
+    def get_statistics(self):
+        # Длина пробирования - расстояние от начальной ячейки ключа
+        probe_lengths = [(i - (h & self.mask)) & self.mask
+                         for i, h in enumerate(self.hashes) if h >= 0]
+        avg_probe = (sum(probe_lengths) / len(probe_lengths)
+                     if probe_lengths else 0)
+        max_probe = max(probe_lengths) if probe_lengths else 0
+        return {
+            'size': self.size,
+            'capacity': self.capacity,
+            'load_factor': self.load_factor(),
+            'avg_probe_length': avg_probe,
+            'max_probe_length': max_probe,
+            'empty_slots': self.hashes.count(_EMPTY),
+            'deleted_slots': self.deleted_count
+        }
+
+
+if __name__ == "__main__":
+    ht = HashTableCompact(initial_capacity=8, load_factor_threshold=0.5)
+    ht["apple"] = 1
+    ht["banana"] = 2
+    ht["cherry"] = 3
+    ht["date"] = 4
+    ht["elderberry"] = 5
+    print(f"Размер: {len(ht)}")
+    print(f"Емкость: {ht.capacity}")
+    print(f"ht['apple'] = {ht['apple']}")
+    del ht["banana"]
+    print(f"'banana' in ht: {'banana' in ht}")
+    stats = ht.get_statistics()
+    for key, value in stats.items():
+        print(f"  {key}: {value}")
@@ -0,0 +1,262 @@
+"""
+Кукушкина хеш-таблица с корзинами и резервным списком (stash).
+
+Каждый ключ может находиться только в одной из d корзин, номера которых
+дают d разных хеш-функций, либо в небольшом резервном списке. Поэтому
+поиск просматривает не более d · bucket_size ячеек и stash_size
+элементов независимо от заполнения - время поиска в худшем случае O(1).
+
+Если все ячейки корзин нового ключа заняты, он вытесняет случайный ключ
+одной из них, вытесненный ключ переходит в другую свою корзину и так
+далее. Если цепочка вытеснений длиннее max_kicks (вероятен цикл),
+последний вытесненный ключ помещается в резервный список, а при его
+переполнении таблица перестраивается с новыми затравками хеш-функций.
+
+Номер корзины вычисляется по полному хешу функции из hash_functions,
+перемешанному с затравкой (фибоначчиево хеширование), - смена затравки
+дает новое распределение при тех же хеш-функциях.
+"""
+
+import random
+
+from hash_functions import djb2_hash, polynomial_hash
+from hash_table_compact import HASH_RANGE, round_up_power_of_two
+
+# Множитель фибоначчиева хеширования: 2^32 / золотое сечение
+_FIBONACCI_MULTIPLIER = 0x9E3779B1
+# Число перестроек с новыми затравками до удвоения емкости
+_REBUILD_ATTEMPTS = 2
+# Предел перестроек подряд: при вырожденных хеш-функциях (например,
+# совпадающих) ключи не помещаются ни при какой емкости
+_MAX_REBUILDS = 20
+_EMPTY = object()
+
+
+class HashTableCuckoo:
+    """Кукушкина хеш-таблица с d хеш-функциями и корзинами."""
+
+    def __init__(self, initial_capacity=16, load_factor_threshold=0.9,
+                 hash_funcs=None, bucket_size=4, stash_size=4,
+                 max_kicks=100, seed=None):
+        self.hash_funcs = list(hash_funcs or (polynomial_hash, djb2_hash))
+        if len(self.hash_funcs) < 2:
+            raise ValueError("Нужны хотя бы две хеш-функции")
+        self.bucket_size = bucket_size
+        self.stash_size = stash_size
+        self.max_kicks = max_kicks
+        self.load_factor_threshold = load_factor_threshold
+        self.rng = random.Random(seed)
+        self.size = 0
+        self.rehash_count = 0
+        self._allocate(round_up_power_of_two(
+            max(1, initial_capacity // bucket_size)))
+
+    def _allocate(self, num_buckets):
+        self.num_buckets = num_buckets
+        self.capacity = num_buckets * self.bucket_size
+        self.shift = 32 - (num_buckets.bit_length() - 1)
+        self.seeds = [self.rng.getrandbits(32) for _ in self.hash_funcs]
+        self.table_keys = [_EMPTY] * self.capacity
+        self.table_values = [None] * self.capacity
+        self.stash = []
+
+    def _bucket(self, key, i):
+        """Номер корзины ключа для i-й хеш-функции."""
+        h = self.hash_funcs[i](key, HASH_RANGE) ^ self.seeds[i]
+        # При одной корзине сдвиг равен 32 и результат - 0
+        return ((h * _FIBONACCI_MULTIPLIER) & 0xFFFFFFFF) >> self.shift
+
+    def _find_slot(self, key):
+        """Ячейка ключа, -1 для резервного списка или None."""
+        table_keys = self.table_keys
+        bucket_size = self.bucket_size
+        # Хеши вычисляются лениво: ключ часто находится в первой корзине
+        for i in range(len(self.hash_funcs)):
+            start = self._bucket(key, i) * bucket_size
+            for slot in range(start, start + bucket_size):
+                if table_keys[slot] is not _EMPTY and table_keys[slot] == key:
+                    return slot
+        for stash_key, _ in self.stash:
+            if stash_key == key:
+                return -1
+        return None
+
+    def _try_place(self, key, value, buckets):
+        """Вставка в свободную ячейку одной из корзин."""
+        table_keys = self.table_keys
+        for bucket in buckets:
+            start = bucket * self.bucket_size
+            for slot in range(start, start + self.bucket_size):
+                if table_keys[slot] is _EMPTY:
+                    table_keys[slot] = key
+                    self.table_values[slot] = value
+                    return True
+        return False
+
+    def _place(self, key, value):
+        """
+        Вставка отсутствующего ключа с вытеснениями. Возвращает пару
+        (ключ, значение), оставшуюся без места, или None.
+        """
+        num_hashes = len(self.hash_funcs)
+        for _ in range(self.max_kicks):
+            buckets = [self._bucket(key, i) for i in range(num_hashes)]
+            if self._try_place(key, value, buckets):
+                return None
+            # Вытеснение случайного ключа из случайной корзины
+            slot = (self.rng.choice(buckets) * self.bucket_size +
+                    self.rng.randrange(self.bucket_size))
+            self.table_keys[slot], key = key, self.table_keys[slot]
+            self.table_values[slot], value = value, self.table_values[slot]
+
+        if len(self.stash) < self.stash_size:
+            self.stash.append((key, value))
+            return None
+        return key, value
+
+    def _rebuild(self, num_buckets, extra=()):
+        """
+        Перестройка с новыми затравками хеш-функций. После
+        _REBUILD_ATTEMPTS неудачных попыток емкость удваивается.
+        """
+        items = list(self.items())
+        items.extend(extra)
+        attempts = 0
+        while True:
+            self.rehash_count += 1
+            self._allocate(num_buckets)
+            if all(self._place(key, value) is None for key, value in items):
+                return
+            attempts += 1
+            if attempts >= _MAX_REBUILDS:
+                raise RuntimeError(
+                    "Не удалось разместить ключи: хеш-функции дают "
+                    "слишком много совпадений")
+            if attempts % _REBUILD_ATTEMPTS == 0:
+                num_buckets *= 2
+
+    def _resize(self, new_capacity):
+        self._rebuild(round_up_power_of_two(
+            max(1, new_capacity // self.bucket_size)))
+
+    def insert(self, key, value):
+        slot = self._find_slot(key)
+        if slot == -1:
+            self.stash = [(k, value if k == key else v)
+                          for k, v in self.stash]
+            return True
+        if slot is not None:
+            self.table_values[slot] = value
+            return True
+
+        if self.size + 1 > self.capacity * self.load_factor_threshold:
+            self._resize(self.capacity * 2)
+        leftover = self._place(key, value)
+        if leftover is not None:
+            # Цикл вытеснений: ключ, оставшийся без места, вставляется
+            # при перестройке вместе с остальными
+            self._rebuild(self.num_buckets, [leftover])
+        self.size += 1
+        return True
+
+    def _value_at(self, slot, key):
+        if slot == -1:
+            for stash_key, value in self.stash:
+                if stash_key == key:
+                    return value
+        return self.table_values[slot]
+
+    def get(self, key, default=None):
+        slot = self._find_slot(key)
+        return self._value_at(slot, key) if slot is not None else default
+
+    def remove(self, key):
+        slot = self._find_slot(key)
+        if slot is None:
+            return False
+        if slot == -1:
+            self.stash = [(k, v) for k, v in self.stash if k != key]
+        else:
+            self.table_keys[slot] = _EMPTY
+            self.table_values[slot] = None
+        self.size -= 1
+        return True
+
+    def contains(self, key):
+        return self._find_slot(key) is not None
+
+    def load_factor(self):
+        return self.size / self.capacity if self.capacity > 0 else 0
+
+    def __len__(self):
+        return self.size
+
+    def __getitem__(self, key):
+        slot = self._find_slot(key)
+        if slot is None:
+            raise KeyError(f"Key '{key}' not found")
+        return self._value_at(slot, key)
+
+    def __setitem__(self, key, value):
+        self.insert(key, value)
+
+    def __delitem__(self, key):
+        if not self.remove(key):
+            raise KeyError(f"Key '{key}' not found")
+
+    def __contains__(self, key):
+        return self.contains(key)
+
+    def keys(self):
+        for key, _ in self.items():
+            yield key
+
+    def values(self):
+        for _, value in self.items():
+            yield value
+
+    def items(self):
+        for slot, key in enumerate(self.table_keys):
+            if key is not _EMPTY:
+                yield key, self.table_values[slot]
+        yield from list(self.stash)
+
+    def get_statistics(self):
+        # Доля ключей в корзине первой хеш-функции
+        in_first = sum(
+            1 for slot, key in enumerate(self.table_keys)
+            if key is not _EMPTY and
+            self._bucket(key, 0) == slot // self.bucket_size)
+        occupancy = [0] * (self.bucket_size + 1)
+        for bucket in range(self.num_buckets):
+            start = bucket * self.bucket_size
+            occupancy[sum(1 for key in
+                          self.table_keys[start:start + self.bucket_size]
+                          if key is not _EMPTY)] += 1
+        return {
+            'size': self.size,
+            'capacity': self.capacity,
+            'load_factor': self.load_factor(),
+            'num_hashes': len(self.hash_funcs),
+            'bucket_size': self.bucket_size,
+            'stash_size': len(self.stash),
+            'rehash_count': self.rehash_count,
+            'primary_bucket_ratio': in_first / self.size if self.size else 0,
+            'bucket_occupancy': occupancy,
+            'max_lookup_slots': (len(self.hash_funcs) * self.bucket_size +
+                                 self.stash_size)
+        }
+
+
+if __name__ == "__main__":
+    ht = HashTableCuckoo(initial_capacity=8, seed=1)
+    for i in range(20):
+        ht[f"key{i}"] = i
+    print(f"Размер: {len(ht)}")
+    print(f"Коэффициент: {ht.load_factor():.2f}")
+    print(f"ht['key7'] = {ht['key7']}")
+    del ht["key7"]
+    print(f"'key7' in ht: {'key7' in ht}")
+    stats = ht.get_statistics()
+    for key, value in stats.items():
+        print(f"  {key}: {value}")
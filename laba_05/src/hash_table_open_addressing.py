@@ -1,15 +1,25 @@
 """
 Хеш-таблица с открытой адресацией.
+
+При incremental=True расширение выполняется постепенно: старые массивы
+сохраняются, и каждая вставка или удаление переносят в новые
+migration_step ячеек старой таблицы; шаг увеличивается, если его не
+хватает, чтобы перенос закончился до следующего расширения по
+коэффициенту заполнения. Перенесенная ячейка помечается
+удаленной, чтобы поиск в старой таблице не обрывался на ней. Пока
+перенос не закончен, поиск проверяет обе таблицы.
 """
 
 from hash_functions import polynomial_hash
+from hash_table_chaining import migration_step_for
 
 
 class HashTableOpenAddressing:
     """Хеш-таблица с открытой адресацией."""
 
     def __init__(self, initial_capacity=16, load_factor_threshold=0.75,
-                 hash_func=None, probing_method='linear'):
+                 hash_func=None, probing_method='linear',
+                 incremental=False, migration_step=8):
         self.capacity = initial_capacity
         self.size = 0
         self.load_factor_threshold = load_factor_threshold
@@ -17,33 +27,113 @@ class HashTableOpenAddressing:
         self.probing_method = probing_method
         self.table = [None] * self.capacity
         self.deleted = [False] * self.capacity
+        self.incremental = incremental
+        self.migration_step = migration_step
+        # Старые массивы при постепенном расширении, номер первой
+        # еще не перенесенной ячейки и число ячеек, переносимых за одну
+        # операцию
+        self.old_table = None
+        self.old_deleted = None
+        self.migrate_index = 0
+        self.step = migration_step
 
-    def _hash(self, key, i=0):
+    def _hash(self, key, i=0, capacity=None):
+        capacity = capacity or self.capacity
         if self.probing_method == 'linear':
-            h = self.hash_func(key, self.capacity)
-            return (h + i) % self.capacity
+            h = self.hash_func(key, capacity)
+            return (h + i) % capacity
         elif self.probing_method == 'double':
-            h1 = self.hash_func(key, self.capacity)
-            h2 = 1 + (self.hash_func(key, self.capacity - 1) %
-                      (self.capacity - 2))
-            return (h1 + i * h2) % self.capacity
+            h1 = self.hash_func(key, capacity)
+            h2 = 1 + (self.hash_func(key, capacity - 1) %
+                      (capacity - 2))
+            return (h1 + i * h2) % capacity
         else:
             raise ValueError(f"Неизвестный метод: {self.probing_method}")
 
-    def _find_index(self, key):
+    def _find_in(self, key, table, deleted):
+        """Индекс ключа в массивах table/deleted или None."""
+        capacity = len(table)
         i = 0
-        while i < self.capacity:
-            index = self._hash(key, i)
-            if self.table[index] is None and not self.deleted[index]:
+        while i < capacity:
+            index = self._hash(key, i, capacity)
+            if table[index] is None and not deleted[index]:
                 return None
-            item = self.table[index]
+            item = table[index]
             if (item is not None and item[0] == key and
-                    not self.deleted[index]):
+                    not deleted[index]):
                 return index
             i += 1
         return None
 
+    def _find_index(self, key):
+        return self._find_in(key, self.table, self.deleted)
+
+    def _find_old_index(self, key):
+        if self.old_table is None:
+            return None
+        return self._find_in(key, self.old_table, self.old_deleted)
+
+    def _take_old(self, index):
+        """Извлечение элемента из старой таблицы с пометкой удаления."""
+        item = self.old_table[index]
+        self.old_table[index] = None
+        self.old_deleted[index] = True
+        return item
+
+    def _place(self, key, value):
+        """Вставка отсутствующего ключа в новую таблицу без проверок."""
+        for i in range(self.capacity):
+            index = self._hash(key, i)
+            if self.table[index] is None:
+                self.table[index] = (key, value)
+                self.deleted[index] = False
+                return
+
+        # Последовательность пробирования не содержит свободных ячеек
+        # (шаг двойного хеширования не взаимно прост с емкостью):
+        # обе таблицы сразу перестраиваются в одну вдвое большую
+        items = list(self.items())
+        items.append((key, value))
+        self.old_table = None
+        self.old_deleted = None
+        self.capacity *= 2
+        self.table = [None] * self.capacity
+        self.deleted = [False] * self.capacity
+        for item_key, item_value in items:
+            self._place(item_key, item_value)
+
+    def _migrate(self, slots):
+        """Перенос не более slots ячеек старой таблицы в новую."""
+        end = min(self.migrate_index + slots, len(self.old_table))
+        for index in range(self.migrate_index, end):
+            if self.old_table[index] is not None:
+                self._place(*self._take_old(index))
+                if self.old_table is None:
+                    return
+        self.migrate_index = end
+        if end == len(self.old_table):
+            self.old_table = None
+            self.old_deleted = None
+
     def _resize(self, new_capacity):
+        if self.incremental:
+            # Незаконченный перенос возможен, только если в
+            # последовательности пробирования нет свободной ячейки
+            # (см. insert): расширение по коэффициенту заполнения
+            # наступает после окончания переноса
+            if self.old_table is not None:
+                self._migrate(len(self.old_table))
+            self.old_table = self.table
+            self.old_deleted = self.deleted
+            self.migrate_index = 0
+            self.step = migration_step_for(
+                self.migration_step, len(self.old_table),
+                self.load_factor_threshold * new_capacity - self.size)
+            self.capacity = new_capacity
+            self.table = [None] * self.capacity
+            self.deleted = [False] * self.capacity
+            return
+
         old_table = self.table
         old_deleted = self.deleted
         self.capacity = new_capacity
@@ -56,9 +146,24 @@ class HashTableOpenAddressing:
                 self.insert(key, value)
 
     def insert(self, key, value):
+        if self.old_table is not None:
+            self._migrate(self.step)
         if self.size / self.capacity >= self.load_factor_threshold:
             self._resize(self.capacity * 2)
 
+        # Ключ из старой таблицы переносится в новую вместе с вставкой
+        old_index = self._find_old_index(key)
+        if old_index is not None:
+            self._take_old(old_index)
+            self.size -= 1
+
+        # Ключ может стоять за удаленной ячейкой, поэтому сначала
+        # ищется существующий ключ, а затем - первая свободная ячейка
+        index = self._find_index(key)
+        if index is not None:
+            self.table[index] = (key, value)
+            return True
+
         i = 0
         while i < self.capacity:
             index = self._hash(key, i)
@@ -67,10 +172,6 @@ class HashTableOpenAddressing:
                 self.deleted[index] = False
                 self.size += 1
                 return True
-            item = self.table[index]
-            if item[0] == key and not self.deleted[index]:
-                self.table[index] = (key, value)
-                return True
             i += 1
 
         # Если таблица заполнена - увеличиваем размер и пробуем снова
@@ -79,19 +180,31 @@ class HashTableOpenAddressing:
 
     def get(self, key, default=None):
         index = self._find_index(key)
-        return self.table[index][1] if index is not None else default
+        if index is not None:
+            return self.table[index][1]
+        old_index = self._find_old_index(key)
+        return self.old_table[old_index][1] if old_index is not None \
+            else default
 
     def remove(self, key):
+        if self.old_table is not None:
+            self._migrate(self.step)
         index = self._find_index(key)
         if index is not None:
             self.deleted[index] = True
             self.table[index] = None
             self.size -= 1
             return True
+        old_index = self._find_old_index(key)
+        if old_index is not None:
+            self._take_old(old_index)
+            self.size -= 1
+            return True
         return False
 
     def contains(self, key):
-        return self._find_index(key) is not None
+        return (self._find_index(key) is not None or
+                self._find_old_index(key) is not None)
 
     def load_factor(self):
         return self.size / self.capacity if self.capacity > 0 else 0
@@ -116,19 +229,21 @@ class HashTableOpenAddressing:
         return self.contains(key)
 
     def keys(self):
-        for i in range(self.capacity):
-            if self.table[i] is not None and not self.deleted[i]:
-                yield self.table[i][0]
+        for key, _ in self.items():
+            yield key
 
     def values(self):
-        for i in range(self.capacity):
-            if self.table[i] is not None and not self.deleted[i]:
-                yield self.table[i][1]
+        for _, value in self.items():
+            yield value
 
     def items(self):
         for i in range(self.capacity):
             if self.table[i] is not None and not self.deleted[i]:
                 yield self.table[i]
+        if self.old_table is not None:
+            for item in self.old_table[self.migrate_index:]:
+                if item is not None:
+                    yield item
 
     def get_statistics(self):
         probe_lengths = []
@@ -151,7 +266,9 @@ class HashTableOpenAddressing:
             'load_factor': self.load_factor(),
             'avg_probe_length': avg_probe,
             'max_probe_length': max_probe,
-            'empty_slots': sum(1 for item in self.table if item is None)
+            'empty_slots': sum(1 for item in self.table if item is None),
+            'pending_migration': (len(self.old_table) - self.migrate_index
+                                  if self.old_table is not None else 0)
         }
 
 
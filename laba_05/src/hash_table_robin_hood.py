@@ -0,0 +1,233 @@
+"""
+Хеш-таблица с открытой адресацией по схеме Robin Hood.
+
+Линейное пробирование, при котором вставляемый ключ занимает ячейку
+ключа, находящегося ближе к своей начальной ячейке, а вытесненный ключ
+вставляется дальше. Длины пробирования выравниваются, и их дисперсия
+остается малой даже при заполнении 0.9-0.95.
+
+Поиск прекращается, как только расстояние текущего ключа от его
+начальной ячейки меньше пройденного: искомый ключ стоял бы раньше.
+Удаление выполняется обратным сдвигом - следующие ключи цепочки
+сдвигаются на одну ячейку назад, поэтому удаленных ячеек (tombstones)
+нет и поиск не замедляется после удалений.
+
+Массивы хешей, ключей и значений устроены как в HashTableCompact;
+расстояние ключа вычисляется по сохраненному хешу.
+"""
+
+from hash_functions import polynomial_hash
+from hash_table_compact import HASH_RANGE, round_up_power_of_two
+
+_EMPTY = -1
+
+
+class HashTableRobinHood:
+    """Хеш-таблица Robin Hood с удалением обратным сдвигом."""
+
+    def __init__(self, initial_capacity=16, load_factor_threshold=0.9,
+                 hash_func=None):
+        self.capacity = round_up_power_of_two(initial_capacity)
+        self.mask = self.capacity - 1
+        self.size = 0
+        self.load_factor_threshold = load_factor_threshold
+        self.hash_func = hash_func or polynomial_hash
+        self.hashes = [_EMPTY] * self.capacity
+        self.table_keys = [None] * self.capacity
+        self.table_values = [None] * self.capacity
+
+    def _full_hash(self, key):
+        return self.hash_func(key, HASH_RANGE)
+
+    def _distance(self, index):
+        """Расстояние ключа в ячейке index от его начальной ячейки."""
+        return (index - (self.hashes[index] & self.mask)) & self.mask
+
+    def _find_index(self, key, h):
+        hashes = self.hashes
+        table_keys = self.table_keys
+        mask = self.mask
+        index = h & mask
+        distance = 0
+        while True:
+            slot_hash = hashes[index]
+            if slot_hash == _EMPTY:
+                return None
+            if ((index - (slot_hash & mask)) & mask) < distance:
+                return None
+            if slot_hash == h and table_keys[index] == key:
+                return index
+            index = (index + 1) & mask
+            distance += 1
+
+    def _place(self, h, key, value, index, distance):
+        """
+        Вставка отсутствующего ключа, начиная с ячейки index на
+        расстоянии distance: вытесненные ключи переносятся дальше.
+        """
+        hashes = self.hashes
+        table_keys = self.table_keys
+        table_values = self.table_values
+        mask = self.mask
+        while True:
+            slot_hash = hashes[index]
+            if slot_hash == _EMPTY:
+                hashes[index] = h
+                table_keys[index] = key
+                table_values[index] = value
+                return
+            slot_distance = (index - (slot_hash & mask)) & mask
+            if slot_distance < distance:
+                hashes[index], h = h, slot_hash
+                table_keys[index], key = key, table_keys[index]
+                table_values[index], value = value, table_values[index]
+                distance = slot_distance
+            index = (index + 1) & mask
+            distance += 1
+
+    def _resize(self, new_capacity):
+        old_hashes = self.hashes
+        old_keys = self.table_keys
+        old_values = self.table_values
+        self.capacity = new_capacity
+        self.mask = new_capacity - 1
+        self.hashes = [_EMPTY] * new_capacity
+        self.table_keys = [None] * new_capacity
+        self.table_values = [None] * new_capacity
+        for i, h in enumerate(old_hashes):
+            if h != _EMPTY:
+                self._place(h, old_keys[i], old_values[i], h & self.mask, 0)
+
+    def insert(self, key, value):
+        if self.size + 1 > self.capacity * self.load_factor_threshold:
+            self._resize(self.capacity * 2)
+
+        h = self._full_hash(key)
+        hashes = self.hashes
+        mask = self.mask
+        index = h & mask
+        distance = 0
+        # Ключ может встретиться только до первой ячейки с меньшим
+        # расстоянием - там начинается вставка с вытеснением
+        while True:
+            slot_hash = hashes[index]
+            if (slot_hash == _EMPTY or
+                    ((index - (slot_hash & mask)) & mask) < distance):
+                break
+            if slot_hash == h and self.table_keys[index] == key:
+                self.table_values[index] = value
+                return True
+            index = (index + 1) & mask
+            distance += 1
+
+        self._place(h, key, value, index, distance)
+        self.size += 1
+        return True
+
+    def get(self, key, default=None):
+        index = self._find_index(key, self._full_hash(key))
+        return self.table_values[index] if index is not None else default
+
+    def remove(self, key):
+        index = self._find_index(key, self._full_hash(key))
+        if index is None:
+            return False
+
+        # Обратный сдвиг: ключи после удаленного, стоящие не в своей
+        # начальной ячейке, переносятся на одну ячейку назад
+        hashes = self.hashes
+        table_keys = self.table_keys
+        table_values = self.table_values
+        mask = self.mask
+        next_index = (index + 1) & mask
+        while (hashes[next_index] != _EMPTY and
+               (next_index - (hashes[next_index] & mask)) & mask > 0):
+            hashes[index] = hashes[next_index]
+            table_keys[index] = table_keys[next_index]
+            table_values[index] = table_values[next_index]
+            index = next_index
+            next_index = (index + 1) & mask
+
+        hashes[index] = _EMPTY
+        table_keys[index] = None
+        table_values[index] = None
+        self.size -= 1
+        return True
+
+    def contains(self, key):
+        return self._find_index(key, self._full_hash(key)) is not None
+
+    def load_factor(self):
+        return self.size / self.capacity if self.capacity > 0 else 0
+
+    def __len__(self):
+        return self.size
+
+    def __getitem__(self, key):
+        index = self._find_index(key, self._full_hash(key))
+        if index is None:
+            raise KeyError(f"Key '{key}' not found")
+        return self.table_values[index]
+
+    def __setitem__(self, key, value):
+        self.insert(key, value)
+
+    def __delitem__(self, key):
+        if not self.remove(key):
+            raise KeyError(f"Key '{key}' not found")
+
+    def __contains__(self, key):
+        return self.contains(key)
+
+    def keys(self):
+        for i, h in enumerate(self.hashes):
+            if h != _EMPTY:
+                yield self.table_keys[i]
+
+    def values(self):
+        for i, h in enumerate(self.hashes):
+            if h != _EMPTY:
+                yield self.table_values[i]
+
+    def items(self):
+        for i, h in enumerate(self.hashes):
+            if h != _EMPTY:
+                yield self.table_keys[i], self.table_values[i]
+
+    def get_statistics(self):
+        probe_lengths = [self._distance(i)
+                         for i, h in enumerate(self.hashes) if h != _EMPTY]
+        count = len(probe_lengths)
+        avg_probe = sum(probe_lengths) / count if count else 0
+        variance = (sum((length - avg_probe) ** 2
+                        for length in probe_lengths) / count
+                    if count else 0)
+        max_probe = max(probe_lengths) if probe_lengths else 0
+        histogram = [0] * (max_probe + 1)
+        for length in probe_lengths:
+            histogram[length] += 1
+        return {
+            'size': self.size,
+            'capacity': self.capacity,
+            'load_factor': self.load_factor(),
+            'avg_probe_length': avg_probe,
+            'max_probe_length': max_probe,
+            'probe_length_variance': variance,
+            'probe_length_histogram': histogram,
+            'empty_slots': self.hashes.count(_EMPTY)
+        }
+
+
+if __name__ == "__main__":
+    ht = HashTableRobinHood(initial_capacity=8)
+    for i, word in enumerate(["apple", "banana", "cherry", "date",
+                              "elderberry", "fig", "grape"]):
+        ht[word] = i
+    print(f"Размер: {len(ht)}")
+    print(f"Коэффициент: {ht.load_factor():.2f}")
+    print(f"ht['apple'] = {ht['apple']}")
+    del ht["banana"]
+    print(f"'banana' in ht: {'banana' in ht}")
+    stats = ht.get_statistics()
+    for key, value in stats.items():
+        print(f"  {key}: {value}")
@@ -0,0 +1,271 @@
+"""
+Хеш-таблица по схеме SwissTable.
+
+Ячейки разбиты на группы по GROUP_WIDTH = 16. Для каждой ячейки
+хранится управляющий байт (bytearray, доступный также как массив NumPy
+uint8 без копирования):
+    0x80       - свободная ячейка (EMPTY);
+    0xFE       - удаленная ячейка (DELETED, tombstone);
+    0x00-0x7F  - занятая ячейка, младшие 7 бит хеша ключа (H2).
+Старшие биты хеша (H1) выбирают начальную группу. Поиск ищет байт H2
+среди 16 управляющих байтов группы и сравнивает ключи только в
+совпавших ячейках (ложное совпадение происходит с вероятностью 1/128 на
+ячейку). Если в группе есть свободная ячейка, ключа дальше нет; иначе
+проверяется следующая группа (квадратичное пробирование по группам).
+
+Удаленная ячейка помечается как свободная, если в ее группе уже есть
+свободная ячейка: такую группу не мог пропустить ни один поиск. Иначе
+ставится метка DELETED, которая занимает место до перестройки.
+
+Векторное сравнение группы выполняется на NumPy в get_many: группы
+всех ключей пакета сравниваются одной операцией над матрицей n x 16,
+затем ключи, которые нужно искать дальше, переходят к следующей группе.
+Для одного ключа вызов NumPy на 16 байт стоит дороже самого сравнения,
+поэтому поштучный поиск использует bytearray.find (memchr на C).
+"""
+
+import numpy as np
+
+from hash_functions import polynomial_hash
+from hash_table_compact import HASH_RANGE, round_up_power_of_two
+
+GROUP_WIDTH = 16
+EMPTY = 0x80
+DELETED = 0xFE
+_H2_MASK = 0x7F
+
+
+class HashTableSwiss:
+    """Хеш-таблица с управляющими байтами и групповым пробированием."""
+
+    def __init__(self, initial_capacity=16, load_factor_threshold=0.875,
+                 hash_func=None):
+        self.size = 0
+        self.tombstones = 0
+        self.load_factor_threshold = load_factor_threshold
+        self.hash_func = hash_func or polynomial_hash
+        self._allocate(round_up_power_of_two(
+            max(GROUP_WIDTH, initial_capacity)))
+
+    def _allocate(self, capacity):
+        self.capacity = capacity
+        self.num_groups = capacity // GROUP_WIDTH
+        self.group_mask = self.num_groups - 1
+        self.ctrl = bytearray([EMPTY]) * capacity
+        self.ctrl_view = np.frombuffer(self.ctrl, dtype=np.uint8)
+        # Полные хеши нужны только при перестройке
+        self.hashes = [0] * capacity
+        self.table_keys = [None] * capacity
+        self.table_values = [None] * capacity
+
+    def _full_hash(self, key):
+        return self.hash_func(key, HASH_RANGE)
+
+    def _probe_groups(self, h):
+        """Номера групп в порядке квадратичного пробирования."""
+        group = (h >> 7) & self.group_mask
+        for step in range(1, self.num_groups + 1):
+            yield group
+            group = (group + step) & self.group_mask
+
+    def _find_slot(self, key, h):
+        h2 = h & _H2_MASK
+        ctrl = self.ctrl
+        table_keys = self.table_keys
+        for group in self._probe_groups(h):
+            start = group * GROUP_WIDTH
+            end = start + GROUP_WIDTH
+            slot = ctrl.find(h2, start, end)
+            while slot != -1:
+                if table_keys[slot] == key:
+                    return slot
+                slot = ctrl.find(h2, slot + 1, end)
+            if ctrl.find(EMPTY, start, end) != -1:
+                return None
+        return None
+
+    def _find_free(self, h):
+        """Первая свободная или удаленная ячейка на пути пробирования."""
+        ctrl = self.ctrl
+        for group in self._probe_groups(h):
+            start = group * GROUP_WIDTH
+            end = start + GROUP_WIDTH
+            free = [slot for slot in (ctrl.find(EMPTY, start, end),
+                                      ctrl.find(DELETED, start, end))
+                    if slot != -1]
+            if free:
+                return min(free)
+        raise RuntimeError("В таблице нет свободных ячеек")
+
+    def _store(self, slot, h, key, value):
+        self.ctrl[slot] = h & _H2_MASK
+        self.hashes[slot] = h
+        self.table_keys[slot] = key
+        self.table_values[slot] = value
+
+    def _resize(self, new_capacity):
+        old_ctrl = self.ctrl_view
+        old_hashes = self.hashes
+        old_keys = self.table_keys
+        old_values = self.table_values
+        self._allocate(new_capacity)
+        self.tombstones = 0
+        for slot in np.flatnonzero(old_ctrl < EMPTY).tolist():
+            h = old_hashes[slot]
+            self._store(self._find_free(h), h, old_keys[slot],
+                        old_values[slot])
+
+    def insert(self, key, value):
+        h = self._full_hash(key)
+        slot = self._find_slot(key, h)
+        if slot is not None:
+            self.table_values[slot] = value
+            return True
+
+        limit = self.capacity * self.load_factor_threshold
+        if self.size + self.tombstones + 1 > limit:
+            # Если место заняли удаленные ячейки - очистка без расширения
+            if self.size + 1 > limit / 2:
+                self._resize(self.capacity * 2)
+            else:
+                self._resize(self.capacity)
+
+        slot = self._find_free(h)
+        if self.ctrl[slot] == DELETED:
+            self.tombstones -= 1
+        self._store(slot, h, key, value)
+        self.size += 1
+        return True
+
+    def get(self, key, default=None):
+        slot = self._find_slot(key, self._full_hash(key))
+        return self.table_values[slot] if slot is not None else default
+
+    def get_many(self, keys, default=None):
+        """
+        Поиск пакета ключей. На каждом шаге пробирования группы всех
+        еще не найденных ключей сравниваются с их H2 одной векторной
+        операцией; дальше идут только ключи, не найденные в заполненной
+        группе.
+        """
+        keys = list(keys)
+        results = [default] * len(keys)
+        if not keys:
+            return results
+        h = np.array([self._full_hash(key) for key in keys], dtype=np.int64)
+        h2 = (h & _H2_MASK).astype(np.uint8)
+        groups = (h >> 7) & self.group_mask
+        ctrl = self.ctrl_view.reshape(self.num_groups, GROUP_WIDTH)
+        table_keys = self.table_keys
+        table_values = self.table_values
+
+        active = np.arange(len(keys))
+        step = 1
+        while len(active) and step <= self.num_groups:
+            windows = ctrl[groups[active]]
+            rows, cols = np.nonzero(windows == h2[active, None])
+            slots = groups[active[rows]] * GROUP_WIDTH + cols
+            found = np.zeros(len(active), dtype=bool)
+            indices = active[rows].tolist()
+            for row, index, slot in zip(rows.tolist(), indices,
+                                        slots.tolist()):
+                if table_keys[slot] == keys[index]:
+                    results[index] = table_values[slot]
+                    found[row] = True
+
+            done = found | (windows == EMPTY).any(axis=1)
+            active = active[~done]
+            groups[active] = (groups[active] + step) & self.group_mask
+            step += 1
+        return results
+
+    def remove(self, key):
+        slot = self._find_slot(key, self._full_hash(key))
+        if slot is None:
+            return False
+        start = slot - slot % GROUP_WIDTH
+        if self.ctrl.find(EMPTY, start, start + GROUP_WIDTH) != -1:
+            self.ctrl[slot] = EMPTY
+        else:
+            self.ctrl[slot] = DELETED
+            self.tombstones += 1
+        self.table_keys[slot] = None
+        self.table_values[slot] = None
+        self.size -= 1
+        return True
+
+    def contains(self, key):
+        return self._find_slot(key, self._full_hash(key)) is not None
+
+    def load_factor(self):
+        return self.size / self.capacity if self.capacity > 0 else 0
+
+    def __len__(self):
+        return self.size
+
+    def __getitem__(self, key):
+        slot = self._find_slot(key, self._full_hash(key))
+        if slot is None:
+            raise KeyError(f"Key '{key}' not found")
+        return self.table_values[slot]
+
+    def __setitem__(self, key, value):
+        self.insert(key, value)
+
+    def __delitem__(self, key):
+        if not self.remove(key):
+            raise KeyError(f"Key '{key}' not found")
+
+    def __contains__(self, key):
+        return self.contains(key)
+
+    def keys(self):
+        for slot in np.flatnonzero(self.ctrl_view < EMPTY).tolist():
+            yield self.table_keys[slot]
+
+    def values(self):
+        for slot in np.flatnonzero(self.ctrl_view < EMPTY).tolist():
+            yield self.table_values[slot]
+
+    def items(self):
+        for slot in np.flatnonzero(self.ctrl_view < EMPTY).tolist():
+            yield self.table_keys[slot], self.table_values[slot]
+
+    def get_statistics(self):
+        # Число просмотренных групп при успешном поиске каждого ключа
+        probe_groups = []
+        for slot in np.flatnonzero(self.ctrl_view < EMPTY).tolist():
+            target = slot // GROUP_WIDTH
+            for count, group in enumerate(
+                    self._probe_groups(self.hashes[slot]), 1):
+                if group == target:
+                    probe_groups.append(count)
+                    break
+        avg_probe = (sum(probe_groups) / len(probe_groups)
+                     if probe_groups else 0)
+        max_probe = max(probe_groups) if probe_groups else 0
+        return {
+            'size': self.size,
+            'capacity': self.capacity,
+            'load_factor': self.load_factor(),
+            'groups': self.num_groups,
+            'avg_probe_groups': avg_probe,
+            'max_probe_groups': max_probe,
+            'deleted_slots': self.tombstones,
+            'empty_slots': self.ctrl.count(EMPTY)
+        }
+
+
+if __name__ == "__main__":
+    ht = HashTableSwiss()
+    for i in range(40):
+        ht[f"key{i}"] = i
+    print(f"Размер: {len(ht)}")
+    print(f"Емкость: {ht.capacity}")
+    print(f"ht['key7'] = {ht['key7']}")
+    print(f"get_many: {ht.get_many(['key1', 'key2', 'missing'])}")
+    del ht["key7"]
+    print(f"'key7' in ht: {'key7' in ht}")
+    stats = ht.get_statistics()
+    for key, value in stats.items():
+        print(f"  {key}: {value}")
@@ -2,6 +2,7 @@
 Тестирование производительности хеш-таблиц.
 """
 
+import gc
 import time
 import random
 import string
@@ -179,6 +180,401 @@ def compare_implementations():
         print(f"    ср. пробирование: {stats['avg_probe_length']:.2f}")
 
 
+def measure_operations(table, test_data, missing_keys):
+    """
+    Замер вставки всех пар, поиска существующих и отсутствующих ключей.
+    Таблица может быть любым объектом с __setitem__ и get, в том числе
+    встроенным dict.
+
+    Returns:
+        (время вставки, время поиска существующих, время поиска
+        отсутствующих) в секундах
+    """
+    start_time = time.perf_counter()
+    for key, value in test_data:
+        table[key] = value
+    insert_time = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    for key, _ in test_data:
+        table.get(key)
+    hit_time = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    for key in missing_keys:
+        table.get(key)
+    miss_time = time.perf_counter() - start_time
+    return insert_time, hit_time, miss_time
+
+
+def compare_compact_table(test_sizes=(1000, 10000, 100000)):
+    """
+    Сравнение компактной таблицы с существующими реализациями и dict.
+    Время поиска указано на одну операцию.
+    """
+    from hash_table_chaining import HashTableChaining
+    from hash_table_compact import HashTableCompact
+    from hash_table_open_addressing import HashTableOpenAddressing
+
+    implementations = [
+        ('цепочки', HashTableChaining),
+        ('линейное пробирование', HashTableOpenAddressing),
+        ('компактная', HashTableCompact),
+        ('dict', dict)
+    ]
+
+    print("\nКомпактная таблица и dict:")
+    print("-" * 40)
+
+    for size in test_sizes:
+        test_data = generate_test_data(size)
+        missing_keys = _missing_keys(test_data, size)
+
+        print(f"\nЭлементов: {size}")
+        print(f"  {'реализация':<24} {'вставка, с':>11} "
+              f"{'поиск, мкс':>11} {'промах, мкс':>12}")
+        for name, table_class in implementations:
+            insert_time, hit_time, miss_time = measure_operations(
+                table_class(), test_data, missing_keys)
+            print(f"  {name:<24} {insert_time:>11.4f} "
+                  f"{hit_time / size * 1e6:>11.3f} "
+                  f"{miss_time / size * 1e6:>12.3f}")
+
+
+def _missing_keys(test_data, count):
+    """Случайные ключи, отсутствующие в test_data."""
+    present = {key for key, _ in test_data}
+    missing_keys = []
+    while len(missing_keys) < count:
+        key = generate_random_string(8)
+        if key not in present:
+            missing_keys.append(key)
+    return missing_keys
+
+
+def test_robin_hood_load_sweep(load_factors=(0.5, 0.7, 0.8, 0.9, 0.95),
+                               capacity=2 ** 14):
+    """
+    Линейное пробирование (HashTableCompact) и Robin Hood при высоком
+    заполнении. Емкость фиксирована, таблицы заполняются до заданного
+    коэффициента. Затем четверть ключей удаляется и заменяется новыми,
+    и поиск отсутствующих ключей замеряется повторно: удаленные ячейки
+    линейного пробирования удлиняют его, и HashTableCompact
+    перестраивается (при высоком заполнении - с удвоением емкости),
+    а Robin Hood удаленных ячеек не оставляет и сохраняет емкость.
+    """
+    from hash_table_compact import HashTableCompact
+    from hash_table_robin_hood import HashTableRobinHood
+
+    implementations = [
+        ('линейное', HashTableCompact),
+        ('Robin Hood', HashTableRobinHood)
+    ]
+
+    print("\nRobin Hood: зависимость от коэффициента заполнения")
+    print("-" * 40)
+    print(f"  {'коэфф.':<7} {'таблица':<12} {'ср. проб.':>9} "
+          f"{'макс.':>6} {'поиск, мкс':>11} {'промах, мкс':>12} "
+          f"{'промах после удалений':>22} {'емкость':>8}")
+
+    for load_factor in load_factors:
+        size = int(capacity * load_factor)
+        test_data = generate_test_data(size)
+        missing_keys = _missing_keys(test_data, size)
+        churn = size // 4
+        replacement = generate_test_data(churn)
+
+        for name, table_class in implementations:
+            # Порог выше заполнения: таблица не расширяется
+            table = table_class(initial_capacity=capacity,
+                                load_factor_threshold=0.96)
+            _, hit_time, miss_time = measure_operations(
+                table, test_data, missing_keys)
+            stats = table.get_statistics()
+
+            for key, _ in test_data[:churn]:
+                table.remove(key)
+            for key, value in replacement:
+                table.insert(key, value)
+            start_time = time.perf_counter()
+            for key in missing_keys:
+                table.get(key)
+            churn_time = time.perf_counter() - start_time
+
+            print(f"  {load_factor:<7} {name:<12} "
+                  f"{stats['avg_probe_length']:>9.2f} "
+                  f"{stats['max_probe_length']:>6} "
+                  f"{hit_time / size * 1e6:>11.3f} "
+                  f"{miss_time / size * 1e6:>12.3f} "
+                  f"{churn_time / size * 1e6:>22.3f} {table.capacity:>8}")
+
+
+def measure_lookup_latency(table, keys, repeats=3):
+    """
+    Время поиска каждого ключа в наносекундах - минимум по repeats
+    проходам. Минимум отсекает прерывания ОС, и максимум выборки
+    отражает самый долгий поиск в структуре таблицы. Сборщик мусора
+    отключен, чтобы его паузы не попадали в выборку.
+    """
+    latencies = [float('inf')] * len(keys)
+    clock = time.perf_counter_ns
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeats):
+            for i, key in enumerate(keys):
+                start = clock()
+                table.get(key)
+                elapsed = clock() - start
+                if elapsed < latencies[i]:
+                    latencies[i] = elapsed
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    return latencies
+
+
+def _percentile(sorted_values, fraction):
+    """Процентиль по уже отсортированной выборке."""
+    return sorted_values[int(fraction * (len(sorted_values) - 1))]
+
+
+def compare_lookup_latency(size=20000):
+    """
+    Медиана, p99 и максимум времени поиска всех существующих ключей.
+    Кукушкина таблица просматривает ограниченное число ячеек, у
+    остальных таблиц худший случай зависит от длины цепочки или
+    пробирования.
+    """
+    from hash_table_chaining import HashTableChaining
+    from hash_table_compact import HashTableCompact
+    from hash_table_cuckoo import HashTableCuckoo
+    from hash_table_open_addressing import HashTableOpenAddressing
+    from hash_table_robin_hood import HashTableRobinHood
+
+    implementations = [
+        ('цепочки', HashTableChaining),
+        ('линейное пробирование', HashTableOpenAddressing),
+        ('двойное хеширование',
+         lambda: HashTableOpenAddressing(probing_method='double')),
+        ('компактная', HashTableCompact),
+        ('Robin Hood', HashTableRobinHood),
+        ('кукушкина', HashTableCuckoo)
+    ]
+
+    test_data = generate_test_data(size)
+    keys = [key for key, _ in test_data]
+
+    print(f"\nЗадержка поиска, нс (элементов: {size}):")
+    print("-" * 40)
+    print(f"  {'реализация':<24} {'медиана':>8} {'p99':>8} {'макс.':>9} "
+          f"{'макс. пробир.':>14}")
+    for name, table_class in implementations:
+        table = table_class()
+        for key, value in test_data:
+            table.insert(key, value)
+        latencies = sorted(measure_lookup_latency(table, keys))
+        stats = table.get_statistics()
+        worst = stats.get('max_chain_length',
+                          stats.get('max_probe_length',
+                                    stats.get('max_lookup_slots')))
+        print(f"  {name:<24} {_percentile(latencies, 0.5):>8} "
+              f"{_percentile(latencies, 0.99):>8} {latencies[-1]:>9} "
+              f"{worst:>14}")
+
+
+def compare_swiss_table(test_sizes=(10 ** 5, 10 ** 6), lookups=10 ** 5):
+    """
+    Пропускная способность поиска существующих и отсутствующих ключей
+    (тысяч операций в секунду) для таблицы SwissTable - поштучно и
+    пакетом через get_many - и двух исходных таблиц.
+
+    Размер 10 ** 7 тоже поддерживается, но заполнение таблиц в CPython
+    занимает десятки минут, поэтому по умолчанию он не замеряется.
+    """
+    from hash_table_chaining import HashTableChaining
+    from hash_table_open_addressing import HashTableOpenAddressing
+    from hash_table_swiss import HashTableSwiss
+
+    implementations = [
+        ('цепочки', HashTableChaining),
+        ('линейное пробирование', HashTableOpenAddressing),
+        ('SwissTable', HashTableSwiss)
+    ]
+
+    print("\nSwissTable: поиск, тыс. операций/с")
+    print("-" * 40)
+
+    for size in test_sizes:
+        test_data = generate_test_data(size)
+        hit_keys = [key for key, _ in random.sample(test_data,
+                                                    min(lookups, size))]
+        miss_keys = _missing_keys(test_data, len(hit_keys))
+
+        print(f"\nЭлементов: {size}")
+        print(f"  {'реализация':<24} {'попадания':>10} {'промахи':>10}")
+        for name, table_class in implementations:
+            table = table_class()
+            for key, value in test_data:
+                table.insert(key, value)
+
+            rates = []
+            for keys in (hit_keys, miss_keys):
+                start_time = time.perf_counter()
+                for key in keys:
+                    table.get(key)
+                rates.append(len(keys) / (time.perf_counter() - start_time))
+            print(f"  {name:<24} {rates[0] / 1000:>10.1f} "
+                  f"{rates[1] / 1000:>10.1f}")
+
+            if isinstance(table, HashTableSwiss):
+                rates = []
+                for keys in (hit_keys, miss_keys):
+                    start_time = time.perf_counter()
+                    table.get_many(keys)
+                    rates.append(len(keys) /
+                                 (time.perf_counter() - start_time))
+                print(f"  {'SwissTable (get_many)':<24} "
+                      f"{rates[0] / 1000:>10.1f} {rates[1] / 1000:>10.1f}")
+
+
+def measure_insert_latency(table, test_data):
+    """Время каждой вставки в наносекундах (сборщик мусора отключен)."""
+    latencies = []
+    clock = time.perf_counter_ns
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for key, value in test_data:
+            start = clock()
+            table.insert(key, value)
+            latencies.append(clock() - start)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    return latencies
+
+
+def latency_histogram(latencies):
+    """
+    Гистограмма с логарифмическими корзинами: верхняя граница корзины
+    (степень двойки, нс) -> число замеров.
+    """
+    histogram = {}
+    for latency in latencies:
+        bound = 1 << max(0, int(latency) - 1).bit_length()
+        histogram[bound] = histogram.get(bound, 0) + 1
+    return dict(sorted(histogram.items()))
+
+
+def _format_ns(value):
+    """Наносекунды в удобных единицах."""
+    if value >= 10 ** 6:
+        return f"{value / 10 ** 6:.1f} мс"
+    if value >= 10 ** 3:
+        return f"{value / 10 ** 3:.1f} мкс"
+    return f"{value} нс"
+
+
+def compare_insert_latency(size=200000):
+    """
+    Задержка отдельных вставок при полном и постепенном расширении.
+    При полном расширении вставка, вызвавшая его, перехеширует всю
+    таблицу, и в хвосте гистограммы появляются выбросы в миллисекунды;
+    при постепенном каждая вставка переносит migration_step корзин
+    (или больше, если иначе перенос не успеет закончиться до следующего
+    расширения).
+    """
+    from hash_table_chaining import HashTableChaining
+    from hash_table_open_addressing import HashTableOpenAddressing
+
+    implementations = [
+        ('цепочки', HashTableChaining, {}),
+        ('цепочки, постепенно', HashTableChaining, {'incremental': True}),
+        ('открытая адресация', HashTableOpenAddressing, {}),
+        ('открытая, постепенно', HashTableOpenAddressing,
+         {'incremental': True})
+    ]
+    test_data = generate_test_data(size)
+
+    print(f"\nЗадержка вставки (элементов: {size}):")
+    print("-" * 40)
+    print(f"  {'реализация':<22} {'медиана':>9} {'p99':>9} {'p99.9':>9} "
+          f"{'макс.':>9}")
+    histograms = {}
+    for name, table_class, kwargs in implementations:
+        latencies = sorted(measure_insert_latency(table_class(**kwargs),
+                                                  test_data))
+        histograms[name] = latency_histogram(latencies)
+        print(f"  {name:<22} "
+              f"{_format_ns(_percentile(latencies, 0.5)):>9} "
+              f"{_format_ns(_percentile(latencies, 0.99)):>9} "
+              f"{_format_ns(_percentile(latencies, 0.999)):>9} "
+              f"{_format_ns(latencies[-1]):>9}")
+
+    print("\n  Гистограмма (число вставок с задержкой до границы):")
+    bounds = sorted({bound for histogram in histograms.values()
+                     for bound in histogram})
+    print(f"  {'до':>9} " + " ".join(f"{name:>22}" for name in histograms))
+    for bound in bounds:
+        print(f"  {_format_ns(bound):>9} " +
+              " ".join(f"{histogram.get(bound, 0):>22}"
+                       for histogram in histograms.values()))
+    return histograms
+
+
+def measure_hash_throughput(hash_func, keys, bits=32):
+    """
+    Пропускная способность хеш-функции на keys в МБ/с. Объем -
+    суммарная длина ключей в байтах UTF-8.
+
+    Перед замером batch_hash вызывается один раз на части ключей:
+    первый вызов включает разовые расходы на инициализацию.
+
+    Returns:
+        (поштучные вызовы, пакетное вычисление batch_hash)
+    """
+    from hash_functions import batch_hash
+
+    table_size = 2 ** 32 if bits == 32 else None
+    megabytes = sum(len(key.encode('utf-8')) for key in keys) / 2 ** 20
+
+    start_time = time.perf_counter()
+    if table_size is None:
+        for key in keys:
+            hash_func(key)
+    else:
+        for key in keys:
+            hash_func(key, table_size)
+    scalar_time = time.perf_counter() - start_time
+
+    batch_hash(keys[:64], hash_func, table_size)
+    start_time = time.perf_counter()
+    batch_hash(keys, hash_func, table_size)
+    batch_time = time.perf_counter() - start_time
+    return megabytes / scalar_time, megabytes / batch_time
+
+
+def compare_hash_throughput(num_keys=20000, key_length=32):
+    """
+    Пропускная способность хеш-функций в МБ/с: поштучные вызовы и
+    пакетное вычисление batch_hash на NumPy.
+    """
+    from hash_quality import HASH_FUNCTIONS
+
+    keys = [generate_random_string(key_length) for _ in range(num_keys)]
+
+    print(f"\nПропускная способность хеш-функций, МБ/с "
+          f"(ключей: {num_keys}, длина: {key_length}):")
+    print("-" * 40)
+    print(f"  {'функция':<16} {'поштучно':>10} {'пакетом':>10} "
+          f"{'ускорение':>10}")
+    for name, (func, bits) in HASH_FUNCTIONS.items():
+        scalar, batch = measure_hash_throughput(func, keys, bits)
+        print(f"  {name:<16} {scalar:>10.2f} {batch:>10.2f} "
+              f"{batch / scalar:>9.1f}x")
+
+
 def run_comprehensive_test():
     """Запуск комплексного тестирования."""
     print("Тестирование производительности хеш-таблиц")
@@ -187,6 +583,12 @@ def run_comprehensive_test():
     compare_hash_functions()
     test_load_factor_impact()
     compare_implementations()
+    compare_compact_table()
+    test_robin_hood_load_sweep()
+    compare_lookup_latency()
+    compare_swiss_table()
+    compare_insert_latency()
+    compare_hash_throughput()
 
 
 if __name__ == "__main__":
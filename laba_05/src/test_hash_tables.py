@@ -2,10 +2,59 @@
 Unit-тесты для хеш-таблиц.
 """
 
+import random
 import unittest
-from hash_functions import simple_hash, polynomial_hash, djb2_hash, fnv_hash
+from hash_functions import (
+    simple_hash,
+    polynomial_hash,
+    djb2_hash,
+    fnv_hash,
+    batch_hash,
+    fnv1a_64_hash,
+    siphash24_hash,
+    xxh64_hash
+)
+from hash_quality import (
+    analyze_hash_functions,
+    anagram_keys,
+    avalanche,
+    chi_squared,
+    collision_stats,
+    random_keys,
+    recommend
+)
 from hash_table_chaining import HashTableChaining
+from hash_table_compact import HashTableCompact
+from hash_table_cuckoo import HashTableCuckoo
 from hash_table_open_addressing import HashTableOpenAddressing
+from hash_table_robin_hood import HashTableRobinHood
+from hash_table_swiss import DELETED, EMPTY, GROUP_WIDTH, HashTableSwiss
+
+
+def check_against_dict(test, ht, seed, alphabet, operations=3000):
+    """
+    Случайные вставки и удаления коротких ключей из alphabet в таблице
+    ht и в dict с проверкой размера после каждой операции и содержимого
+    в конце.
+
+    Returns:
+        Ожидаемое содержимое таблицы (dict)
+    """
+    rng = random.Random(seed)
+    expected = {}
+    for _ in range(operations):
+        key = ''.join(rng.choice(alphabet)
+                      for _ in range(rng.randint(1, 4)))
+        if rng.random() < 0.6:
+            ht[key] = expected[key] = rng.randint(0, 100)
+        elif key in expected:
+            del ht[key]
+            del expected[key]
+        else:
+            test.assertFalse(ht.remove(key))
+        test.assertEqual(len(ht), len(expected))
+    test.assertEqual(dict(ht.items()), expected)
+    return expected
 
 
 class TestHashFunctions(unittest.TestCase):
@@ -23,6 +72,49 @@ class TestHashFunctions(unittest.TestCase):
             self.assertGreaterEqual(hash1, 0)
             self.assertLess(hash1, table_size)
 
+    def test_bytes_inputs(self):
+        """Тест байтовых ключей: результат совпадает со строкой ASCII."""
+        funcs = [simple_hash, polynomial_hash, djb2_hash, fnv_hash,
+                 fnv1a_64_hash, xxh64_hash, siphash24_hash]
+        for func in funcs:
+            expected = func("hash table", 1009)
+            for key in (b"hash table", bytearray(b"hash table"),
+                        memoryview(b"hash table")):
+                self.assertEqual(func(key, 1009), expected)
+
+    def test_64bit_reference_values(self):
+        """Тест 64-битных функций по эталонным значениям."""
+        self.assertEqual(fnv1a_64_hash(b""), 0xCBF29CE484222325)
+        self.assertEqual(fnv1a_64_hash("a"), 0xAF63DC4C8601EC8C)
+        self.assertEqual(xxh64_hash(b""), 0xEF46DB3751D8E999)
+        self.assertEqual(xxh64_hash("abc"), 0x44BC2CF5AD770999)
+        self.assertEqual(
+            xxh64_hash("Nobody inspects the spammish repetition"),
+            0xFBCEA83C8A378BF1)
+        # Тестовый вектор из статьи SipHash
+        self.assertEqual(siphash24_hash(bytes(range(15)),
+                                        secret=bytes(range(16))),
+                         0xA129CA6149BE45E5)
+
+    def test_batch_hash(self):
+        """Тест совпадения пакетного и поштучного вычисления."""
+        rng = random.Random(3)
+        keys = [''.join(rng.choice('abcé中') for _ in range(rng.randint(0, 70)))
+                for _ in range(200)]
+        keys += [b"", b"bytes key", memoryview(b"0123456789" * 5)]
+        for func in (simple_hash, polynomial_hash, djb2_hash, fnv_hash):
+            self.assertEqual(batch_hash(keys, func, 1009).tolist(),
+                             [func(key, 1009) for key in keys])
+        secret = bytes(range(16))
+        for func, params in ((fnv1a_64_hash, {}), (xxh64_hash, {'seed': 5}),
+                             (siphash24_hash, {'secret': secret})):
+            self.assertEqual(batch_hash(keys, func, **params).tolist(),
+                             [func(key, **params) for key in keys])
+            self.assertEqual(batch_hash(keys, func, 1000, **params).tolist(),
+                             [func(key, 1000, **params) for key in keys])
+        with self.assertRaises(ValueError):
+            batch_hash(keys, polynomial_hash)
+
 
 class TestHashTableChaining(unittest.TestCase):
     """Тесты хеш-таблицы с цепочками."""
@@ -66,6 +158,47 @@ class TestHashTableChaining(unittest.TestCase):
         self.assertEqual(ht["key2"], "value2")
         self.assertEqual(ht["key3"], "value3")
 
+    def test_incremental_resize(self):
+        """Тест постепенного расширения."""
+        ht = HashTableChaining(initial_capacity=8, incremental=True,
+                               migration_step=1)
+        for i in range(6):
+            ht[f"key{i}"] = i
+        ht["key6"] = 6
+        # Расширение начато, старая таблица переносится по корзине
+        self.assertEqual(ht.capacity, 16)
+        self.assertGreater(ht.get_statistics()['pending_migration'], 0)
+        ht["key0"] = "updated"
+        self.assertTrue(ht.remove("key1"))
+        self.assertEqual(ht["key0"], "updated")
+        self.assertNotIn("key1", ht)
+        self.assertEqual(sorted(ht.keys()),
+                         ["key0"] + [f"key{i}" for i in range(2, 7)])
+        for i in range(7, 40):
+            ht[f"key{i}"] = i
+        self.assertEqual(len(ht), 39)
+        self.assertEqual(len(list(ht.items())), 39)
+
+    def test_incremental_resize_finishes_migration(self):
+        """Перенос заканчивается до следующего расширения."""
+        ht = HashTableChaining(initial_capacity=8, incremental=True,
+                               migration_step=1)
+        resize = ht._resize
+        pending = []
+
+        def checked_resize(new_capacity):
+            pending.append(ht.old_table is not None)
+            resize(new_capacity)
+
+        ht._resize = checked_resize
+        for i in range(2000):
+            ht[f"key{i}"] = i
+        self.assertGreater(len(pending), 3)
+        self.assertFalse(any(pending))
+        self.assertEqual(sorted(ht.values()), list(range(2000)))
+        for i in range(2, 40):
+            self.assertEqual(ht[f"key{i}"], i)
+
 
 class TestHashTableOpenAddressing(unittest.TestCase):
     """Тесты хеш-таблицы с открытой адресацией."""
@@ -110,6 +243,271 @@ class TestHashTableOpenAddressing(unittest.TestCase):
         self.assertTrue("key3" in ht)
         self.assertEqual(ht["key3"], "value3")
 
+    def test_update_after_delete(self):
+        """Тест обновления ключа, стоящего за удаленной ячейкой."""
+        # simple_hash: "ab" и "ba" попадают в одну начальную ячейку
+        ht = HashTableOpenAddressing(hash_func=simple_hash)
+        ht["ab"] = 1
+        ht["ba"] = 2
+        del ht["ab"]
+        ht["ba"] = 3
+        self.assertEqual(len(ht), 1)
+        self.assertEqual(list(ht.items()), [("ba", 3)])
+
+    def test_incremental_resize(self):
+        """Тест постепенного расширения."""
+        for method in ('linear', 'double'):
+            ht = HashTableOpenAddressing(initial_capacity=8,
+                                         probing_method=method,
+                                         incremental=True, migration_step=1)
+            for i in range(7):
+                ht[f"key{i}"] = i
+            self.assertEqual(ht.capacity, 16)
+            self.assertIsNotNone(ht.old_table)
+            ht["key0"] = "updated"
+            del ht["key1"]
+            self.assertEqual(ht["key0"], "updated")
+            self.assertNotIn("key1", ht)
+            for i in range(7, 60):
+                ht[f"key{i}"] = i
+            self.assertEqual(len(ht), 59)
+            self.assertEqual(len(list(ht.items())), 59)
+            for i in range(2, 60):
+                self.assertEqual(ht[f"key{i}"], i)
+
+
+class TestHashTableCompact(unittest.TestCase):
+    """Тесты компактной хеш-таблицы."""
+
+    def test_power_of_two_capacity(self):
+        """Тест округления емкости до степени двойки."""
+        ht = HashTableCompact(initial_capacity=10)
+        self.assertEqual(ht.capacity, 16)
+        for i in range(100):
+            ht[f"key{i}"] = i
+        self.assertEqual(ht.capacity & (ht.capacity - 1), 0)
+        self.assertLessEqual(ht.load_factor(), ht.load_factor_threshold)
+
+    def test_resize_uses_cached_hashes(self):
+        """Тест расширения без повторного вызова хеш-функции."""
+        calls = []
+
+        def counting_hash(key, table_size):
+            calls.append(key)
+            return polynomial_hash(key, table_size)
+
+        ht = HashTableCompact(initial_capacity=8, hash_func=counting_hash)
+        for i in range(100):
+            ht[f"key{i}"] = i
+        self.assertEqual(len(calls), 100)
+        for i in range(100):
+            self.assertEqual(ht[f"key{i}"], i)
+
+    def test_delete_and_reinsert(self):
+        """Тест удаления, повторной вставки и очистки удаленных ячеек."""
+        ht = HashTableCompact(initial_capacity=8, hash_func=simple_hash)
+        for round_number in range(20):
+            for i in range(5):
+                ht[f"key{i}"] = round_number
+            for i in range(5):
+                del ht[f"key{i}"]
+        self.assertEqual(len(ht), 0)
+        self.assertEqual(ht.capacity, 8)
+        ht["ab"] = 1
+        ht["ba"] = 2
+        self.assertEqual(ht["ab"], 1)
+        self.assertEqual(ht["ba"], 2)
+        with self.assertRaises(KeyError):
+            _ = ht["key0"]
+        self.assertEqual(dict(ht.items()), {"ab": 1, "ba": 2})
+
+    def test_statistics(self):
+        """Тест статистики пробирования."""
+        ht = HashTableCompact()
+        for i in range(50):
+            ht[f"key{i}"] = i
+        del ht["key0"]
+        stats = ht.get_statistics()
+        self.assertEqual(stats['size'], 49)
+        self.assertEqual(stats['deleted_slots'], 1)
+        self.assertGreaterEqual(stats['max_probe_length'],
+                                stats['avg_probe_length'])
+
+
+class TestHashTableRobinHood(unittest.TestCase):
+    """Тесты хеш-таблицы Robin Hood."""
+
+    def test_against_dict(self):
+        """Тест случайных операций в сравнении с dict."""
+        ht = HashTableRobinHood(initial_capacity=8, hash_func=simple_hash)
+        expected = check_against_dict(self, ht, 5, 'abcd')
+        for key, value in expected.items():
+            self.assertEqual(ht[key], value)
+
+    def test_invariant_and_no_tombstones(self):
+        """Тест инварианта Robin Hood и отсутствия удаленных ячеек."""
+        ht = HashTableRobinHood(initial_capacity=64,
+                                load_factor_threshold=0.95)
+        keys = [f"key{i}" for i in range(60)]
+        for i, key in enumerate(keys):
+            ht[key] = i
+        for key in keys[::2]:
+            del ht[key]
+        self.assertEqual(ht.capacity, 64)
+        self.assertEqual(ht.get_statistics()['empty_slots'], 64 - 30)
+        # Расстояние следующего ключа больше текущего не более чем на 1
+        for i in range(ht.capacity):
+            j = (i + 1) & ht.mask
+            if ht.hashes[j] != -1:
+                self.assertLessEqual(ht._distance(j),
+                                     ht._distance(i) + 1
+                                     if ht.hashes[i] != -1 else 0)
+
+    def test_statistics(self):
+        """Тест статистики длин пробирования."""
+        ht = HashTableRobinHood(initial_capacity=1024,
+                                load_factor_threshold=0.95)
+        for i in range(900):
+            ht[f"key{i}"] = i
+        stats = ht.get_statistics()
+        self.assertEqual(sum(stats['probe_length_histogram']), 900)
+        self.assertEqual(len(stats['probe_length_histogram']),
+                         stats['max_probe_length'] + 1)
+        self.assertGreaterEqual(stats['probe_length_variance'], 0)
+
+
+class TestHashTableCuckoo(unittest.TestCase):
+    """Тесты кукушкиной хеш-таблицы."""
+
+    def test_against_dict(self):
+        """Тест случайных операций в сравнении с dict."""
+        ht = HashTableCuckoo(initial_capacity=4, seed=7)
+        check_against_dict(self, ht, 7, 'abcdef')
+
+    def test_bounded_lookup(self):
+        """Тест размещения ключа только в своих корзинах или stash."""
+        ht = HashTableCuckoo(initial_capacity=64, load_factor_threshold=0.95,
+                             seed=1)
+        for i in range(60):
+            ht[f"key{i}"] = i
+        for slot, key in enumerate(ht.table_keys):
+            if isinstance(key, str):
+                buckets = [ht._bucket(key, i)
+                           for i in range(len(ht.hash_funcs))]
+                self.assertIn(slot // ht.bucket_size, buckets)
+        self.assertLessEqual(len(ht.stash), ht.stash_size)
+        stats = ht.get_statistics()
+        self.assertEqual(stats['max_lookup_slots'], 2 * 4 + 4)
+        self.assertEqual(sum(stats['bucket_occupancy']), ht.num_buckets)
+
+    def test_rehash_on_collisions(self):
+        """Тест перестройки при плохих хеш-функциях и stash."""
+        # simple_hash не различает анаграммы: "ab" и "ba" - одна корзина
+        ht = HashTableCuckoo(hash_funcs=[simple_hash, simple_hash],
+                             bucket_size=1, stash_size=2, seed=3)
+        anagrams = ["abc", "acb", "bac", "bca", "cab"]
+        # Две корзины по одной ячейке и stash на две - места для пяти
+        # анаграмм нет ни при какой емкости
+        with self.assertRaises(RuntimeError):
+            for i, key in enumerate(anagrams):
+                ht[key] = i
+
+        ht = HashTableCuckoo(hash_funcs=[simple_hash, polynomial_hash],
+                             bucket_size=1, stash_size=1, seed=3)
+        for i, key in enumerate(anagrams):
+            ht[key] = i
+        for i, key in enumerate(anagrams):
+            self.assertEqual(ht[key], i)
+
+    def test_needs_two_hash_functions(self):
+        """Тест проверки числа хеш-функций."""
+        with self.assertRaises(ValueError):
+            HashTableCuckoo(hash_funcs=[simple_hash])
+
+
+class TestHashTableSwiss(unittest.TestCase):
+    """Тесты хеш-таблицы SwissTable."""
+
+    def test_against_dict(self):
+        """Тест случайных операций и пакетного поиска в сравнении с dict."""
+        for hash_func in (polynomial_hash, simple_hash):
+            ht = HashTableSwiss(hash_func=hash_func)
+            expected = check_against_dict(self, ht, 11, 'abcdef')
+            queries = list(expected) + ["missing1", "missing2", "g"]
+            self.assertEqual(ht.get_many(queries, -1),
+                             [expected.get(key, -1) for key in queries])
+
+    def test_control_bytes(self):
+        """Тест управляющих байтов и меток удаления."""
+        ht = HashTableSwiss(initial_capacity=GROUP_WIDTH,
+                            load_factor_threshold=1.0)
+        for i in range(GROUP_WIDTH):
+            ht[f"key{i}"] = i
+        self.assertEqual(ht.ctrl.count(EMPTY), 0)
+        self.assertTrue(all(byte < EMPTY for byte in ht.ctrl))
+        # Группа заполнена: удаление оставляет метку DELETED
+        del ht["key0"]
+        self.assertEqual(ht.ctrl.count(DELETED), 1)
+        self.assertEqual(ht.get_statistics()['deleted_slots'], 1)
+        ht["new"] = 1
+        self.assertEqual(ht.ctrl.count(DELETED), 0)
+        self.assertEqual(ht["new"], 1)
+
+    def test_delete_in_group_with_empty_slot(self):
+        """Тест удаления без метки, если в группе есть свободная ячейка."""
+        ht = HashTableSwiss(initial_capacity=GROUP_WIDTH)
+        ht["a"] = 1
+        ht["b"] = 2
+        del ht["a"]
+        self.assertEqual(ht.ctrl.count(DELETED), 0)
+        self.assertEqual(ht.ctrl.count(EMPTY), GROUP_WIDTH - 1)
+        self.assertEqual(ht.get_many(["a", "b"]), [None, 2])
+
+
+class TestHashQuality(unittest.TestCase):
+    """Тесты анализа качества хеш-функций."""
+
+    def test_chi_squared(self):
+        """Хорошая функция проходит критерий, простая - нет."""
+        keys = random_keys(2000)
+        _, p_value = chi_squared(siphash24_hash, keys, 256,
+                                 secret=bytes(range(16)))
+        self.assertGreater(p_value, 0.001)
+        _, p_value = chi_squared(simple_hash, keys, 256)
+        self.assertLess(p_value, 0.001)
+
+    def test_anagram_collisions(self):
+        """simple_hash дает всем анаграммам один хеш."""
+        keys = anagram_keys(200)
+        self.assertEqual(len(set(keys)), 200)
+        stats = collision_stats(simple_hash, keys, 64)
+        self.assertEqual(stats['full_collisions'], 199)
+        stats = collision_stats(xxh64_hash, keys, 64, bits=64)
+        self.assertEqual(stats['full_collisions'], 0)
+
+    def test_avalanche(self):
+        """Смещение лавины близко к нулю только у перемешивающих функций."""
+        keys = random_keys(100, 8)
+        good = avalanche(siphash24_hash, keys, bits=64,
+                         secret=bytes(range(16)))
+        bad = avalanche(simple_hash, keys, bits=32)
+        self.assertLess(good['avalanche_bias'], 0.1)
+        self.assertLess(good['bit_independence'], 0.1)
+        self.assertGreater(bad['avalanche_bias'], 0.5)
+        with self.assertRaises(ValueError):
+            avalanche(fnv_hash, ["a", "bb"])
+
+    def test_recommend(self):
+        """Рекомендуется функция, прошедшая все проверки."""
+        functions = {'простая': (simple_hash, 32),
+                     'xxh64': (xxh64_hash, 64)}
+        results = analyze_hash_functions(count=1024, table_size=64,
+                                         avalanche_keys=200,
+                                         hash_functions=functions)
+        self.assertEqual(set(results), set(functions))
+        self.assertEqual(recommend(results), 'xxh64')
+        self.assertIsNone(recommend({'простая': results['простая']}))
+
 
 class TestComparison(unittest.TestCase):
     """Сравнительные тесты."""
@@ -121,7 +519,11 @@ class TestComparison(unittest.TestCase):
         implementations = [
             HashTableChaining(),
             HashTableOpenAddressing(probing_method='linear'),
-            HashTableOpenAddressing(probing_method='double')
+            HashTableOpenAddressing(probing_method='double'),
+            HashTableCompact(),
+            HashTableRobinHood(),
+            HashTableCuckoo(),
+            HashTableSwiss()
         ]
         for ht in implementations:
             for key, value in test_data: